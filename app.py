@@ -55,7 +55,18 @@ def _read_wholesale_login_status():
         return None
 
 
-def run_script(script_name: str, desc: str) -> tuple[str, int]:
+def _read_api_quota_lines() -> list[str]:
+    """API별 오늘 남은 호출 한도 (헤더 표시용, 조회 실패 시 빈 목록)"""
+    try:
+        if str(BASE) not in sys.path:
+            sys.path.insert(0, str(BASE))
+        from core import quota
+        return [quota.format_status(api, quota.quota_status(api)) for api in quota.API_LABELS]
+    except Exception:
+        return []
+
+
+def run_script(script_name: str, desc: str, args: tuple[str, ...] = ()) -> tuple[str, int]:
     """Python 스크립트 실행, (출력텍스트, 리턴코드) 반환. 로그 파일에도 기록."""
     script_path = (BASE / script_name).resolve()
     if not script_path.exists():
@@ -63,7 +74,7 @@ def run_script(script_name: str, desc: str) -> tuple[str, int]:
     env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
     try:
         result = subprocess.run(
-            [sys.executable, "-u", str(script_path)],
+            [sys.executable, "-u", str(script_path), *args],
             cwd=str(BASE),
             capture_output=True,
             text=True,
@@ -115,6 +126,11 @@ with _header_right:
         with st.spinner("확인 중..."):
             run_script("check_wholesale_login.py", "로그인 상태 확인")
         st.rerun()
+    _quota_lines = _read_api_quota_lines()
+    if _quota_lines:
+        st.markdown("**API 잔여 한도**")
+        for _line in _quota_lines:
+            st.markdown(_line)
 
 
 def _style_rocket_zero(df: pd.DataFrame, rocket_col: str = "rocket_count") -> Any:
@@ -150,6 +166,11 @@ def _add_validation_icon(df: pd.DataFrame, rocket_col: str = "rocket_count", vco
 # === 작업 실행 패널 (상단, 2줄로 정리) ===
 st.subheader("🚀 작업 실행")
 st.caption("버튼 클릭 후 해당 탭에서 결과를 확인하세요.")
+_resume = st.checkbox(
+    "⏯ 중단된 작업 이어서 실행", key="chk_resume",
+    help="니치테스트·도매검색·시즌·마스터: 지난 실행이 중간에 끊겼으면 끝난 키워드는 건너뜀",
+)
+_resume_args = ("--resume",) if _resume else ()
 
 r1_1, r1_2, r1_3, r1_4, r1_5 = st.columns(5)
 with r1_1:
@@ -173,13 +194,13 @@ with r1_3:
 with r1_4:
     if st.button("🧪 니치테스트", key="btn_niche_test", help="상위 키워드 쿠팡 분석 → niche_test.csv", use_container_width=True):
         with st.spinner("니치 테스트 중..."):
-            out, code = run_script("niche_test.py", "니치 테스트")
+            out, code = run_script("niche_test.py", "니치 테스트", _resume_args)
         st.session_state["last_output"] = out
         st.session_state["last_code"] = code
 with r1_5:
     if st.button("🏪 도매검색", key="btn_wholesale", help="도매꾹·오너클랜 검색 → final_sourcing_list.csv", use_container_width=True):
         with st.spinner("도매 검색 중..."):
-            out, code = run_script("wholesale_searcher.py", "도매 검색")
+            out, code = run_script("wholesale_searcher.py", "도매 검색", _resume_args)
         st.session_state["last_output"] = out
         st.session_state["last_code"] = code
         if code == 0:
@@ -199,15 +220,15 @@ with r2_2:
         st.session_state["last_output"] = out
         st.session_state["last_code"] = code
 with r2_3:
-    if st.button("🔄 마스터", key="btn_main", help="트렌드→DB→분석 일괄 실행", use_container_width=True):
+    if st.button("🔄 마스터", key="btn_main", help="trending_keywords.csv→DB→분석 (전체 파이프라인은 run_master.py --pipeline)", use_container_width=True):
         with st.spinner("마스터 파이프라인 중..."):
-            out, code = run_script("run_master.py", "마스터 파이프라인")
+            out, code = run_script("run_master.py", "마스터 파이프라인", _resume_args)
         st.session_state["last_output"] = out
         st.session_state["last_code"] = code
 with r2_4:
     if st.button("📅 시즌", key="btn_seasonal", help="3년 시즌 패턴 → seasonal_hunter_report.csv", use_container_width=True):
         with st.spinner("시즌 헌터 중..."):
-            out, code = run_script("seasonal_analyzer.py", "시즌 헌터")
+            out, code = run_script("seasonal_analyzer.py", "시즌 헌터", _resume_args)
         st.session_state["last_output"] = out
         st.session_state["last_code"] = code
 with r2_5:
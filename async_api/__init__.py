@@ -0,0 +1,29 @@
+"""
+async_api - asyncio 기반 API 클라이언트 (쿠팡 파트너스 / 네이버 검색광고 keywordstool / 네이버 데이터랩)
+서명·파싱·캐시·API 키별 속도 버킷은 동기 모듈(coupang_api, naver_api, naver_datalab)과 공유하므로
+동기 스크립트와 동시에 돌아도 같은 예산을 나눠 씀.
+API별 동시 요청 수(CONCURRENCY) 안에서 여러 요청을 동시에 진행 → 네트워크 대기 시간 동안 놀지 않음.
+
+    from async_api import search_products_bulk
+    results = search_products_bulk(keywords, 10, ACCESS_KEY, SECRET_KEY)   # 동기 래퍼
+
+    async with new_session(4) as session:                                   # 코루틴에서 직접 사용
+        data = await coupang.search_products(session, "물티슈", 10, ACCESS_KEY, SECRET_KEY)
+"""
+
+from async_api.base import gather_limited, new_session, run_sync
+from async_api.coupang import search_products_bulk, search_products_many
+from async_api.datalab import get_monthly_trends, get_monthly_trends_bulk
+from async_api.searchad import get_monthly_search_volumes, get_monthly_search_volumes_bulk
+
+__all__ = [
+    "gather_limited",
+    "new_session",
+    "run_sync",
+    "search_products_many",
+    "search_products_bulk",
+    "get_monthly_search_volumes",
+    "get_monthly_search_volumes_bulk",
+    "get_monthly_trends",
+    "get_monthly_trends_bulk",
+]
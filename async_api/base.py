@@ -0,0 +1,76 @@
+"""
+base.py - 비동기 클라이언트 공통: 세션, 속도 제어 대기, 동시 요청 수 제한 gather, 동기 래퍼
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+import aiohttp
+
+from core import deadline
+from core.rate_limit import AimdController
+
+REQUEST_TIMEOUT_SEC = 30
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def new_session(concurrency: int, timeout: float = REQUEST_TIMEOUT_SEC) -> aiohttp.ClientSession:
+    """API별 세션 (keep-alive 연결 수 = 동시 요청 수)"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=max(1, concurrency)),
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    )
+
+
+async def acquire(throttle: AimdController) -> None:
+    """
+    동기 클라이언트와 같은 API 키 버킷에서 토큰 예약 후 비동기 대기.
+    버킷 상태는 SQLite 공유라 예약은 스레드에서 (이벤트 루프 블로킹 방지).
+    """
+    wait = await asyncio.to_thread(throttle.reserve)
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+async def gather_limited(
+    items: Iterable[T],
+    fn: Callable[[T], Awaitable[R]],
+    concurrency: int,
+) -> list[R]:
+    """items 각각에 fn 실행, 동시에 최대 concurrency개 진행. 입력 순서대로 결과 반환."""
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run(item: T) -> R:
+        async with sem:
+            return await fn(item)
+
+    return await asyncio.gather(*(_run(item) for item in items))
+
+
+def run_sync(coro: Awaitable[R]) -> R:
+    """
+    기존 동기 스크립트에서 코루틴 실행.
+    이미 이벤트 루프가 도는 곳(Streamlit 등)에서 부르면 별도 스레드의 새 루프에서 실행.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    box: dict = {}
+
+    def _target():
+        try:
+            box["value"] = asyncio.run(coro)
+        except BaseException as e:  # 호출 스레드에서 다시 발생시킴
+            box["error"] = e
+
+    t = threading.Thread(target=deadline.propagate(_target), daemon=True)  # 호출한 쪽의 실행 마감 유지
+    t.start()
+    t.join()
+    if "error" in box:
+        raise box["error"]
+    return box["value"]
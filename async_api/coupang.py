@@ -0,0 +1,118 @@
+"""
+coupang.py - 쿠팡 파트너스 상품 검색 비동기 클라이언트
+서명(generate_hmac)·응답 판정·키 풀·API 키별 속도 버킷은 coupang_api와 공유.
+"""
+
+import asyncio
+import json
+
+import aiohttp
+
+import coupang_api
+from async_api.base import acquire, gather_limited, new_session, run_sync
+from core import deadline
+
+CONCURRENCY = 4  # 동시 요청 수 (실제 호출 속도는 키별 버킷이 제한)
+REQUEST_TIMEOUT_SEC = 15
+
+
+async def search_products(
+    session: aiohttp.ClientSession,
+    keyword: str,
+    limit: int,
+    access_key: str,
+    secret_key: str,
+    sub_id: str = "coupang_gross",
+    min_price: int | None = None,
+    max_price: int | None = None,
+    use_cache: bool = True,
+) -> dict | None:
+    """coupang_api.search_products의 비동기 버전 (같은 raw_scrapes 캐시 사용, 실패 시 None)"""
+    source = coupang_api._cache_source(limit, sub_id, min_price, max_price)
+    if use_cache:
+        cached = await asyncio.to_thread(coupang_api.cache_get, keyword, source)
+        if cached is not None:
+            await asyncio.to_thread(coupang_api.record_snapshot, keyword, cached, True)
+            return cached
+    query_string = coupang_api._search_query(keyword, limit, sub_id, min_price, max_price)
+    path = coupang_api.SEARCH_PATH
+    method = "GET"
+    url = coupang_api.BASE_URL + path + "?" + query_string
+    pool = coupang_api._get_pool(access_key, secret_key)
+
+    for attempt in range(1, coupang_api.THROTTLE_RETRIES + len(pool) + 1):
+        if deadline.expired():
+            print(f"  [마감] 실행 마감 시각 초과 → 검색 중단: {keyword}")
+            return None
+        if not coupang_api._circuit.allow():
+            print(f"  [차단 회로] 쿠팡 API 연속 실패 → 요청 생략: {keyword}")
+            return None
+        key = await asyncio.to_thread(pool.pick)
+        if key is None:
+            print("  [API 한도] 사용 가능한 쿠팡 키 없음 (모든 키 일일 한도 소진)")
+            return None
+        throttle = coupang_api._get_throttle(key[0])
+        await acquire(throttle)
+        authorization = coupang_api.generate_hmac(method, path, query_string, key[1], key[0])
+        try:
+            async with session.get(
+                url,
+                headers={
+                    "Authorization": authorization,
+                    "Content-Type": "application/json; charset=utf-8",
+                },
+                timeout=aiohttp.ClientTimeout(total=deadline.timeout_for(REQUEST_TIMEOUT_SEC)),
+            ) as resp:
+                text = await resp.text()
+                status = resp.status
+                retry_after = resp.headers.get("Retry-After")
+            coupang_api.record_circuit(status)
+            data = json.loads(text) if status == 200 else None
+            verdict = await asyncio.to_thread(
+                coupang_api._check_response, status, text, data, retry_after, throttle, attempt
+            )
+            if verdict == "retry":
+                pool.cooldown(key, coupang_api.parse_retry_after(retry_after))
+                continue
+            if verdict != "ok":
+                return None
+            await asyncio.to_thread(coupang_api.cache_put, keyword, source, data)
+            await asyncio.to_thread(coupang_api.record_snapshot, keyword, data)
+            return data
+        except Exception as e:
+            print(f"  [API 오류] {e}")
+            if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                coupang_api.record_circuit(None)
+            return None
+    return None
+
+
+async def search_products_many(
+    keywords: list[str],
+    limit: int,
+    access_key: str,
+    secret_key: str,
+    sub_id: str = "coupang_gross",
+    concurrency: int = CONCURRENCY,
+) -> dict[str, dict | None]:
+    """여러 키워드 동시 검색. {키워드: 응답 또는 None}"""
+    unique = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    async with new_session(concurrency) as session:
+        results = await gather_limited(
+            unique,
+            lambda kw: search_products(session, kw, limit, access_key, secret_key, sub_id),
+            concurrency,
+        )
+    return dict(zip(unique, results))
+
+
+def search_products_bulk(
+    keywords: list[str],
+    limit: int,
+    access_key: str,
+    secret_key: str,
+    sub_id: str = "coupang_gross",
+    concurrency: int = CONCURRENCY,
+) -> dict[str, dict | None]:
+    """search_products_many 동기 래퍼 (기존 스크립트용)"""
+    return run_sync(search_products_many(keywords, limit, access_key, secret_key, sub_id, concurrency))
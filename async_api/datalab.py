@@ -0,0 +1,133 @@
+"""
+datalab.py - 네이버 데이터랩 검색어 트렌드 비동기 클라이언트
+증분 저장소·앵커 배율 환산(naver_datalab.TrendJob)·Client ID별 속도 버킷은 naver_datalab과 공유.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+
+import aiohttp
+
+import naver_datalab
+from async_api.base import acquire, gather_limited, new_session, run_sync
+from core.database import DB_PATH
+from core import deadline
+from core.rate_limit import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY = 2  # 데이터랩은 일일 한도가 작아 동시 요청을 적게
+
+
+async def request_trend(
+    session: aiohttp.ClientSession,
+    keywords: list[str],
+    start_month: str,
+    client_id: str,
+    client_secret: str,
+) -> dict[str, dict[str, float]] | None:
+    """naver_datalab._request_trend의 비동기 버전. {키워드: {"YYYY-MM": ratio}}, 실패 시 None."""
+    body = naver_datalab._request_body(keywords, start_month)
+    label = ",".join(keywords)
+    pool = naver_datalab._get_pool(client_id, client_secret)
+
+    for attempt in range(1, naver_datalab.MAX_RETRIES + len(pool)):
+        if deadline.expired():
+            logger.warning("실행 마감 시각 초과 → 데이터랩 조회 중단: %s", label)
+            return None
+        if not naver_datalab._circuit.allow():
+            logger.debug("데이터랩 차단 회로 열림 → 요청 생략: %s", label)
+            return None
+        key = await asyncio.to_thread(pool.pick)
+        if key is None:
+            logger.warning("사용 가능한 데이터랩 API 키 없음 (모든 키 일일 한도 소진): %s", label)
+            return None
+        throttle = naver_datalab._get_throttle(key[0])
+        try:
+            await acquire(throttle)
+            headers = naver_datalab._request_headers(*key)
+            async with session.post(
+                naver_datalab.API_URL, headers=headers, json=body,
+                timeout=aiohttp.ClientTimeout(total=deadline.timeout_for(naver_datalab.REQUEST_TIMEOUT_SEC)),
+            ) as resp:
+                if resp.status == 429:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    if naver_datalab._is_quota_exceeded(await resp.text()):
+                        await asyncio.to_thread(pool.mark_exhausted, key)
+                        continue
+                    await asyncio.to_thread(throttle.on_throttle, retry_after)
+                    pool.cooldown(key, retry_after)
+                    logger.warning(
+                        "데이터랩 API 호출 한도 초과 (시도 %d/%d): %s → %.2f회/초",
+                        attempt, naver_datalab.MAX_RETRIES, label, throttle.rate,
+                    )
+                    continue
+                if resp.status >= 400:
+                    logger.warning(
+                        "데이터랩 API 요청 실패 (시도 %d/%d): %s - HTTP %d",
+                        attempt, naver_datalab.MAX_RETRIES, label, resp.status,
+                    )
+                    if resp.status in (401, 403) or resp.status >= 500:
+                        naver_datalab._circuit.record_failure(f"HTTP {resp.status}")
+                else:
+                    data = await resp.json(content_type=None)
+                    await asyncio.to_thread(throttle.on_success)
+                    naver_datalab._circuit.record_success()
+                    return naver_datalab._parse_results(data)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("데이터랩 API 요청 실패 (시도 %d/%d): %s - %s", attempt, naver_datalab.MAX_RETRIES, label, e)
+            naver_datalab._circuit.record_failure(type(e).__name__)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("데이터랩 API 응답 파싱 오류: %s", e)
+        if attempt < naver_datalab.MAX_RETRIES and not naver_datalab._circuit.is_open:
+            await asyncio.sleep(naver_datalab.RETRY_DELAY_SEC)
+    return None
+
+
+async def get_monthly_trends(
+    keywords: list[str],
+    start_month: str,
+    client_id: str,
+    client_secret: str,
+    normalize: bool = True,
+    anchor: str | None = None,
+    db_path: Path = DB_PATH,
+    concurrency: int = CONCURRENCY,
+) -> dict[str, list[dict]]:
+    """
+    naver_datalab.get_monthly_trends의 비동기 버전 (저장소에 없는 달만, 묶음 동시 요청).
+    앵커 기준 시계열이 아직 없으면 첫 묶음으로 기준을 정한 뒤 나머지를 동시에 요청.
+    """
+    job = await asyncio.to_thread(naver_datalab.TrendJob, keywords, start_month, anchor, db_path)
+    batches = list(job.batches)
+    if not batches:
+        return job.result(normalize)
+
+    async with new_session(concurrency) as session:
+        async def _fetch(request: tuple[list[str], str]):
+            return await request_trend(session, request[0], request[1], client_id, client_secret)
+
+        if not job.anchor_seeded:
+            request = job.request_for(batches.pop(0))
+            fetched = await _fetch(request)
+            await asyncio.to_thread(job.apply, request, fetched)
+        pending_requests = [job.request_for(chunk) for chunk in batches]
+        fetched_all = await gather_limited(pending_requests, _fetch, concurrency)
+        for request, fetched in zip(pending_requests, fetched_all):
+            await asyncio.to_thread(job.apply, request, fetched)
+    return job.result(normalize)
+
+
+def get_monthly_trends_bulk(
+    keywords: list[str],
+    start_month: str,
+    client_id: str,
+    client_secret: str,
+    normalize: bool = True,
+    concurrency: int = CONCURRENCY,
+) -> dict[str, list[dict]]:
+    """get_monthly_trends 동기 래퍼 (기존 스크립트용)"""
+    return run_sync(
+        get_monthly_trends(keywords, start_month, client_id, client_secret, normalize, concurrency=concurrency)
+    )
@@ -0,0 +1,155 @@
+"""
+searchad.py - 네이버 검색광고 keywordstool 비동기 클라이언트
+서명(_generate_signature)·응답 수집(_harvest)·검색량 캐시·API 키별 속도 버킷은 naver_api와 공유.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+
+import naver_api
+from async_api.base import acquire, gather_limited, new_session, run_sync
+from core import deadline
+from core.rate_limit import parse_retry_after
+from core.volume_store import normalize_keyword
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY = 4
+REQUEST_TIMEOUT_SEC = 15
+
+
+async def request_keywordstool(
+    session: aiohttp.ClientSession,
+    hint_keywords: list[str],
+    customer_id: str,
+    license_key: str,
+    secret_key: str,
+) -> list[dict] | None:
+    """naver_api._request_keywordstool의 비동기 버전. keywordList 반환, 실패 시 None."""
+    uri = naver_api.KEYWORDSTOOL_URI
+    params = naver_api._keywordstool_params(hint_keywords)
+    label = params["hintKeywords"]
+    pool = naver_api._get_pool(customer_id, license_key, secret_key)
+
+    for attempt in range(1, naver_api.MAX_RETRIES + len(pool)):
+        if deadline.expired():
+            logger.warning("실행 마감 시각 초과 → keywordstool 조회 중단: %s", label)
+            return None
+        if not naver_api._circuit.allow():
+            logger.debug("keywordstool 차단 회로 열림 → 요청 생략: %s", label)
+            return None
+        key = await asyncio.to_thread(pool.pick)
+        if key is None:
+            logger.warning("사용 가능한 검색광고 API 키 없음 (모든 키 일일 한도 소진): %s", label)
+            return None
+        throttle = naver_api._get_throttle(key[0], key[1])
+        try:
+            await acquire(throttle)
+            headers = naver_api._get_headers("GET", uri, *key)
+            async with session.get(
+                naver_api.BASE_URL + uri,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=deadline.timeout_for(REQUEST_TIMEOUT_SEC)),
+            ) as resp:
+                if resp.status == 429:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    await asyncio.to_thread(throttle.on_throttle, retry_after)
+                    pool.cooldown(key, retry_after)
+                    logger.warning(
+                        "네이버 검색광고 API 호출 한도 초과 (시도 %d/%d): %s → %.2f회/초",
+                        attempt, naver_api.MAX_RETRIES, label, throttle.rate,
+                    )
+                    continue
+                if resp.status == 403:
+                    logger.warning("API 확인 필요 (403 Forbidden): config.py API 키·승인 확인")
+                elif resp.status >= 400:
+                    logger.warning(
+                        "네이버 검색광고 API 요청 실패 (시도 %d/%d): %s - HTTP %d",
+                        attempt, naver_api.MAX_RETRIES, label, resp.status,
+                    )
+                else:
+                    data = await resp.json(content_type=None)
+                    await asyncio.to_thread(throttle.on_success)
+                    naver_api._circuit.record_success()
+                    return data.get("keywordList") or []
+                if resp.status in (401, 403) or resp.status >= 500:
+                    naver_api._circuit.record_failure(f"HTTP {resp.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("API 확인 필요 (요청 실패): %s", e)
+            naver_api._circuit.record_failure(type(e).__name__)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("API 확인 필요 (파싱 오류): %s", e)
+        if attempt < naver_api.MAX_RETRIES and not naver_api._circuit.is_open:
+            await asyncio.sleep(naver_api.RETRY_DELAY_SEC)
+    return None
+
+
+async def get_monthly_search_volumes(
+    keywords: list[str],
+    customer_id: str,
+    license_key: str,
+    secret_key: str,
+    concurrency: int = CONCURRENCY,
+) -> dict[str, float | None]:
+    """
+    naver_api.get_monthly_search_volumes의 비동기 버전 (캐시 먼저, 나머지는 5개씩 묶어 동시 요청).
+    묶음 응답에 정확히 일치하는 행이 없는 키워드는 단건 조회(대안 규칙)로 보완.
+    """
+    unique = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    result: dict[str, float | None] = dict(await asyncio.to_thread(naver_api._cache.get_many, unique))
+    pending = [kw for kw in unique if kw not in result]
+    size = naver_api.MAX_HINT_KEYWORDS
+    batches = [pending[i : i + size] for i in range(0, len(pending), size)]
+    if not batches:
+        return {kw: result.get(kw) for kw in unique}
+
+    async with new_session(concurrency) as session:
+        lists = await gather_limited(
+            batches,
+            lambda batch: request_keywordstool(session, batch, customer_id, license_key, secret_key),
+            concurrency,
+        )
+        harvested: dict[str, float] = {}
+        unmatched: list[str] = []
+        for batch, keyword_list in zip(batches, lists):
+            if keyword_list is None:
+                for kw in batch:
+                    result[kw] = None
+                continue
+            harvested.update(await asyncio.to_thread(naver_api._harvest, keyword_list, ",".join(batch)))
+        for batch, keyword_list in zip(batches, lists):
+            if keyword_list is None:
+                continue
+            for kw in batch:
+                norm = normalize_keyword(kw)
+                if norm in harvested:
+                    result[kw] = harvested[norm]
+                else:
+                    unmatched.append(kw)
+
+        singles = await gather_limited(
+            unmatched,
+            lambda kw: request_keywordstool(session, [kw], customer_id, license_key, secret_key),
+            concurrency,
+        )
+        for kw, keyword_list in zip(unmatched, singles):
+            if keyword_list is None:
+                result[kw] = None
+            else:
+                result[kw] = await asyncio.to_thread(naver_api._single_volume, kw, keyword_list)
+
+    return {kw: result.get(kw) for kw in unique}
+
+
+def get_monthly_search_volumes_bulk(
+    keywords: list[str],
+    customer_id: str,
+    license_key: str,
+    secret_key: str,
+    concurrency: int = CONCURRENCY,
+) -> dict[str, float | None]:
+    """get_monthly_search_volumes 동기 래퍼 (기존 스크립트용)"""
+    return run_sync(get_monthly_search_volumes(keywords, customer_id, license_key, secret_key, concurrency))
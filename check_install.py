@@ -3,6 +3,7 @@ import sys
 
 PACKAGES = [
     ("requests", ">=2.28.0"),
+    ("aiohttp", ">=3.9.0"),
     ("playwright", ">=1.40.0"),
     ("streamlit", ">=1.28.0"),
     ("pandas", ">=2.0.0"),
@@ -5,14 +5,42 @@
 CUSTOMER_ID = "여기에_입력"
 SECRET_KEY = "여기에_입력"
 ACCESS_LICENSE = "여기에_입력"
+# (선택) 월간 검색량 캐시 유지 기간(일). 이 기간 안에 조회한 키워드는 API를 다시 호출하지 않음
+# NAVER_VOLUME_TTL_DAYS = 7
+# (선택) 추가 계정: 요청을 계정마다 나눠 보냄 (계정별 호출 속도·일일 사용량 따로 관리, 한도 초과 시 다른 계정으로 전환)
+# NAVER_SEARCHAD_KEYS = [("고객ID2", "액세스라이선스2", "비밀키2")]
+# NAVER_SEARCHAD_DAILY_QUOTA = 0  # 계정당 일일 호출 한도 (0 = 무제한)
 
 # 2. 네이버 데이터랩 API
 NAVER_CLIENT_ID = "여기에_입력"
 NAVER_CLIENT_SECRET = "여기에_입력"
+# (선택) 트렌드 배율 기준 키워드. 모든 데이터랩 요청에 함께 넣어 키워드끼리 비교 가능한 값으로 환산
+# 검색량이 꾸준한 키워드가 적합, 바꾸면 저장된 트렌드를 새로 받음
+# NAVER_DATALAB_ANCHOR = "물티슈"
+# (선택) 추가 애플리케이션 키 (애플리케이션당 하루 1,000회 한도)
+# NAVER_DATALAB_KEYS = [("클라이언트ID2", "클라이언트시크릿2")]
+# NAVER_DATALAB_DAILY_QUOTA = 1000
 
 # 3. 쿠팡 파트너스 API
 COUPANG_ACCESS_KEY = "여기에_입력"
 COUPANG_SECRET_KEY = "여기에_입력"
+# (선택) 쿠팡 API 호출 속도: 초당 요청 수, 순간 허용 burst (모든 스레드 공유)
+# COUPANG_RATE_PER_SEC = 1.0
+# COUPANG_BURST = 3
+# (선택) 쿠팡 검색 응답 캐시 유지 시간. 이 시간 안에 같은 키워드를 다시 검색하면 API를 호출하지 않음 (0 = 끔)
+# COUPANG_CACHE_TTL_HOURS = 12
+# (선택) 증분 갱신(run_master --incremental): 마지막 쿠팡 분석(market_data)이 이 시간 안이면 다시 분석하지 않고 DB 값 유지
+# COUPANG_REFRESH_HOURS = 72
+# (선택) 추가 파트너스 계정 (COUPANG_RATE_PER_SEC는 키마다 적용 → 키 수만큼 처리량 증가)
+# COUPANG_KEYS = [("액세스키2", "시크릿키2")]
+# COUPANG_DAILY_QUOTA = 0  # 키당 일일 호출 한도 (0 = 무제한)
+
+# (선택) 느린 API 응답 대응 (네이버 검색광고·데이터랩·쿠팡 공통)
+# API_HEDGE_ENABLED = True  # 최근 응답 시간 p95를 넘긴 요청을 한 번 더 보내 먼저 온 응답 사용 (호출 속도·일일 한도 안에서만)
+# RUN_DEADLINE_MINUTES = 0  # run_master·시즌 분석 1회 실행 마감(분). 지나면 남은 호출 중단 (0 = 마감 없음)
+# 차단 회로: 엔드포인트별 연속 실패(403·차단·서버 오류)가 이 횟수에 닿으면 대기 시간 동안 요청 없이 바로 실패 처리
+# CIRCUIT_FAILURE_THRESHOLD = 3
+# CIRCUIT_COOLDOWN_SEC = 300  # 대기 후 시험 요청 1건으로 복구 확인
 
 # 4. 도매 사이트 자동 로그인 (wholesale_searcher.py용, 비워두면 비로그인 검색)
 DOEMEGGOOK_ID = ""
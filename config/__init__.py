@@ -15,9 +15,25 @@ if _config_py.exists():
     ACCESS_LICENSE = getattr(_mod, "ACCESS_LICENSE", "")
     NAVER_CLIENT_ID = getattr(_mod, "NAVER_CLIENT_ID", "")
     NAVER_CLIENT_SECRET = getattr(_mod, "NAVER_CLIENT_SECRET", "")
+    NAVER_DATALAB_ANCHOR = getattr(_mod, "NAVER_DATALAB_ANCHOR", "물티슈")
     COUPANG_ACCESS_KEY = getattr(_mod, "COUPANG_ACCESS_KEY", "")
     COUPANG_SECRET_KEY = getattr(_mod, "COUPANG_SECRET_KEY", "")
     COUPANG_USER_AGENT = getattr(_mod, "COUPANG_USER_AGENT", "")
+    COUPANG_RATE_PER_SEC = getattr(_mod, "COUPANG_RATE_PER_SEC", 1.0)
+    COUPANG_BURST = getattr(_mod, "COUPANG_BURST", 3)
+    COUPANG_CACHE_TTL_HOURS = getattr(_mod, "COUPANG_CACHE_TTL_HOURS", 12)
+    COUPANG_REFRESH_HOURS = getattr(_mod, "COUPANG_REFRESH_HOURS", 72)
+    NAVER_VOLUME_TTL_DAYS = getattr(_mod, "NAVER_VOLUME_TTL_DAYS", 7)
+    COUPANG_KEYS = getattr(_mod, "COUPANG_KEYS", [])
+    COUPANG_DAILY_QUOTA = getattr(_mod, "COUPANG_DAILY_QUOTA", 0)
+    NAVER_SEARCHAD_KEYS = getattr(_mod, "NAVER_SEARCHAD_KEYS", [])
+    NAVER_SEARCHAD_DAILY_QUOTA = getattr(_mod, "NAVER_SEARCHAD_DAILY_QUOTA", 0)
+    NAVER_DATALAB_KEYS = getattr(_mod, "NAVER_DATALAB_KEYS", [])
+    NAVER_DATALAB_DAILY_QUOTA = getattr(_mod, "NAVER_DATALAB_DAILY_QUOTA", 1000)
+    API_HEDGE_ENABLED = getattr(_mod, "API_HEDGE_ENABLED", True)
+    RUN_DEADLINE_MINUTES = getattr(_mod, "RUN_DEADLINE_MINUTES", 0)
+    CIRCUIT_FAILURE_THRESHOLD = getattr(_mod, "CIRCUIT_FAILURE_THRESHOLD", 3)
+    CIRCUIT_COOLDOWN_SEC = getattr(_mod, "CIRCUIT_COOLDOWN_SEC", 300)
     DOEMEGGOOK_ID = getattr(_mod, "DOEMEGGOOK_ID", "")
     DOEMEGGOOK_PW = getattr(_mod, "DOEMEGGOOK_PW", "")
     OWNERCLAN_ID = getattr(_mod, "OWNERCLAN_ID", "")
@@ -32,9 +48,25 @@ else:
     ACCESS_LICENSE = ""
     NAVER_CLIENT_ID = ""
     NAVER_CLIENT_SECRET = ""
+    NAVER_DATALAB_ANCHOR = "물티슈"
     COUPANG_ACCESS_KEY = ""
     COUPANG_SECRET_KEY = ""
     COUPANG_USER_AGENT = ""
+    COUPANG_RATE_PER_SEC = 1.0
+    COUPANG_BURST = 3
+    COUPANG_CACHE_TTL_HOURS = 12
+    COUPANG_REFRESH_HOURS = 72
+    NAVER_VOLUME_TTL_DAYS = 7
+    COUPANG_KEYS = []
+    COUPANG_DAILY_QUOTA = 0
+    NAVER_SEARCHAD_KEYS = []
+    NAVER_SEARCHAD_DAILY_QUOTA = 0
+    NAVER_DATALAB_KEYS = []
+    NAVER_DATALAB_DAILY_QUOTA = 1000
+    API_HEDGE_ENABLED = True
+    RUN_DEADLINE_MINUTES = 0
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_COOLDOWN_SEC = 300
     DOEMEGGOOK_ID = ""
     DOEMEGGOOK_PW = ""
     OWNERCLAN_ID = ""
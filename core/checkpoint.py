@@ -0,0 +1,153 @@
+"""
+checkpoint.py - 긴 배치 작업의 키워드별 진행 기록 (SQLite checkpoint_runs / checkpoint_journal 테이블)
+키워드 하나를 끝낼 때마다 (run_id, 단계, 키워드, 상태, 결과 JSON)을 바로 기록 → 중간에 죽거나 시간 초과로
+끊겨도 --resume으로 같은 실행을 이어받아 끝난 키워드는 건너뛰고 저장된 결과를 그대로 사용.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from core.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+DONE = "done"
+SKIPPED = "skipped"  # 처리했지만 결과 없음 (검색결과 없음·마진 미달 등) → 이어받을 때도 건너뜀
+FAILED = "failed"    # 이어받을 때 다시 시도
+
+DATE_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS checkpoint_runs (
+            run_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            PRIMARY KEY (stage, run_id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS checkpoint_journal (
+            run_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            status TEXT NOT NULL,
+            result_json TEXT,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (stage, run_id, keyword)
+        )
+    """)
+    return conn
+
+
+class Journal:
+    """
+    단계 하나의 실행 기록.
+    resume=True면 같은 단계의 마지막 미완료 실행을 이어받음 (없으면 새 실행).
+    끝까지 돌면 finish()로 완료 표시 → 다음 --resume은 새 실행으로 시작.
+    """
+
+    def __init__(self, stage: str, resume: bool = False, db_path: Path = DB_PATH):
+        self.stage = stage
+        self.db_path = db_path
+        self.resumed = False
+        self._lock = threading.Lock()
+        self._completed: dict[str, dict | None] = {}
+        self._failed: set[str] = set()
+        conn = _connect(db_path)
+        try:
+            with conn:
+                row = None
+                if resume:
+                    row = conn.execute(
+                        "SELECT run_id FROM checkpoint_runs WHERE stage = ? AND finished_at IS NULL "
+                        "ORDER BY started_at DESC LIMIT 1",
+                        (stage,),
+                    ).fetchone()
+                if row:
+                    self.run_id = row[0]
+                    self.resumed = True
+                    for kw, status, result_json in conn.execute(
+                        "SELECT keyword, status, result_json FROM checkpoint_journal "
+                        "WHERE stage = ? AND run_id = ? AND status IN (?, ?) ORDER BY updated_at",
+                        (stage, self.run_id, DONE, SKIPPED),
+                    ):
+                        self._completed[kw] = json.loads(result_json) if result_json else None
+                else:
+                    now = datetime.now()
+                    self.run_id = now.strftime("%Y%m%d-%H%M%S-%f")
+                    # 이어받을 수 있는 건 마지막 실행뿐 → 이전 실행 기록은 새 실행이 시작될 때 정리
+                    conn.execute("DELETE FROM checkpoint_journal WHERE stage = ?", (stage,))
+                    conn.execute("DELETE FROM checkpoint_runs WHERE stage = ?", (stage,))
+                    conn.execute(
+                        "INSERT INTO checkpoint_runs (run_id, stage, started_at) VALUES (?, ?, ?)",
+                        (self.run_id, stage, now.strftime(DATE_FMT)),
+                    )
+        finally:
+            conn.close()
+        if self.resumed:
+            logger.info("%s: 실행 %s 이어받기 (완료 키워드 %d개 건너뜀)", stage, self.run_id, len(self._completed))
+
+    def is_done(self, keyword: str) -> bool:
+        return keyword in self._completed
+
+    def result(self, keyword: str) -> dict | None:
+        """완료 키워드의 저장된 결과 (결과 없이 끝난 키워드는 None)"""
+        return self._completed.get(keyword)
+
+    def completed(self) -> dict[str, dict | None]:
+        """{완료 키워드: 저장된 결과} (기록 순)"""
+        return dict(self._completed)
+
+    def failed(self) -> set[str]:
+        """이번 실행에서 FAILED로 기록한 키워드 (이후 완료되면 빠짐)"""
+        return set(self._failed)
+
+    def record(self, keyword: str, status: str, result: dict | None = None) -> None:
+        """키워드 하나의 처리 결과를 바로 기록 (실패해도 작업은 계속)"""
+        result_json = json.dumps(result, ensure_ascii=False, default=str) if result is not None else None
+        with self._lock:
+            try:
+                conn = _connect(self.db_path)
+                try:
+                    with conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO checkpoint_journal "
+                            "(run_id, stage, keyword, status, result_json, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                            (self.run_id, self.stage, keyword, status, result_json, datetime.now().strftime(DATE_FMT)),
+                        )
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.warning("진행 기록 저장 실패 (%s/%s): %s", self.stage, keyword, e)
+                return
+            if status in (DONE, SKIPPED):
+                self._completed[keyword] = result
+                self._failed.discard(keyword)
+            else:
+                self._completed.pop(keyword, None)
+                self._failed.add(keyword)
+
+    def finish(self) -> None:
+        """실행 완료 표시 + 같은 단계의 이전 실행 기록 정리"""
+        try:
+            conn = _connect(self.db_path)
+            try:
+                with conn:
+                    conn.execute(
+                        "UPDATE checkpoint_runs SET finished_at = ? WHERE stage = ? AND run_id = ?",
+                        (datetime.now().strftime(DATE_FMT), self.stage, self.run_id),
+                    )
+                    conn.execute("DELETE FROM checkpoint_journal WHERE stage = ? AND run_id != ?", (self.stage, self.run_id))
+                    conn.execute("DELETE FROM checkpoint_runs WHERE stage = ? AND run_id != ?", (self.stage, self.run_id))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("진행 기록 완료 처리 실패 (%s): %s", self.stage, e)
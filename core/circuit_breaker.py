@@ -0,0 +1,146 @@
+"""
+circuit_breaker.py - 외부 엔드포인트별 차단 회로 (연속 실패 시 즉시 실패 → 대기 후 시험 요청 1건)
+쿠팡 차단·검색광고 403처럼 남은 요청도 실패할 것이 확실할 때 재시도·브라우저 실행으로 시간을 쓰지 않도록.
+- closed: 정상. 연속 실패가 failure_threshold회에 닿으면 open
+- open: cooldown_sec 동안 allow()가 False (호출부는 요청 없이 바로 실패 처리)
+- half_open: 대기 후 시험 요청 1건만 허용 → 성공하면 closed, 실패하면 다시 open
+호출 한도 초과(429)는 속도 제어(core.rate_limit)의 몫이므로 실패로 세지 않음.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _load_config() -> tuple[int, float]:
+    """config.py의 CIRCUIT_FAILURE_THRESHOLD / CIRCUIT_COOLDOWN_SEC"""
+    try:
+        from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN_SEC
+        return max(1, int(CIRCUIT_FAILURE_THRESHOLD)), float(CIRCUIT_COOLDOWN_SEC)
+    except (ImportError, TypeError, ValueError):
+        return 3, 300.0
+
+
+FAILURE_THRESHOLD, COOLDOWN_SEC = _load_config()
+
+
+class CircuitBreaker:
+    """엔드포인트 하나의 차단 회로 (스레드 안전, 프로세스 단위)"""
+
+    def __init__(self, name: str, failure_threshold: int | None = None, cooldown_sec: float | None = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or FAILURE_THRESHOLD
+        self.cooldown_sec = COOLDOWN_SEC if cooldown_sec is None else cooldown_sec
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+        self.rejected = 0  # open 상태에서 요청 없이 실패 처리한 횟수
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """지금 요청하면 거절되는지 (시험 요청 자리를 차지하지 않는 확인용)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == OPEN:
+                return now - self._opened_at < self.cooldown_sec
+            if self._state == HALF_OPEN:
+                return now - self._probe_at < self.cooldown_sec
+            return False
+
+    def retry_in(self) -> float:
+        """다음 시험 요청까지 남은 초 (closed면 0)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return 0.0
+            since = self._opened_at if self._state == OPEN else self._probe_at
+            return max(0.0, self.cooldown_sec - (time.monotonic() - since))
+
+    def allow(self) -> bool:
+        """
+        요청해도 되는지. open 대기가 끝났으면 이 호출자에게 시험 요청 1건을 맡기고 True.
+        시험 요청 결과가 기록되지 않은 채 cooldown_sec이 지나면 다음 호출자에게 다시 맡김.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == CLOSED:
+                return True
+            since = self._opened_at if self._state == OPEN else self._probe_at
+            if now - since < self.cooldown_sec:
+                self.rejected += 1
+                return False
+            self._state = HALF_OPEN
+            self._probe_at = now
+        logger.info("%s: 차단 회로 시험 요청", self.name)
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            recovered = self._state != CLOSED
+            self._state = CLOSED
+            self._failures = 0
+        if recovered:
+            logger.info("%s: 시험 요청 성공 → 차단 회로 닫힘", self.name)
+
+    def record_failure(self, reason: str = "") -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                tripped = self._state != OPEN
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                if tripped:
+                    self.trips += 1
+            else:
+                tripped = False
+            failures = self._failures
+        if tripped:
+            logger.warning(
+                "%s: 연속 실패 %d회%s → %.0f초 동안 요청 없이 실패 처리",
+                self.name, failures, f" ({reason})" if reason else "", self.cooldown_sec,
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name, "state": self._state, "failures": self._failures,
+                "trips": self.trips, "rejected": self.rejected,
+            }
+
+
+_registry: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def breaker(name: str) -> CircuitBreaker:
+    """이름별 차단 회로 (같은 이름이면 같은 인스턴스)"""
+    with _registry_lock:
+        cb = _registry.get(name)
+        if cb is None:
+            cb = _registry[name] = CircuitBreaker(name)
+        return cb
+
+
+def report() -> str:
+    """차단 회로 한 줄 요약 (열린 적이 있는 엔드포인트만, 없으면 빈 문자열)"""
+    with _registry_lock:
+        stats = [cb.stats() for cb in _registry.values()]
+    parts = [
+        f"{s['name']} {s['state']} (열림 {s['trips']}회, 요청 없이 실패 {s['rejected']}건)"
+        for s in stats
+        if s["trips"]
+    ]
+    return f"차단 회로: {', '.join(parts)}" if parts else ""
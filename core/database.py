@@ -65,6 +65,38 @@ def init_db():
         cur.execute("CREATE INDEX IF NOT EXISTS idx_market_data_collected ON market_data(collected_at)")
 
 
+def _upsert_product(
+    cur,
+    keyword: str,
+    category: str,
+    naver_rank: int | None,
+    naver_search_vol: float | None,
+    coupang_avg_price: int | None,
+    rocket_count: int | None,
+    opportunity_score: float | None,
+    updated_at: str,
+) -> int:
+    cur.execute("SELECT id FROM Products WHERE keyword = ?", (keyword,))
+    row = cur.fetchone()
+    if row:
+        cur.execute("""
+            UPDATE Products SET
+                category = ?, naver_rank = ?, naver_search_vol = ?,
+                coupang_avg_price = ?, rocket_count = ?, opportunity_score = ?,
+                updated_at = ?
+            WHERE keyword = ?
+        """, (category, naver_rank, naver_search_vol, coupang_avg_price,
+              rocket_count, opportunity_score, updated_at, keyword))
+        return row["id"]
+    cur.execute("""
+        INSERT INTO Products (keyword, category, naver_rank, naver_search_vol,
+            coupang_avg_price, rocket_count, opportunity_score, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (keyword, category, naver_rank, naver_search_vol, coupang_avg_price,
+          rocket_count, opportunity_score, updated_at))
+    return cur.lastrowid or 0
+
+
 def insert_product(
     keyword: str,
     category: str = "",
@@ -76,27 +108,36 @@ def insert_product(
 ) -> int:
     """Products에 삽입 또는 업데이트. 기존 keyword면 업데이트."""
     updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with db_session() as conn:
+        return _upsert_product(
+            conn.cursor(), keyword, category, naver_rank, naver_search_vol,
+            coupang_avg_price, rocket_count, opportunity_score, updated_at,
+        )
+
+
+def save_batch(products: list[dict], market_data: list[dict]) -> None:
+    """
+    Products 삽입·업데이트와 market_data 삽입을 한 트랜잭션으로 (키워드별 결과 묶음 저장).
+    products 항목: insert_product 인자 dict, market_data 항목: insert_market_data 인자 dict
+    """
+    if not products and not market_data:
+        return
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with db_session() as conn:
         cur = conn.cursor()
-        cur.execute("SELECT id FROM Products WHERE keyword = ?", (keyword,))
-        row = cur.fetchone()
-        if row:
-            cur.execute("""
-                UPDATE Products SET
-                    category = ?, naver_rank = ?, naver_search_vol = ?,
-                    coupang_avg_price = ?, rocket_count = ?, opportunity_score = ?,
-                    updated_at = ?
-                WHERE keyword = ?
-            """, (category, naver_rank, naver_search_vol, coupang_avg_price,
-                  rocket_count, opportunity_score, updated_at, keyword))
-            return row["id"]
-        cur.execute("""
-            INSERT INTO Products (keyword, category, naver_rank, naver_search_vol,
-                coupang_avg_price, rocket_count, opportunity_score, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (keyword, category, naver_rank, naver_search_vol, coupang_avg_price,
-              rocket_count, opportunity_score, updated_at))
-        return cur.lastrowid or 0
+        for p in products:
+            _upsert_product(
+                cur, p["keyword"], p.get("category", ""), p.get("naver_rank"), p.get("naver_search_vol"),
+                p.get("coupang_avg_price"), p.get("rocket_count"), p.get("opportunity_score"), now,
+            )
+        cur.executemany("""
+            INSERT INTO market_data (keyword, search_vol, rocket_count, margin_rate, credibility_score, collected_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (m["keyword"], m.get("search_vol"), m.get("rocket_count"), m.get("margin_rate"),
+             m.get("credibility_score"), m.get("collected_at") or now)
+            for m in market_data
+        ])
 
 
 def get_all_products() -> list[dict]:
@@ -148,6 +189,30 @@ def update_product_rocket_count(keyword: str, rocket_count: int, opportunity_sco
         return True
 
 
+def latest_analysis(keywords: list[str]) -> dict[str, dict]:
+    """
+    키워드별 마지막 분석: {키워드: Products 행 + analyzed_at(가장 최근 market_data.collected_at)}
+    market_data가 없는 키워드(쿠팡 분석 전)는 제외
+    """
+    result: dict[str, dict] = {}
+    kws = list(dict.fromkeys(keywords))
+    with db_session() as conn:
+        cur = conn.cursor()
+        for i in range(0, len(kws), 500):  # SQLite 변수 개수 제한
+            chunk = kws[i : i + 500]
+            ph = ",".join("?" * len(chunk))
+            cur.execute(f"""
+                SELECT p.*, m.analyzed_at FROM Products p
+                JOIN (
+                    SELECT keyword, MAX(collected_at) AS analyzed_at FROM market_data
+                    WHERE keyword IN ({ph}) GROUP BY keyword
+                ) m ON m.keyword = p.keyword
+            """, chunk)
+            for row in cur.fetchall():
+                result[row["keyword"]] = dict(row)
+    return result
+
+
 def get_products_by_keywords(keywords: list[str]) -> list[dict]:
     if not keywords:
         return []
@@ -0,0 +1,240 @@
+"""
+deadline.py - 실행 마감 시각 전파 + 느린 호출 헤지(hedged request)
+- run_deadline(): 실행 1회(runner·시즌 분석 등)의 마감 시각을 정하면 그 안의 모든 API 호출이
+  timeout_for()로 남은 시간만큼만 기다리고, 재시도 대기도 sleep()이 마감에서 끊음 → 한 요청이 실행 전체를 붙잡지 않음
+- hedged(): 호출이 최근 응답 시간 p95를 넘기면 같은 요청을 한 번 더 보내 먼저 끝난 응답 사용.
+  추가 요청은 can_hedge()(토큰 버킷·일일 한도 확인)가 허락할 때만 → 호출 예산 안에서만 헤지
+마감은 contextvars로 실행 흐름마다 따로 (병렬 파이프라인 단계끼리 섞이지 않음).
+워커 스레드에는 자동으로 넘어가지 않으므로 submit할 함수를 propagate()로 감싸 같은 마감을 따르게 함.
+"""
+
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MIN_TIMEOUT_SEC = 1.0  # 마감 직전이라도 요청 timeout은 이 값 이상 (0초 timeout 방지)
+LATENCY_WINDOW = 200  # p95 계산에 쓰는 최근 응답 수
+HEDGE_MIN_SAMPLES = 20  # 응답 시간 표본이 이보다 적으면 헤지하지 않음
+HEDGE_MIN_DELAY_SEC = 0.5  # p95가 아주 짧아도 이 시간은 기다린 뒤 헤지
+
+
+def _load_hedge_enabled() -> bool:
+    """config.py의 API_HEDGE_ENABLED (기본 사용)"""
+    try:
+        from config import API_HEDGE_ENABLED
+        return bool(API_HEDGE_ENABLED)
+    except ImportError:
+        return True
+
+
+def _load_run_deadline() -> float | None:
+    """config.py의 RUN_DEADLINE_MINUTES → 초 (0 또는 미설정 = 마감 없음)"""
+    try:
+        from config import RUN_DEADLINE_MINUTES
+        minutes = float(RUN_DEADLINE_MINUTES or 0)
+    except (ImportError, TypeError, ValueError):
+        return None
+    return minutes * 60 if minutes > 0 else None
+
+
+HEDGE_ENABLED = _load_hedge_enabled()
+RUN_DEADLINE_SEC = _load_run_deadline()
+
+
+class DeadlineExceeded(Exception):
+    """실행 마감 시각이 지나 새 호출을 시작하지 않음"""
+
+
+# time.monotonic() 기준 마감 시각. 스레드·asyncio 태스크마다 따로 → 순서 없이 끝나는 블록끼리 덮어쓰지 않음
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("run_deadline", default=None)
+
+
+@contextmanager
+def run_deadline(seconds: float | None = None) -> Iterator[None]:
+    """
+    with 블록 안의 API 호출에 마감 적용 (seconds 기본값: config RUN_DEADLINE_MINUTES, None이면 마감 없음).
+    바깥에 더 이른 마감이 있으면 그 마감 유지.
+    """
+    seconds = RUN_DEADLINE_SEC if seconds is None else seconds
+    previous = _deadline.get()
+    until = previous
+    if seconds is not None:
+        until = time.monotonic() + seconds
+        until = until if previous is None else min(previous, until)
+    token = _deadline.set(until)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def propagate(fn: Callable[..., T]) -> Callable[..., T]:
+    """지금 마감을 워커 스레드에서도 따르도록 감싼 fn (executor.submit(propagate(fn), ...))"""
+    until = _deadline.get()
+
+    @functools.wraps(fn)
+    def _run(*args, **kwargs) -> T:
+        token = _deadline.set(until)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _deadline.reset(token)
+    return _run
+
+
+def remaining() -> float | None:
+    """마감까지 남은 초 (마감 없음 = None, 지났으면 0)"""
+    until = _deadline.get()
+    if until is None:
+        return None
+    return max(0.0, until - time.monotonic())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    """마감이 지났으면 DeadlineExceeded"""
+    if expired():
+        raise DeadlineExceeded("실행 마감 시각 초과")
+
+
+def timeout_for(default: float) -> float:
+    """요청 timeout: 기본값과 남은 시간 중 짧은 쪽 (최소 MIN_TIMEOUT_SEC)"""
+    left = remaining()
+    if left is None:
+        return default
+    return max(MIN_TIMEOUT_SEC, min(default, left))
+
+
+def sleep(seconds: float) -> bool:
+    """재시도 대기 (마감을 넘기지 않음). 대기 후에도 마감 전이면 True"""
+    left = remaining()
+    if left is not None:
+        seconds = min(seconds, left)
+    if seconds > 0:
+        time.sleep(seconds)
+    return not expired()
+
+
+class LatencyTracker:
+    """엔드포인트별 최근 응답 시간 (헤지 시점 = p95)"""
+
+    def __init__(self, name: str, window: int = LATENCY_WINDOW):
+        self.name = name
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def p95(self) -> float | None:
+        """최근 응답 시간 95번째 백분위 (표본이 HEDGE_MIN_SAMPLES 미만이면 None)"""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def stats(self) -> dict:
+        return {"name": self.name, "samples": len(self), "p95": self.p95(), "hedged": self.hedged, "hedge_wins": self.hedge_wins}
+
+
+_trackers: list[LatencyTracker] = []
+
+
+def tracker(name: str) -> LatencyTracker:
+    """이름별 응답 시간 기록기 (report()에 포함)"""
+    t = LatencyTracker(name)
+    _trackers.append(t)
+    return t
+
+
+def _timed(fn: Callable[[], T], latency: LatencyTracker) -> Callable[[], T]:
+    def _run() -> T:
+        started = time.monotonic()
+        result = fn()
+        latency.record(time.monotonic() - started)
+        return result
+    return _run
+
+
+def _start(fn: Callable[[], T]) -> "Future[T]":
+    """fn을 새 데몬 스레드에서 실행 (공용 풀 대기열에 막혀 느린 호출로 오인되지 않도록 호출마다 스레드)"""
+    future: Future = Future()
+
+    def _run() -> None:
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=propagate(_run), name="hedge", daemon=True).start()
+    return future
+
+
+def hedged(fn: Callable[[], T], latency: LatencyTracker, can_hedge: Callable[[], bool] | None = None) -> T:
+    """
+    fn() 실행. p95를 넘기도록 끝나지 않으면 can_hedge()가 허락할 때 fn()을 한 번 더 보내 먼저 성공한 결과 반환.
+    둘 다 실패하면 먼저 받은 예외 전달. 진 쪽 요청은 취소할 수 없으므로 끝날 때까지 버려짐 (결과 무시).
+    헤지 꺼짐·표본 부족이면 호출 스레드에서 그대로 실행.
+    """
+    delay = latency.p95() if HEDGE_ENABLED else None
+    if delay is None:
+        return _timed(fn, latency)()
+    delay = max(HEDGE_MIN_DELAY_SEC, delay)
+    left = remaining()
+    if left is not None and left <= delay:
+        return _timed(fn, latency)()
+
+    primary = _start(_timed(fn, latency))
+    done, _ = wait([primary], timeout=delay)
+    if done or (can_hedge is not None and not can_hedge()):
+        return primary.result()
+
+    with latency._lock:
+        latency.hedged += 1
+    backup = _start(_timed(fn, latency))
+    logger.debug("%s: %.2f초 초과 → 헤지 요청", latency.name, delay)
+    pending = {primary, backup}
+    first_error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                if future is backup:
+                    with latency._lock:
+                        latency.hedge_wins += 1
+                return future.result()
+            first_error = first_error or error
+    raise first_error
+
+
+def report() -> str:
+    """헤지 한 줄 요약 (헤지가 있었던 엔드포인트만, 없으면 빈 문자열)"""
+    parts = [
+        f"{s['name']} 헤지 {s['hedged']}회 (먼저 도착 {s['hedge_wins']}, p95 {s['p95']:.2f}초)"
+        for s in (t.stats() for t in _trackers)
+        if s["hedged"]
+    ]
+    return f"느린 호출 헤지: {', '.join(parts)}" if parts else ""
@@ -0,0 +1,63 @@
+"""
+http_pool.py - 공용 HTTP 세션 풀
+API별 requests.Session을 재사용해 TCP/TLS 연결을 유지(keep-alive)하고,
+연결 오류·5xx 응답은 전송 계층(urllib3 Retry)에서 재시도.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 4
+TRANSPORT_RETRIES = 2
+RETRY_BACKOFF = 0.5  # 0.5s, 1s, ...
+RETRY_STATUS = (500, 502, 503, 504)  # 429는 호출부 속도 제어에서 처리
+
+_sessions: dict[str, requests.Session] = {}
+_pool_sizes: dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def _build_adapter(pool_size: int) -> HTTPAdapter:
+    retry = Retry(
+        total=TRANSPORT_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        # 이 프로젝트의 POST(데이터랩·쇼핑인사이트)는 모두 조회용이라 재시도해도 안전
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    # pool_block=True: 워커 수가 풀보다 많아도 새 연결을 만들지 않고 대기 → 연결 재사용 보장
+    return HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+
+
+def get_session(name: str, pool_size: int | None = None) -> requests.Session:
+    """
+    name(API) 별 공유 세션 반환. 스레드 간 공유 가능.
+    pool_size가 기존 풀보다 크면 어댑터를 교체해 풀을 늘림 (진행 중 요청은 기존 어댑터로 완료).
+    """
+    size = max(1, pool_size or DEFAULT_POOL_SIZE)
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            session.headers["Connection"] = "keep-alive"
+            _sessions[name] = session
+            _pool_sizes[name] = 0
+        if size > _pool_sizes[name]:
+            adapter = _build_adapter(size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _pool_sizes[name] = size
+        return session
+
+
+def close_all():
+    """모든 세션 종료 (스크립트 종료 시 선택적으로 호출)"""
+    with _lock:
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
+        _pool_sizes.clear()
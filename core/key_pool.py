@@ -0,0 +1,187 @@
+"""
+key_pool.py - API별 여러 계정(키) 분산 사용
+config의 키 목록(COUPANG_KEYS, NAVER_SEARCHAD_KEYS, NAVER_DATALAB_KEYS)을 순서대로 돌려 쓰고,
+키마다 일일 사용량을 api_rate_state.db에 기록 (프로세스 간 공유, 날짜가 바뀌면 0부터).
+- 키별 속도 제어기(토큰 버킷)는 각 클라이언트의 _get_throttle이 키마다 따로 둠 → 처리량이 키 수에 비례
+- 일일 한도(daily_quota)에 닿은 키, 한도 초과 응답을 받은 키는 건너뛰고 다음 키로 전환
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from core.rate_limit import RATE_DB_PATH, _drop_connection, _state_connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COOLDOWN_SEC = 60.0  # 한도 초과 응답 후 Retry-After가 없을 때 해당 키를 쉬게 하는 시간
+
+
+def key_id(key: tuple) -> str:
+    """상태 DB에 키 원문 대신 저장할 식별자 (키 튜플 첫 항목 해시)"""
+    return hashlib.sha256(str(key[0] if key else "").encode("utf-8")).hexdigest()[:10]
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+_schema_ready: set[str] = set()
+_schema_lock = threading.Lock()
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """
+    속도 제어 상태와 같은 스레드별 연결 재사용 (호출마다 새로 연결하지 않음, 테이블 생성은 DB 경로마다 한 번).
+    isolation_level=None: BEGIN IMMEDIATE로 사용량 확인·증가를 한 번에 (프로세스 간 경쟁 방지)
+    """
+    conn = _state_connection(db_path)
+    with _schema_lock:
+        if str(db_path) not in _schema_ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_key_usage (
+                    api TEXT NOT NULL,
+                    key_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    used INTEGER NOT NULL DEFAULT 0,
+                    exhausted INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (api, key_id, day)
+                )
+            """)
+            _schema_ready.add(str(db_path))
+    return conn
+
+
+def _reset(db_path: Path) -> None:
+    """오류 난 연결 버리기 (다음 호출에서 새로 연결하고 테이블도 다시 확인)"""
+    _drop_connection(db_path)
+    with _schema_lock:
+        _schema_ready.discard(str(db_path))
+
+
+def normalize_keys(keys) -> list[tuple]:
+    """
+    config 키 목록 → 튜플 목록 (빈 값·중복 제거, 순서 유지).
+    항목은 튜플/리스트 또는 dict 모두 허용 (dict는 값 순서 사용).
+    """
+    result: list[tuple] = []
+    for k in keys or []:
+        if isinstance(k, dict):
+            k = tuple(k.values())
+        k = tuple(str(v).strip() for v in (k or ()))
+        if k and all(k) and k not in result:
+            result.append(k)
+    return result
+
+
+class KeyPool:
+    """
+    한 API의 키 목록. pick()이 다음 사용 가능한 키를 골라 일일 사용량을 1 올림.
+    - 순환(round-robin) 선택 → 요청이 키마다 고르게 분산
+    - cooldown(): 한도 초과 응답을 받은 키를 잠시 제외 (이 프로세스 안에서)
+    - mark_exhausted(): 일일 한도 소진 → 오늘은 모든 프로세스에서 제외
+    """
+
+    def __init__(self, api: str, keys: list[tuple], daily_quota: int = 0, db_path: Path = RATE_DB_PATH):
+        self.api = api
+        self.keys = normalize_keys(keys)
+        self.daily_quota = max(0, int(daily_quota or 0))  # 0 = 무제한
+        self.db_path = db_path
+        self._cursor = 0
+        self._cooldown: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _take(self, key: tuple) -> bool:
+        """오늘 사용량이 한도 미만이면 1 증가 후 True"""
+        kid, day = key_id(key), _today()
+        try:
+            conn = _connect(self.db_path)
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT used, exhausted FROM api_key_usage WHERE api = ? AND key_id = ? AND day = ?",
+                (self.api, kid, day),
+            ).fetchone()
+            used, exhausted = row if row else (0, 0)
+            if exhausted or (self.daily_quota and used >= self.daily_quota):
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute("""
+                INSERT INTO api_key_usage (api, key_id, day, used) VALUES (?, ?, ?, 1)
+                ON CONFLICT(api, key_id, day) DO UPDATE SET used = used + 1
+            """, (self.api, kid, day))
+            conn.execute("COMMIT")
+            return True
+        except sqlite3.Error as e:
+            # 사용량 DB 접근 불가 시 한도 확인 없이 사용 (수집 중단 방지). 트랜잭션이 남은 연결은 버리고 다음에 새로
+            _reset(self.db_path)
+            logger.warning("키 사용량 기록 실패 (%s): %s", self.api, e)
+            return True
+
+    def pick(self) -> tuple | None:
+        """다음 사용 가능한 키 (모든 키가 일일 한도 소진이면 None)"""
+        with self._lock:
+            n = len(self.keys)
+            start = self._cursor
+            self._cursor = (self._cursor + 1) % n if n else 0
+            now = time.monotonic()
+            order = [self.keys[(start + i) % n] for i in range(n)]
+            cooling = {kid for kid, until in self._cooldown.items() if until > now}
+        # 쉬는 중인 키는 뒤로 (나머지 키가 모두 한도 소진이면 쉬는 키라도 사용 → 키별 버킷 대기로 처리)
+        order.sort(key=lambda k: key_id(k) in cooling)
+        for key in order:
+            if self._take(key):
+                return key
+        return None
+
+    def charge(self, key: tuple) -> bool:
+        """이미 고른 키로 추가 호출(헤지 요청)할 때 사용량 1 증가. 한도 밖이면 False (호출하지 않아야 함)"""
+        return self._take(key)
+
+    def cooldown(self, key: tuple, seconds: float | None = None) -> None:
+        """한도 초과 응답을 받은 키를 seconds(기본 DEFAULT_COOLDOWN_SEC) 동안 선택에서 제외"""
+        with self._lock:
+            self._cooldown[key_id(key)] = time.monotonic() + (seconds or DEFAULT_COOLDOWN_SEC)
+        if len(self.keys) > 1:
+            logger.info("%s 키 %s 한도 초과 → 다른 키로 전환", self.api, key_id(key))
+
+    def mark_exhausted(self, key: tuple) -> None:
+        """일일 한도 소진 표시 (오늘 하루 모든 프로세스에서 제외)"""
+        kid, day = key_id(key), _today()
+        try:
+            _connect(self.db_path).execute("""
+                INSERT INTO api_key_usage (api, key_id, day, exhausted) VALUES (?, ?, ?, 1)
+                ON CONFLICT(api, key_id, day) DO UPDATE SET exhausted = 1
+            """, (self.api, kid, day))
+        except sqlite3.Error as e:
+            _reset(self.db_path)
+            logger.warning("키 사용량 기록 실패 (%s): %s", self.api, e)
+        logger.warning("%s 키 %s 일일 한도 소진 → 오늘은 제외", self.api, kid)
+
+    def usage(self) -> dict[str, dict]:
+        """오늘 키별 사용량 {key_id: {"used", "exhausted", "quota"}}"""
+        rows = daily_usage(self.api, db_path=self.db_path)
+        return {
+            kid: {**rows.get(kid, {"used": 0, "exhausted": False}), "quota": self.daily_quota}
+            for kid in (key_id(k) for k in self.keys)
+        }
+
+
+def daily_usage(api: str, day: str | None = None, db_path: Path = RATE_DB_PATH) -> dict[str, dict]:
+    """day(기본 오늘)의 키별 호출 기록 {key_id: {"used", "exhausted"}} (호출 장부)"""
+    try:
+        rows = _connect(db_path).execute(
+            "SELECT key_id, used, exhausted FROM api_key_usage WHERE api = ? AND day = ?",
+            (api, day or _today()),
+        ).fetchall()
+    except sqlite3.Error as e:
+        _reset(db_path)
+        logger.warning("키 사용량 조회 실패 (%s): %s", api, e)
+        return {}
+    return {kid: {"used": used, "exhausted": bool(exhausted)} for kid, used, exhausted in rows}
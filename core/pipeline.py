@@ -0,0 +1,327 @@
+"""
+pipeline.py - 단계 의존성(DAG) 실행기
+각 단계의 입력·출력 파일과 선행 단계를 선언 → 입력 파일 내용·스크립트·파라미터 해시가 지난 성공 실행과 같고
+출력이 남아 있으면 건너뜀. 선행 단계가 끝난 단계는 바로 실행되므로 서로 독립인 가지(신뢰도·시즌·사입 필터)는 병렬.
+실행 기록은 SQLite pipeline_runs 테이블 (단계별 마지막 성공 해시).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from core.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+BASE = Path(__file__).resolve().parent.parent
+DEFAULT_WORKERS = 3
+STAGE_TIMEOUT_SEC = 3600
+LOG_FILE = BASE / "logs" / "pipeline_run.log"
+
+# 단계 결과
+RAN = "ran"
+SKIPPED = "skipped"
+FAILED = "failed"
+BLOCKED = "blocked"  # 선행 단계 실패로 실행 안 함
+
+_log_lock = threading.Lock()
+
+
+class Stage:
+    """
+    파이프라인 단계 하나.
+    script: BASE 기준 스크립트 (별도 프로세스로 실행) 또는 func: 같은 프로세스에서 호출할 함수
+    inputs / outputs: BASE 기준 파일 경로. 입력 내용이 해시에 들어감 (없는 파일은 '없음'으로)
+    deps: 먼저 끝나야 하는 단계 이름
+    params: 해시에 넣을 파라미터 (dict 또는 dict를 돌려주는 함수 — 날짜·재시도 목록처럼 실행 시점에 정해지는 값)
+    source: func 단계의 코드 파일 (코드가 바뀌면 다시 실행)
+    resumable: 스크립트가 --resume(키워드별 진행 기록 이어받기)을 지원 (run(resume=True) 때만 붙임, 해시에는 안 들어감)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        script: str | None = None,
+        func: Callable[[], object] | None = None,
+        inputs: tuple[str, ...] = (),
+        outputs: tuple[str, ...] = (),
+        deps: tuple[str, ...] = (),
+        params: dict | Callable[[], dict] | None = None,
+        args: tuple[str, ...] = (),
+        source: str | None = None,
+        resumable: bool = False,
+    ):
+        if (script is None) == (func is None):
+            raise ValueError(f"단계 {name}: script와 func 중 하나만 지정")
+        self.name = name
+        self.script = script
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.deps = tuple(deps)
+        self.params = params
+        self.args = tuple(args)
+        self.source = source or script
+        self.resumable = resumable
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r})"
+
+
+def _hash_file(h, path: Path) -> None:
+    h.update(str(path.name).encode("utf-8"))
+    if not path.exists():
+        h.update(b"\0missing")
+        return
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+
+
+def input_hash(stage: Stage, base: Path = BASE) -> str:
+    """단계 입력 해시: 스크립트(코드) + 입력 파일 내용 + 파라미터 + 실행 인자"""
+    h = hashlib.sha256()
+    if stage.source:
+        _hash_file(h, base / stage.source)
+    for rel in stage.inputs:
+        _hash_file(h, base / rel)
+    params = stage.params() if callable(stage.params) else (stage.params or {})
+    h.update(json.dumps({"params": params, "args": stage.args}, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            stage TEXT PRIMARY KEY,
+            input_hash TEXT NOT NULL,
+            duration_sec REAL,
+            finished_at TEXT NOT NULL
+        )
+    """)
+    return conn
+
+
+def last_hashes(db_path: Path = DB_PATH) -> dict[str, str]:
+    """{단계: 마지막 성공 실행의 입력 해시}"""
+    try:
+        conn = _connect(db_path)
+        try:
+            return dict(conn.execute("SELECT stage, input_hash FROM pipeline_runs").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("파이프라인 실행 기록 조회 실패: %s", e)
+        return {}
+
+
+def _record(name: str, digest: str, duration: float, db_path: Path) -> None:
+    try:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pipeline_runs (stage, input_hash, duration_sec, finished_at) VALUES (?, ?, ?, ?)",
+                    (name, digest, round(duration, 1), datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("파이프라인 실행 기록 저장 실패 (%s): %s", name, e)
+
+
+def plan(stages: list[Stage], targets: list[str] | None = None) -> list[Stage]:
+    """targets와 그 선행 단계를 실행 순서(위상 정렬)로. targets 없으면 전체. 없는 단계·순환 의존은 ValueError"""
+    by_name = {s.name: s for s in stages}
+    for s in stages:
+        for dep in s.deps:
+            if dep not in by_name:
+                raise ValueError(f"단계 {s.name}: 알 수 없는 선행 단계 {dep}")
+    for t in targets or []:
+        if t not in by_name:
+            raise ValueError(f"알 수 없는 단계: {t} (가능: {', '.join(by_name)})")
+
+    order: list[Stage] = []
+    state: dict[str, int] = {}  # 1: 방문 중, 2: 완료
+
+    def visit(name: str, path: tuple[str, ...]) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"순환 의존: {' → '.join(path + (name,))}")
+        state[name] = 1
+        for dep in by_name[name].deps:
+            visit(dep, path + (name,))
+        state[name] = 2
+        order.append(by_name[name])
+
+    for name in targets or [s.name for s in stages]:
+        visit(name, ())
+    return order
+
+
+def _write_log(name: str, text: str) -> None:
+    try:
+        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with _log_lock, open(LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(f"\n=== {datetime.now().isoformat()} | {name} ===\n{text.strip()}\n")
+    except OSError:
+        pass
+
+
+def _invoke(stage: Stage, base: Path, resume: bool = False) -> tuple[bool, str]:
+    """단계 실행 → (성공 여부, 출력·오류 메시지)"""
+    if stage.func is not None:
+        try:
+            stage.func()
+            return True, ""
+        except Exception as e:
+            logger.exception("단계 %s 오류", stage.name)
+            return False, str(e)
+    try:
+        result = subprocess.run(
+            [sys.executable, "-u", str(base / stage.script), *stage.args, *(("--resume",) if resume and stage.resumable else ())],
+            cwd=str(base),
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=STAGE_TIMEOUT_SEC,
+            env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+        )
+    except subprocess.TimeoutExpired:
+        return False, f"실행 시간 초과 ({STAGE_TIMEOUT_SEC}초)"
+    except OSError as e:
+        return False, str(e)
+    out = (result.stdout or "") + (result.stderr or "")
+    _write_log(stage.name, out)
+    return result.returncode == 0, out.strip()[-500:]
+
+
+def _execute(stage: Stage, base: Path, db_path: Path, previous: str | None, force: bool, resume: bool = False) -> str:
+    digest = input_hash(stage, base)
+    outputs_ok = all((base / rel).exists() for rel in stage.outputs)
+    if not force and digest == previous and outputs_ok:
+        logger.info("[%s] 입력 변경 없음 → 건너뜀", stage.name)
+        return SKIPPED
+
+    logger.info("[%s] 실행", stage.name)
+    started = time.monotonic()
+    ok, message = _invoke(stage, base, resume)
+    missing = [rel for rel in stage.outputs if not (base / rel).exists()]
+    if ok and missing:
+        ok, message = False, f"출력 파일 없음: {', '.join(missing)}\n{message}"
+    duration = time.monotonic() - started
+    if not ok:
+        logger.error("[%s] 실패 (%.1f초): %s", stage.name, duration, message)
+        return FAILED
+    # 입력을 제자리에서 고치는 단계(검색량 정렬 등)도 다음 실행에서 건너뛰도록 실행 후 입력 해시 저장
+    _record(stage.name, input_hash(stage, base), duration, db_path)
+    logger.info("[%s] 완료 (%.1f초)", stage.name, duration)
+    return RAN
+
+
+def run(
+    stages: list[Stage],
+    targets: list[str] | None = None,
+    force: list[str] | None = None,
+    workers: int = DEFAULT_WORKERS,
+    base: Path = BASE,
+    db_path: Path = DB_PATH,
+    resume: bool = False,
+) -> dict[str, str]:
+    """
+    DAG 실행. 선행 단계가 모두 끝난(실행·건너뜀) 단계부터 workers개까지 동시에 실행.
+    선행 단계가 실패하면 그 하위 단계는 BLOCKED. force: 해시와 무관하게 다시 실행할 단계 ('all' = 전체)
+    resume: 다시 실행하는 단계 중 resumable 스크립트는 지난 미완료 실행을 이어받음
+    반환: {단계: RAN | SKIPPED | FAILED | BLOCKED}
+    """
+    order = plan(stages, targets)
+    forced = set(force or [])
+    if "all" in forced:
+        forced = {s.name for s in order}
+    previous = last_hashes(db_path)
+    status: dict[str, str] = {}
+    pending = list(order)
+    running: dict = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        while pending or running:
+            for stage in list(pending):
+                dep_status = [status.get(dep) for dep in stage.deps]
+                if any(s in (FAILED, BLOCKED) for s in dep_status):
+                    logger.warning("[%s] 선행 단계 실패 → 실행 안 함", stage.name)
+                    status[stage.name] = BLOCKED
+                    pending.remove(stage)
+                elif all(s in (RAN, SKIPPED) for s in dep_status):
+                    pending.remove(stage)
+                    future = executor.submit(
+                        _execute, stage, base, db_path, previous.get(stage.name), stage.name in forced, resume
+                    )
+                    running[future] = stage.name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    status[name] = future.result()
+                except Exception as e:
+                    logger.exception("[%s] 실행기 오류: %s", name, e)
+                    status[name] = FAILED
+    return status
+
+
+def format_summary(status: dict[str, str]) -> str:
+    labels = {RAN: "실행", SKIPPED: "건너뜀", FAILED: "실패", BLOCKED: "보류"}
+    return "파이프라인: " + ", ".join(f"{name}={labels.get(s, s)}" for name, s in status.items())
+
+
+def default_stages(
+    limit: int = 50, deadline_sec: float | None = None, resume: bool = False, incremental: bool = False
+) -> list[Stage]:
+    """
+    기본 파이프라인.
+    trending → sort_volume ┬→ workflow (DB 적재·분석)
+                           └→ niche_test ┬→ volume → wholesale → credibility
+                                         ├→ seasonal
+                                         └→ light_weight
+    """
+    from core import retry_queue
+    from core.runner import RETRY_STAGE, run_workflow
+
+    return [
+        # 입력 파일이 없는 수집 단계: 날짜가 바뀌면 다시 수집
+        Stage("trending", script="naver_shopping_insight_scraper.py",
+              outputs=("trending_keywords.csv",),
+              params=lambda: {"date": datetime.now().strftime("%Y-%m-%d")}),
+        Stage("sort_volume", script="sort_trending_by_volume.py", deps=("trending",),
+              inputs=("trending_keywords.csv",), outputs=("trending_keywords.csv",)),
+        Stage("workflow", func=lambda: run_workflow(limit=limit, deadline_sec=deadline_sec, resume=resume, incremental=incremental),
+              source="core/runner.py", deps=("sort_volume",), inputs=("trending_keywords.csv",),
+              # 지난 실행에서 미룬 키워드가 있으면 입력이 같아도 다시 실행
+              params=lambda: {"limit": limit, "incremental": incremental, "deferred": retry_queue.pending(RETRY_STAGE)}),
+        Stage("niche_test", script="niche_test.py", deps=("sort_volume",),
+              inputs=("trending_keywords.csv",), outputs=("niche_test.csv",), resumable=True),
+        Stage("volume", script="naver_api_manager.py", deps=("niche_test",),
+              inputs=("niche_test.csv",), outputs=("niche_with_volume.csv",)),
+        Stage("wholesale", script="wholesale_searcher.py", deps=("volume",),
+              inputs=("niche_test.csv",), outputs=("final_sourcing_list.csv",), resumable=True),
+        Stage("credibility", script="market_credibility_report.py", deps=("wholesale",),
+              inputs=("niche_test.csv", "final_sourcing_list.csv"), outputs=("market_credibility_report.csv",)),
+        Stage("seasonal", script="seasonal_analyzer.py", deps=("niche_test",),
+              inputs=("niche_test.csv",), outputs=("seasonal_hunter_report.csv",), resumable=True),
+        Stage("light_weight", script="light_weight_filter.py", deps=("niche_test",),
+              inputs=("niche_test.csv",), outputs=("light_weight_niche.xlsx",)),
+    ]
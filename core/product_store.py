@@ -0,0 +1,210 @@
+"""
+product_store.py - 쿠팡 검색 결과 상품 스냅샷 저장소 (SQLite coupang_fetches / coupang_products 테이블)
+API 응답을 집계값으로 줄이지 않고 상품 단위(상품ID·가격·로켓 여부·상품명·노출 순위)로 수집 1회당 한 번 저장.
+분석 스크립트의 로켓 수·가격 통계는 이 테이블 위의 SQL 집계 → 지표·점수 변경 시 API 재호출 없이 재계산.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+DATE_FMT = "%Y-%m-%d %H:%M:%S"
+SQL_CHUNK = 500  # SQLite 변수 개수 제한
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS coupang_fetches (
+            fetch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            product_count INTEGER NOT NULL,
+            fetched_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS coupang_products (
+            fetch_id INTEGER NOT NULL,
+            keyword TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            name TEXT,
+            price INTEGER,
+            is_rocket INTEGER NOT NULL,
+            rank_position INTEGER NOT NULL,
+            fetched_at TEXT NOT NULL,
+            PRIMARY KEY (fetch_id, rank_position)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_coupang_fetches_keyword ON coupang_fetches(keyword, fetch_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_coupang_products_keyword ON coupang_products(keyword, fetched_at)")
+    return conn
+
+
+def save_snapshot(keyword: str, products: list[dict], db_path: Path = DB_PATH) -> int | None:
+    """
+    검색 1회 결과 저장. fetch_id 반환 (DB 오류면 None).
+    products: [{"product_id", "name", "price", "is_rocket"}, ...] (응답 순서 = 노출 순위)
+    상품 0개 응답도 수집 기록으로 남김 (로켓 0개 · 상품 0개도 관측값)
+    """
+    keyword = (keyword or "").strip()
+    if not keyword:
+        return None
+    fetched_at = datetime.now().strftime(DATE_FMT)
+    try:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                cur = conn.execute(
+                    "INSERT INTO coupang_fetches (keyword, product_count, fetched_at) VALUES (?, ?, ?)",
+                    (keyword, len(products), fetched_at),
+                )
+                fetch_id = cur.lastrowid
+                conn.executemany("""
+                    INSERT INTO coupang_products (
+                        fetch_id, keyword, product_id, name, price, is_rocket, rank_position, fetched_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (
+                        fetch_id, keyword, p.get("product_id") or "", p.get("name") or "",
+                        p.get("price"), int(bool(p.get("is_rocket"))), rank, fetched_at,
+                    )
+                    for rank, p in enumerate(products, 1)
+                ])
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("상품 스냅샷 저장 실패 (%s): %s", keyword, e)
+        return None
+    return fetch_id
+
+
+def has_snapshot(keyword: str, max_age_hours: float, db_path: Path = DB_PATH) -> bool:
+    """max_age_hours 이내 수집 기록이 있는지 (캐시 적중 응답의 중복 저장 방지용)"""
+    since = (datetime.now() - timedelta(hours=max_age_hours)).strftime(DATE_FMT)
+    try:
+        conn = _connect(db_path)
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM coupang_fetches WHERE keyword = ? AND fetched_at >= ? LIMIT 1",
+                ((keyword or "").strip(), since),
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("상품 스냅샷 조회 실패: %s", e)
+        return False
+    return row is not None
+
+
+def empty_stats() -> dict:
+    """수집 기록이 없는 키워드의 집계값"""
+    return {
+        "rocket_count": 0,
+        "total_products": 0,
+        "avg_price": 0,
+        "min_price": 0,
+        "max_price": 0,
+        "price_range": 0,
+        "fetches": 0,
+    }
+
+
+def keyword_stats(
+    keywords: list[str],
+    fetches: int = 1,
+    max_age_hours: float | None = None,
+    db_path: Path = DB_PATH,
+) -> dict[str, dict]:
+    """
+    키워드별 최근 fetches회 수집분을 상품ID로 중복 제거해 집계 (API 호출 없음).
+    {키워드: {"rocket_count", "total_products", "avg_price", "min_price", "max_price", "price_range", "fetches"}}
+    수집 기록이 없는 키워드도 0 값으로 포함. max_age_hours 지정 시 그 이내 수집분만 사용.
+    """
+    kws = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    result = {kw: empty_stats() for kw in kws}
+    if not kws:
+        return result
+    since = (
+        (datetime.now() - timedelta(hours=max_age_hours)).strftime(DATE_FMT)
+        if max_age_hours is not None else ""
+    )
+    try:
+        conn = _connect(db_path)
+        try:
+            for i in range(0, len(kws), SQL_CHUNK):
+                chunk = kws[i : i + SQL_CHUNK]
+                ph = ",".join("?" * len(chunk))
+                rows = conn.execute(f"""
+                    WITH recent AS (
+                        SELECT fetch_id, keyword,
+                               ROW_NUMBER() OVER (PARTITION BY keyword ORDER BY fetch_id DESC) AS rn
+                        FROM coupang_fetches
+                        WHERE keyword IN ({ph}) AND fetched_at >= ?
+                    ),
+                    picked AS (
+                        SELECT fetch_id, keyword FROM recent WHERE rn <= ?
+                    ),
+                    products AS (
+                        SELECT p.keyword, p.price, p.is_rocket,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY p.keyword,
+                                       CASE WHEN p.product_id = '' THEN p.fetch_id || ':' || p.rank_position
+                                            ELSE p.product_id END
+                                   ORDER BY p.fetch_id DESC
+                               ) AS dup
+                        FROM coupang_products p JOIN picked USING (fetch_id)
+                    ),
+                    counts AS (
+                        SELECT keyword, COUNT(*) AS n_fetches FROM picked GROUP BY keyword
+                    ),
+                    agg AS (
+                        SELECT keyword, COUNT(*) AS total, SUM(is_rocket) AS rocket,
+                               AVG(price) AS avg_p, MIN(price) AS min_p, MAX(price) AS max_p
+                        FROM products WHERE dup = 1 GROUP BY keyword
+                    )
+                    SELECT counts.keyword, counts.n_fetches, COALESCE(agg.total, 0), COALESCE(agg.rocket, 0),
+                           agg.avg_p, agg.min_p, agg.max_p
+                    FROM counts LEFT JOIN agg USING (keyword)
+                """, (*chunk, since, fetches)).fetchall()
+                for kw, n_fetches, total, rocket, avg_p, min_p, max_p in rows:
+                    stats = result[kw]
+                    stats["fetches"] = n_fetches
+                    stats["total_products"] = total
+                    stats["rocket_count"] = int(rocket)
+                    if avg_p is not None:
+                        stats["avg_price"] = round(avg_p, 0)
+                        stats["min_price"] = min_p
+                        stats["max_price"] = max_p
+                        stats["price_range"] = max_p - min_p
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("상품 스냅샷 집계 실패: %s", e)
+    return result
+
+
+def load_products(keyword: str, fetches: int = 1, db_path: Path = DB_PATH) -> list[dict]:
+    """키워드의 최근 fetches회 수집 상품 행 (새 지표 실험용, 최신 수집 → 노출 순위 순)"""
+    try:
+        conn = _connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute("""
+                SELECT p.fetch_id, p.product_id, p.name, p.price, p.is_rocket, p.rank_position, p.fetched_at
+                FROM coupang_products p
+                WHERE p.fetch_id IN (
+                    SELECT fetch_id FROM coupang_fetches WHERE keyword = ? ORDER BY fetch_id DESC LIMIT ?
+                )
+                ORDER BY p.fetch_id DESC, p.rank_position
+            """, ((keyword or "").strip(), fetches)).fetchall()
+            return [dict(r) for r in rows]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("상품 스냅샷 조회 실패: %s", e)
+        return []
@@ -0,0 +1,165 @@
+"""
+quota.py - API 일일 호출 한도 장부 + 실행 전 호출 예산 계획
+장부: key_pool이 나가는 호출마다 api_key_usage(api_rate_state.db)에 올리는 키별 일일 호출 수를 API 단위로 합산.
+계획: 실행 전에 단계별 필요 호출 수(캐시·저장소 적중 제외)를 추정하고,
+      API별 남은 한도를 우선순위가 높은 단계부터 배분. 단계 안에서는 키워드 순서(중요도 순)대로 배정
+      → 한도가 모자라도 잘리는 것은 뒤쪽(덜 중요한) 키워드.
+"""
+
+import math
+from pathlib import Path
+
+from core.key_pool import daily_usage, key_id, normalize_keys
+from core.rate_limit import RATE_DB_PATH
+
+API_LABELS = {
+    "naver_datalab": "데이터랩",
+    "naver_searchad": "검색광고",
+    "coupang": "쿠팡",
+}
+
+
+def _configured_keys(api: str) -> tuple[list[tuple], int]:
+    """config에 등록된 키 목록(기본 키 + 추가 키)과 키당 일일 한도 (0 = 무제한)"""
+    keys: list = []
+    quota = 0
+    try:
+        import config
+        if api == "naver_datalab":
+            keys = [(config.NAVER_CLIENT_ID, config.NAVER_CLIENT_SECRET)] + list(config.NAVER_DATALAB_KEYS or [])
+            quota = config.NAVER_DATALAB_DAILY_QUOTA
+        elif api == "naver_searchad":
+            keys = [(config.CUSTOMER_ID, config.ACCESS_LICENSE, config.SECRET_KEY)] + list(config.NAVER_SEARCHAD_KEYS or [])
+            quota = config.NAVER_SEARCHAD_DAILY_QUOTA
+        elif api == "coupang":
+            keys = [(config.COUPANG_ACCESS_KEY, config.COUPANG_SECRET_KEY)] + list(config.COUPANG_KEYS or [])
+            quota = config.COUPANG_DAILY_QUOTA
+    except (ImportError, AttributeError):
+        pass
+    try:
+        if api == "naver_searchad":
+            from naver_searchad_config import (
+                NAVER_SEARCHAD_CUSTOMER_ID,
+                NAVER_SEARCHAD_LICENSE_KEY,
+                NAVER_SEARCHAD_SECRET_KEY,
+            )
+            keys.append((NAVER_SEARCHAD_CUSTOMER_ID, NAVER_SEARCHAD_LICENSE_KEY, NAVER_SEARCHAD_SECRET_KEY))
+        elif api == "coupang":
+            from coupang_config import COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY
+            keys.append((COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY))
+    except ImportError:
+        pass
+    keys = [k for k in normalize_keys(keys) if "여기에_입력" not in k and not any(v.startswith("YOUR_") for v in k)]
+    try:
+        quota = int(quota or 0)
+    except (TypeError, ValueError):
+        quota = 0
+    return keys, quota
+
+
+def quota_status(api: str, db_path: Path = RATE_DB_PATH) -> dict:
+    """
+    오늘 API 한도 현황 {"used", "limit", "remaining", "keys"}.
+    limit·remaining은 키당 한도가 없으면 None (무제한). 키 수는 config 등록 키 + 오늘 호출 기록이 있는 키.
+    """
+    keys, quota = _configured_keys(api)
+    rows = daily_usage(api, db_path=db_path)
+    known = {key_id(k) for k in keys} | set(rows)
+    used = sum(r["used"] for r in rows.values())
+    if not quota or not known:
+        return {"used": used, "limit": None, "remaining": None, "keys": len(known)}
+    remaining = sum(
+        0 if rows.get(kid, {}).get("exhausted") else max(0, quota - rows.get(kid, {}).get("used", 0))
+        for kid in known
+    )
+    return {"used": used, "limit": quota * len(known), "remaining": remaining, "keys": len(known)}
+
+
+def remaining_by_api(apis: list[str] | None = None, db_path: Path = RATE_DB_PATH) -> dict[str, int | None]:
+    """API별 오늘 남은 호출 수 (None = 무제한)"""
+    return {api: quota_status(api, db_path)["remaining"] for api in (apis or list(API_LABELS))}
+
+
+def format_status(api: str, status: dict) -> str:
+    """대시보드·로그용 한 줄 (예: '데이터랩 850/1000')"""
+    label = API_LABELS.get(api, api)
+    if status["limit"] is None:
+        return f"{label} 무제한 (오늘 {status['used']}회)"
+    return f"{label} {status['remaining']}/{status['limit']}"
+
+
+class Stage:
+    """
+    실행 단계 하나의 호출 수요.
+    keywords: 처리할 키워드 (중요도 순), pending: 그중 API 호출이 필요한 키워드 (캐시·저장소 미적중)
+    per_call: 호출 1회에 처리하는 키워드 수 (묶음 조회), calls_per_keyword: 키워드 1개에 필요한 호출 수
+    priority: 작을수록 먼저 한도를 배정받음
+    """
+
+    def __init__(
+        self,
+        name: str,
+        api: str,
+        keywords: list[str],
+        pending: list[str],
+        per_call: int = 1,
+        calls_per_keyword: int = 1,
+        priority: int = 0,
+    ):
+        self.name = name
+        self.api = api
+        self.keywords = list(keywords)
+        pending_set = set(pending)
+        self.pending = [kw for kw in self.keywords if kw in pending_set]
+        self.per_call = max(1, per_call)
+        self.calls_per_keyword = max(1, calls_per_keyword)
+        self.priority = priority
+        self.granted = 0
+        self.allowed: list[str] = list(self.keywords)
+
+    @property
+    def needed(self) -> int:
+        """pending을 모두 처리하는 데 필요한 호출 수"""
+        return math.ceil(len(self.pending) / self.per_call) * self.calls_per_keyword
+
+    @property
+    def skipped(self) -> list[str]:
+        allowed = set(self.allowed)
+        return [kw for kw in self.keywords if kw not in allowed]
+
+    def _grant(self, calls: int) -> None:
+        """calls회 배정 → 앞쪽(중요한) 미적중 키워드부터 처리 가능, 캐시 적중 키워드는 항상 처리"""
+        self.granted = min(calls, self.needed)
+        n_pending = (self.granted // self.calls_per_keyword) * self.per_call
+        allowed_pending = set(self.pending[:n_pending])
+        pending_set = set(self.pending)
+        self.allowed = [kw for kw in self.keywords if kw not in pending_set or kw in allowed_pending]
+
+
+def plan(stages: list[Stage], remaining: dict[str, int | None]) -> list[Stage]:
+    """API별 남은 한도를 우선순위 순으로 단계에 배분 (stages를 갱신해 그대로 반환)"""
+    budget = dict(remaining)
+    for stage in sorted(stages, key=lambda s: s.priority):
+        left = budget.get(stage.api)
+        if left is None:  # 무제한
+            stage._grant(stage.needed)
+            continue
+        stage._grant(left)
+        budget[stage.api] = left - stage.granted
+    return stages
+
+
+def format_plan(stages: list[Stage], remaining: dict[str, int | None]) -> str:
+    """계획 요약 (실행 전 출력용)"""
+    lines = []
+    for s in stages:
+        left = remaining.get(s.api)
+        budget = "무제한" if left is None else f"남은 한도 {left}회"
+        line = (
+            f"  [{s.name}] 키워드 {len(s.keywords)}개 (캐시 적중 {len(s.keywords) - len(s.pending)}) · "
+            f"필요 호출 {s.needed}회 · 배정 {s.granted}회 ({API_LABELS.get(s.api, s.api)} {budget})"
+        )
+        if s.skipped:
+            line += f" → 한도 부족으로 하위 {len(s.skipped)}개 제외"
+        lines.append(line)
+    return "\n".join(lines)
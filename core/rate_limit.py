@@ -0,0 +1,413 @@
+"""
+rate_limit.py - API 호출 속도 제어 (토큰 버킷 + AIMD 적응 제어)
+고정 sleep 대신 초당 rate개 토큰을 충전하고 최대 burst개까지 적립.
+여러 스레드가 하나의 버킷을 공유하면 전체 호출량이 API 예산 안에서 유지됨.
+AimdController: 성공 시 rate 가산 증가, 제한 응답(429 등) 시 곱셈 감소. 학습된 rate는 DB에 저장.
+SharedTokenBucket: 버킷 상태를 SQLite(api_rate_state.db)에 두어 동시에 실행 중인
+여러 스크립트(대시보드 subprocess 등)가 API 키별 예산 하나를 나눠 씀.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from core.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# 속도 제어 상태 전용 DB (coupang_gross.db 옆). 본 DB의 긴 쓰기 트랜잭션에 막히지 않도록 분리.
+RATE_DB_PATH = DB_PATH.parent / "api_rate_state.db"
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷. 토큰이 부족하면 선착순으로 예약 후 대기."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        토큰을 예약하고 기다려야 할 초 반환 (0이면 즉시 가능).
+        부족분은 음수로 쌓여 뒤에 온 요청이 그만큼 더 기다림 → 도착 순서대로 공정하게 분배.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 남아 있을 때만 가져감 (대기·예약 없음, 헤지 같은 추가 요청용)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰 확보까지 대기. 실제 대기한 초 반환."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """seconds 동안 새 토큰 지급 중단 (Retry-After 반영). 대기 중인 예약도 함께 밀림."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def set_rate(self, rate: float, burst: int | None = None):
+        """충전 속도(및 burst) 변경. 이미 적립된 토큰은 유지."""
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            if burst is not None:
+                self.burst = max(1, int(burst))
+                self._tokens = min(self._tokens, self.burst)
+
+    def adjust_rate(self, fn) -> float:
+        """현재 rate에 fn(rate)→새 rate를 원자적으로 적용하고 새 rate 반환"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(fn(self.rate))
+            return self.rate
+
+
+class SharedTokenBucket:
+    """
+    프로세스 간 공유 토큰 버킷 (TokenBucket과 같은 인터페이스).
+    상태(rate, burst, tokens, refilled_at)를 SQLite 한 행에 두고 BEGIN IMMEDIATE로 갱신.
+    예약 방식이라 토큰이 부족해도 실패하지 않고, 예약한 순서대로 대기 → 프로세스 간 공정한 줄서기.
+    rate는 행에 저장되므로 AIMD가 조정한 속도도 모든 프로세스에 즉시 공유되고 다음 실행까지 유지됨.
+    단 첫 갱신 때 저장된 rate가 max_rate(기본: 설정 rate)보다 크면 깎음 → 설정을 낮추면 다음 실행부터 반영.
+    """
+
+    def __init__(
+        self, name: str, rate: float, burst: int = 1, db_path: Path = RATE_DB_PATH, max_rate: float | None = None
+    ):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.name = name
+        self.rate = float(rate)  # 마지막으로 읽은 공유 rate (표시용 캐시)
+        self.burst = max(1, int(burst))
+        self.db_path = db_path
+        self.max_rate = float(max_rate) if max_rate else self.rate
+        self._clamped = False  # 저장된 rate를 상한으로 깎았는지 (import 시점에 DB를 건드리지 않도록 첫 갱신 때)
+
+    def _update(self, fn) -> float:
+        """행 잠금 → 충전 → fn(state) 적용 → 저장. fn 반환값 그대로 반환."""
+        try:
+            conn = _state_connection(self.db_path)
+        except sqlite3.Error:
+            _drop_connection(self.db_path)
+            raise
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                "SELECT rate, burst, tokens, refilled_at FROM api_rate_state WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            if row is None:
+                state = {"rate": self.rate, "burst": self.burst, "tokens": float(self.burst)}
+            else:
+                rate, burst, tokens, refilled_at = row
+                elapsed = max(0.0, now - refilled_at) if refilled_at else 0.0
+                if not refilled_at:  # save_rate로만 생성된 행 → 가득 찬 상태로 시작
+                    tokens = float(burst)
+                state = {"rate": rate, "burst": burst, "tokens": min(burst, tokens + elapsed * rate)}
+            if not self._clamped:
+                # 지난 실행의 학습값이 낮춘 설정을 덮어쓰지 않도록
+                state["rate"] = min(state["rate"], self.max_rate)
+            result = fn(state)
+            conn.execute("""
+                INSERT INTO api_rate_state (name, rate, burst, tokens, refilled_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    rate = excluded.rate, burst = excluded.burst, tokens = excluded.tokens,
+                    refilled_at = excluded.refilled_at, updated_at = excluded.updated_at
+            """, (self.name, state["rate"], state["burst"], state["tokens"], now,
+                  datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+            conn.execute("COMMIT")
+            self._clamped = True
+            self.rate = float(state["rate"])
+            self.burst = int(state["burst"])
+            return result
+        except Exception as e:
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            if isinstance(e, sqlite3.Error):
+                _drop_connection(self.db_path)  # 다음 호출에서 새로 연결
+            raise
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        def _take(state):
+            state["tokens"] -= tokens
+            return 0.0 if state["tokens"] >= 0 else -state["tokens"] / state["rate"]
+        try:
+            return self._update(_take)
+        except sqlite3.Error as e:
+            # 상태 DB 접근 불가 시 현재 rate 간격만큼만 대기 (중단 없이 진행)
+            logger.warning("공유 rate 상태 접근 실패 (%s): %s", self.name, e)
+            return 1.0 / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        def _try(state):
+            if state["tokens"] < tokens:
+                return False
+            state["tokens"] -= tokens
+            return True
+        try:
+            return self._update(_try)
+        except sqlite3.Error as e:
+            logger.warning("공유 rate 상태 접근 실패 (%s): %s", self.name, e)
+            return False
+
+    def pause(self, seconds: float):
+        if seconds <= 0:
+            return
+        def _pause(state):
+            state["tokens"] = min(state["tokens"], -seconds * state["rate"])
+        try:
+            self._update(_pause)
+        except sqlite3.Error as e:
+            logger.warning("공유 rate 상태 접근 실패 (%s): %s", self.name, e)
+
+    def set_rate(self, rate: float, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        def _set(state):
+            state["rate"] = float(rate)
+            if burst is not None:
+                state["burst"] = max(1, int(burst))
+                state["tokens"] = min(state["tokens"], state["burst"])
+        try:
+            self._update(_set)
+        except sqlite3.Error as e:
+            logger.warning("공유 rate 상태 접근 실패 (%s): %s", self.name, e)
+            self.rate = float(rate)
+
+    def adjust_rate(self, fn) -> float:
+        """공유 rate에 fn 적용 (다른 프로세스의 감속을 덮어쓰지 않도록 읽기·쓰기를 한 트랜잭션에서)"""
+        if float(fn(self.rate)) == self.rate:
+            # 이미 상한(또는 하한)이라 바뀔 게 없음 → 호출마다 쓰기 트랜잭션을 열지 않음
+            return self.rate
+
+        def _adjust(state):
+            state["rate"] = float(fn(state["rate"]))
+            return state["rate"]
+        try:
+            return self._update(_adjust)
+        except sqlite3.Error as e:
+            logger.warning("공유 rate 상태 접근 실패 (%s): %s", self.name, e)
+            return self.rate
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After 헤더(초 또는 HTTP-date) → 대기 초. 없거나 해석 불가면 None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+        return max(0.0, dt.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_local = threading.local()  # 스레드별 {DB 경로: 연결} (sqlite3 연결은 스레드 간 공유 불가)
+_schema_ready: set[str] = set()
+_schema_lock = threading.Lock()
+
+
+def _state_connection(db_path: Path) -> sqlite3.Connection:
+    """스레드별로 재사용하는 상태 DB 연결 (테이블 생성은 프로세스당 DB 경로마다 한 번)"""
+    key = str(db_path)
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(key)
+    if conn is not None:
+        return conn
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    # isolation_level=None: BEGIN IMMEDIATE로 프로세스 간 잠금을 직접 제어
+    conn = sqlite3.connect(key, timeout=30, isolation_level=None)
+    with _schema_lock:
+        if key not in _schema_ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_rate_state (
+                    name TEXT PRIMARY KEY,
+                    rate REAL NOT NULL,
+                    burst INTEGER NOT NULL DEFAULT 1,
+                    tokens REAL NOT NULL DEFAULT 0,
+                    refilled_at REAL NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            _schema_ready.add(key)
+    conns[key] = conn
+    return conn
+
+
+def _drop_connection(db_path: Path) -> None:
+    """오류 난 연결 버리기 (파일이 지워졌을 수 있으므로 테이블도 다시 확인)"""
+    key = str(db_path)
+    conn = getattr(_local, "conns", {}).pop(key, None)
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    with _schema_lock:
+        _schema_ready.discard(key)
+
+
+def load_rate(name: str, db_path: Path = RATE_DB_PATH) -> float | None:
+    """저장된 학습 rate 조회. 없으면 None."""
+    try:
+        row = _state_connection(db_path).execute("SELECT rate FROM api_rate_state WHERE name = ?", (name,)).fetchone()
+        return float(row[0]) if row else None
+    except sqlite3.Error as e:
+        _drop_connection(db_path)
+        logger.warning("rate 상태 조회 실패 (%s): %s", name, e)
+        return None
+
+
+def save_rate(name: str, rate: float, db_path: Path = RATE_DB_PATH):
+    """학습 rate 저장 (다음 실행 시작값)"""
+    updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        # 버킷 상태(tokens 등)는 유지하고 rate만 갱신
+        _state_connection(db_path).execute("""
+            INSERT INTO api_rate_state (name, rate, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET rate = excluded.rate, updated_at = excluded.updated_at
+        """, (name, rate, updated_at))
+    except sqlite3.Error as e:
+        _drop_connection(db_path)
+        logger.warning("rate 상태 저장 실패 (%s): %s", name, e)
+
+
+class AimdController:
+    """
+    AIMD(가산 증가·곱셈 감소) 속도 제어기.
+    - on_success: rate += increase (max_rate 상한)
+    - on_throttle: rate *= decrease (min_rate 하한) + Retry-After 동안 버킷 정지
+    동시에 여러 스레드가 제한 응답을 받아도 한 번만 감소하도록 짧은 유예 구간을 둠.
+    SharedTokenBucket은 rate를 자체 행에 저장하므로 state_db=None으로 사용.
+    """
+
+    SAVE_EVERY = 20  # 성공 N회마다 현재 rate 저장
+
+    def __init__(
+        self,
+        name: str,
+        bucket: "TokenBucket | SharedTokenBucket",
+        min_rate: float,
+        max_rate: float,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        state_db: Path | None = RATE_DB_PATH,
+    ):
+        self.name = name
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.state_db = state_db
+        self._lock = threading.Lock()
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._loaded = state_db is None
+
+    def _load_saved(self):
+        """첫 호출 시 저장된 rate로 시작 (import 시점에 DB를 건드리지 않도록 지연 로드)"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            saved = load_rate(self.name, self.state_db)
+            if saved:
+                self.bucket.set_rate(self._clamp(saved))
+                logger.info("%s: 저장된 호출 속도 %.2f/s에서 시작", self.name, self.bucket.rate)
+
+    def _clamp(self, rate: float) -> float:
+        return max(self.min_rate, min(self.max_rate, rate))
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def reserve(self) -> float:
+        """토큰 예약 후 기다려야 할 초 반환 (대기는 호출부가 처리 - asyncio.sleep 등)"""
+        if not self._loaded:
+            self._load_saved()
+        return self.bucket.reserve()
+
+    def acquire(self) -> float:
+        if not self._loaded:
+            self._load_saved()
+        return self.bucket.acquire()
+
+    def try_acquire(self) -> bool:
+        """남은 토큰이 있을 때만 즉시 확보 (헤지 요청용, 대기하지 않음)"""
+        if not self._loaded:
+            self._load_saved()
+        return self.bucket.try_acquire()
+
+    def on_success(self):
+        with self._lock:
+            new_rate = self.bucket.adjust_rate(lambda r: self._clamp(r + self.increase))
+            self._successes += 1
+            save = self.state_db is not None and self._successes % self.SAVE_EVERY == 0
+        if save:
+            save_rate(self.name, new_rate, self.state_db)
+
+    def on_throttle(self, retry_after: float | None = None):
+        with self._lock:
+            now = time.monotonic()
+            # 직전 감소 후 (한 호출 간격) 안에 온 제한 응답은 같은 혼잡으로 보고 한 번만 감소
+            if now - self._last_decrease >= max(1.0, 1.0 / self.bucket.rate):
+                self.bucket.adjust_rate(lambda r: self._clamp(r * self.decrease))
+                self._last_decrease = now
+                logger.warning("%s: 호출 제한 감지 → 속도 %.2f/s로 감소", self.name, self.bucket.rate)
+            new_rate = self.bucket.rate
+        if retry_after:
+            self.bucket.pause(retry_after)
+        if self.state_db is not None:
+            save_rate(self.name, new_rate, self.state_db)
@@ -0,0 +1,82 @@
+"""
+retry_queue.py - 나중에 다시 처리할 키워드 목록 (SQLite deferred_keywords 테이블)
+차단 회로가 열려 건너뛴 키워드를 단계(stage)별로 기록 → 실행 끝의 재시도 패스·다음 실행에서 먼저 처리.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from core.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS deferred_keywords (
+            stage TEXT NOT NULL,
+            keyword TEXT NOT NULL,
+            reason TEXT,
+            attempts INTEGER NOT NULL DEFAULT 1,
+            deferred_at TEXT NOT NULL,
+            PRIMARY KEY (stage, keyword)
+        )
+    """)
+    return conn
+
+
+def defer(stage: str, keywords: list[str], reason: str = "", db_path: Path = DB_PATH) -> None:
+    """키워드를 재시도 목록에 추가 (이미 있으면 시도 횟수 증가)"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [(stage, kw.strip(), reason, now) for kw in keywords if kw and kw.strip()]
+    if not rows:
+        return
+    try:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO deferred_keywords (stage, keyword, reason, deferred_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(stage, keyword) DO UPDATE SET
+                        reason = excluded.reason, attempts = attempts + 1, deferred_at = excluded.deferred_at
+                """, rows)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("재시도 목록 저장 실패 (%s): %s", stage, e)
+
+
+def pending(stage: str, db_path: Path = DB_PATH) -> list[str]:
+    """단계의 재시도 대기 키워드 (먼저 미뤄진 순)"""
+    try:
+        conn = _connect(db_path)
+        try:
+            rows = conn.execute(
+                "SELECT keyword FROM deferred_keywords WHERE stage = ? ORDER BY deferred_at, keyword",
+                (stage,),
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("재시도 목록 조회 실패 (%s): %s", stage, e)
+        return []
+    return [r[0] for r in rows]
+
+
+def resolve(stage: str, keywords: list[str], db_path: Path = DB_PATH) -> None:
+    """처리 완료된 키워드를 재시도 목록에서 제거"""
+    kws = [(stage, kw.strip()) for kw in keywords if kw and kw.strip()]
+    if not kws:
+        return
+    try:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                conn.executemany("DELETE FROM deferred_keywords WHERE stage = ? AND keyword = ?", kws)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("재시도 목록 정리 실패 (%s): %s", stage, e)
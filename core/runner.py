@@ -1,17 +1,21 @@
 """
 실행 매니저 - 전체 프로세스 총괄
-trending_keywords.csv → 네이버 검색량 조회 → DB 적재 → 분석 모듈 순차 실행 → 결과 업데이트
+trending_keywords.csv → 네이버 검색량·쿠팡 분석 (각자 워커 풀에서 동시 진행) → 키워드별 결과 합쳐 DB 일괄 저장
 """
 
 import csv
 import logging
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from core.database import init_db, insert_product, insert_market_data
+from core.database import init_db, latest_analysis, save_batch
+from core import checkpoint, circuit_breaker, deadline, quota, retry_queue, singleflight
+from core.product_store import empty_stats, keyword_stats
 from core.validator import calc_reliability_score
 
 logger = logging.getLogger(__name__)
@@ -19,6 +23,23 @@ logger = logging.getLogger(__name__)
 TRENDING_CSV = Path(__file__).resolve().parent.parent / "trending_keywords.csv"
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+COUPANG_SEARCH_LIMIT = 20
+RETRY_STAGE = "run_workflow"  # retry_queue 단계 이름
+NAVER_WORKERS = 2  # 검색량 묶음 조회 동시 실행 수 (실제 호출 속도는 naver_api 키별 버킷이 제한)
+COUPANG_WORKERS = 3  # 쿠팡 분석 동시 실행 수 (coupang_api 키별 버킷이 제한)
+WRITE_BATCH_SIZE = 25  # 키워드 결과를 모아 한 트랜잭션으로 저장하는 단위
+
+
+def _load_refresh_hours() -> float:
+    """config.py의 COUPANG_REFRESH_HOURS (증분 갱신: 이 시간 안에 분석한 키워드는 쿠팡을 다시 조회하지 않음, 기본 72시간)"""
+    try:
+        from config import COUPANG_REFRESH_HOURS
+        return float(COUPANG_REFRESH_HOURS)
+    except (ImportError, TypeError, ValueError):
+        return 72.0
+
+
+COUPANG_REFRESH_HOURS = _load_refresh_hours()
 
 
 def _retry(fn, max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY):
@@ -54,36 +75,21 @@ def load_trending_keywords() -> list[dict]:
 
 
 def run_coupang_analyzer(keyword: str) -> dict:
-    """쿠팡 API 분석 (로켓수, 평균가). limit 20, 로켓 판별 강화."""
+    """쿠팡 API 분석 (로켓수, 평균가). limit COUPANG_SEARCH_LIMIT 검색 → 상품 스냅샷 저장 → 최근 수집 1회 집계."""
     def _do():
         from coupang_config import COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY
         import coupang_api
-        js = coupang_api.search_products(keyword, 20, COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY)
+        js = coupang_api.search_products(keyword, COUPANG_SEARCH_LIMIT, COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY)
         if not js:
             return {}
-        data = js.get("data", js)
-        products = []
-        if isinstance(data, dict):
-            products = data.get("productData") or data.get("products") or data.get("productList") or data.get("items") or data.get("results") or []
-        if not isinstance(products, list):
-            products = []
-        if not products:
+        if not coupang_api.extract_products(js):
             return {"rocket_count": 0, "avg_price": 0}
-        prices = []
-        rocket = 0
-        for p in products:
-            if not isinstance(p, dict):
-                continue
-            if p.get("isRocket") or p.get("rocket") or p.get("isRocketDelivery") or "로켓" in str(p.get("productName", "")):
-                rocket += 1
-            pr = p.get("productPrice") or p.get("price") or p.get("salePrice") or p.get("product_price")
-            if pr is not None:
-                try:
-                    prices.append(int(pr))
-                except (ValueError, TypeError):
-                    pass
-        avg = round(sum(prices) / len(prices), 0) if prices else 0
-        return {"rocket_count": rocket, "avg_price": int(avg), "total_products": len(products)}
+        stats = keyword_stats([keyword]).get(keyword.strip()) or empty_stats()
+        return {
+            "rocket_count": stats["rocket_count"],
+            "avg_price": int(stats["avg_price"]),
+            "total_products": stats["total_products"],
+        }
 
     try:
         return _retry(_do) or {}
@@ -119,81 +125,387 @@ def _get_naver_searchad_config() -> dict | None:
         return None
 
 
-def run_workflow(limit: int = 50):
-    """trending_keywords.csv → 네이버 검색량 조회 → DB → 분석 → market_data 저장"""
+def plan_budget(
+    keywords: list[str], naver_cfg: dict | None, coupang_candidates: list[str] | None = None
+) -> tuple[list[str], set[str]]:
+    """
+    실행 전 호출 예산 계획: 단계별 필요 호출 수(캐시 적중 제외)를 추정해 오늘 남은 API 한도를 배분.
+    coupang_candidates: 쿠팡 분석이 필요한 키워드 (증분 갱신, 기본 전체)
+    (검색량 조회 키워드, 쿠팡 분석 키워드 집합) 반환 → 한도가 모자라면 순위가 낮은 키워드부터 제외.
+    """
+    import coupang_api
+    coupang_keywords = keywords if coupang_candidates is None else coupang_candidates
+    stages = [
+        quota.Stage(
+            "쿠팡 분석", "coupang", coupang_keywords,
+            coupang_api.pending_keywords(coupang_keywords, COUPANG_SEARCH_LIMIT), priority=1,
+        ),
+    ]
+    if naver_cfg:
+        import naver_api
+        stages.insert(0, quota.Stage(
+            "검색량", "naver_searchad", keywords,
+            naver_api.pending_keywords(keywords), per_call=naver_api.MAX_HINT_KEYWORDS, priority=0,
+        ))
+    remaining = quota.remaining_by_api([s.api for s in stages])
+    quota.plan(stages, remaining)
+    logger.info("호출 예산 계획\n%s", quota.format_plan(stages, remaining))
+    volume_keywords = stages[0].allowed if naver_cfg else []
+    return volume_keywords, set(stages[-1].allowed)
+
+
+def run_workflow(limit: int = 50, deadline_sec: float | None = None, resume: bool = False, incremental: bool = False):
+    """
+    trending_keywords.csv → 네이버 검색량 조회 → DB → 분석 → market_data 저장
+    deadline_sec: 실행 마감 (기본 config RUN_DEADLINE_MINUTES). 모든 API 호출의 timeout·재시도 대기가
+    남은 시간 안으로 줄고, 마감이 지나면 남은 키워드는 건너뜀.
+    resume: 지난 미완료 실행(중단·마감 초과)에서 DB 저장까지 끝난 키워드는 건너뜀
+    incremental: 새 키워드와 마지막 쿠팡 분석이 COUPANG_REFRESH_HOURS보다 오래된 키워드만 쿠팡 조회,
+    나머지는 DB의 마지막 분석값 유지 (검색량은 검색량 캐시 TTL 기준으로 만료된 것만 API 호출)
+    """
+    with deadline.run_deadline(deadline_sec):
+        _run_workflow(limit, resume, incremental)
+    for line in (deadline.report(), circuit_breaker.report()):
+        if line:
+            logger.info(line)
+
+
+def _with_deferred(rows: list[dict]) -> list[dict]:
+    """지난 실행에서 차단 회로 때문에 미룬 키워드를 앞으로 (CSV에 없는 키워드는 키워드만으로 행 구성)"""
+    deferred = retry_queue.pending(RETRY_STAGE)
+    if not deferred:
+        return rows
+    by_kw = {row["keyword"]: row for row in rows}
+    front = [by_kw.get(kw) or {"keyword": kw, "category": "", "rank": None, "change_trend": ""} for kw in deferred]
+    logger.info("지난 실행에서 미룬 키워드 %d개 먼저 처리", len(front))
+    seen = set(deferred)
+    return front + [row for row in rows if row["keyword"] not in seen]
+
+
+def split_by_staleness(
+    keywords: list[str], refresh_hours: float = COUPANG_REFRESH_HOURS, always: set[str] | None = None
+) -> tuple[list[str], dict[str, dict]]:
+    """
+    (다시 분석할 키워드, {DB 값을 유지할 키워드: 마지막 분석}) 분리.
+    다시 분석: 분석 기록이 없는 새 키워드, 마지막 market_data가 refresh_hours보다 오래된 키워드, always(미룬 키워드 등)
+    """
+    always = always or set()
+    cutoff = (datetime.now() - timedelta(hours=refresh_hours)).strftime("%Y-%m-%d %H:%M:%S")
+    previous = latest_analysis(keywords)
+    carried = {
+        kw: prev for kw, prev in previous.items()
+        if kw not in always and (prev.get("analyzed_at") or "") >= cutoff
+    }
+    stale = [kw for kw in keywords if kw not in carried]
+    return stale, carried
+
+
+def _fetch_volumes(keywords: list[str], naver_cfg: dict | None) -> tuple[dict[str, float | None], set[str]]:
+    """
+    네이버 검색광고 API로 월간 검색량 조회 (5개씩 묶음, 호출 속도는 naver_api가 제어).
+    (검색량, 차단 회로가 열려 못 받은 키워드) 반환
+    """
+    if not naver_cfg or not keywords:
+        return {}, set()
+    import naver_api
+    volumes = naver_api.get_monthly_search_volumes(
+        keywords,
+        naver_cfg["customer_id"],
+        naver_cfg["license_key"],
+        naver_cfg["secret_key"],
+    )
+    missed = {kw for kw, vol in volumes.items() if vol is None} if naver_api.circuit_open() else set()
+    return volumes, missed
+
+
+def _analyze(kw: str, coupang_keywords: set[str]) -> tuple[str, dict]:
+    """
+    쿠팡 분석 1건 → (상태, 결과). 상태: "done" / "skipped"(오늘 한도 밖) / "failed"(API·파싱 오류) /
+    "deferred"(차단 회로 열림 → 나중에 재시도) / "expired"(실행 마감 초과)
+    """
+    import coupang_api
+    # 오늘 한도 밖 키워드는 건너뜀, 차단 회로가 열려 있으면 호출 없이 재시도 목록으로
+    if kw not in coupang_keywords:
+        return "skipped", {}
+    if deadline.expired():
+        return "expired", {}
+    if coupang_api.circuit_open():
+        return "deferred", {}
+    coupang = run_coupang_analyzer(kw)
+    if not coupang:
+        return ("deferred" if coupang_api.circuit_open() else "failed"), {}
+    return "done", coupang
+
+
+def _build_records(row: dict, naver_search_vol: float | None, coupang: dict) -> tuple[dict, dict | None]:
+    """키워드 1개의 검색량·쿠팡 결과 → (Products 행, market_data 행 또는 None)"""
+    naver_rank = int(row["rank"]) if row.get("rank") else None
+    product = {
+        "keyword": row["keyword"],
+        "category": row.get("category", ""),
+        "naver_rank": naver_rank,
+        "naver_search_vol": naver_search_vol,
+    }
+    if not coupang:
+        return product, None
+
+    trend_up = (row.get("change_trend") or "").strip() not in ("", "-", "0")
+    reliability = calc_reliability_score(
+        naver_rank=naver_rank,
+        naver_search_vol=naver_search_vol,
+        coupang_rocket_count=coupang.get("rocket_count"),
+        naver_trend_up=bool(trend_up),
+    )
+    product.update(
+        coupang_avg_price=coupang.get("avg_price"),
+        rocket_count=coupang.get("rocket_count"),
+        opportunity_score=calc_opportunity_score(coupang.get("rocket_count", 0)),
+    )
+    # market_data 테이블에 시계열 적재 (키워드, 검색량, 로켓수, 마진율, 신뢰도점수, 수집일)
+    market = {
+        "keyword": row["keyword"],
+        "search_vol": naver_search_vol,
+        "rocket_count": coupang.get("rocket_count"),
+        "margin_rate": None,  # 도매가 확보 시 추후 계산
+        "credibility_score": reliability,
+    }
+    return product, market
+
+
+def _flush(
+    batch: list[tuple[dict, dict | None]],
+    finished: list[str],
+    journal: checkpoint.Journal | None,
+    unanalyzed: list[str] | None = None,
+) -> None:
+    """
+    모은 결과를 한 트랜잭션으로 저장 → 저장된 완료 키워드만 진행 기록에 DONE.
+    unanalyzed: 쿠팡 분석 없이 저장한 키워드 (분석 실패·한도 밖) → FAILED로 남겨 이어받을 때 다시 시도
+    """
+    if batch:
+        try:
+            save_batch([p for p, _ in batch], [m for _, m in batch if m])
+        except Exception as e:
+            logger.exception("DB 일괄 저장 실패 (%d건): %s", len(batch), e)
+            finished = []
+    if journal is not None:
+        for kw in finished:
+            journal.record(kw, checkpoint.DONE)
+        for kw in unanalyzed or []:
+            journal.record(kw, checkpoint.FAILED)
+    batch.clear()
+
+
+def _process_rows(
+    rows: list[dict],
+    naver_cfg: dict | None,
+    volume_keywords: list[str],
+    coupang_keywords: set[str],
+    volumes: dict[str, float | None] | None = None,
+    journal: checkpoint.Journal | None = None,
+    carried: dict[str, dict] | None = None,
+    analyzed: dict[str, tuple[str, dict]] | None = None,
+) -> tuple[list[str], list[dict], dict[str, float | None], set[str], dict[str, tuple[str, dict]]]:
+    """
+    네이버 검색량(묶음)과 쿠팡 분석을 각자의 워커 풀에서 동시에 진행 (호출 속도는 API별 버킷이 제한).
+    키워드별로 두 결과가 모이면 WRITE_BATCH_SIZE개씩 한 트랜잭션으로 저장.
+    volumes: 이미 받은 검색량 (재시도 패스), journal: 저장된 완료 키워드 기록,
+    carried: 쿠팡 분석 없이 마지막 분석값을 유지할 키워드 (증분 갱신),
+    analyzed: 이미 끝난 쿠팡 결과 (재시도 패스: 다시 호출하지 않고, market_data도 다시 쌓지 않음).
+    (처리 완료 키워드, 차단 회로 때문에 미룬 행, 검색량, 검색량 못 받은 키워드, 키워드별 쿠팡 결과) 반환
+    """
+    import naver_api
+    by_kw = {row["keyword"]: row for row in rows}
+    carried = carried or {}
+    analyzed = analyzed or {}
+    volumes = dict(volumes or {})
+    volume_missed: set[str] = set()
+    want_volume = [kw for kw in dict.fromkeys(volume_keywords) if kw in by_kw] if naver_cfg else []
+    # 키워드별 남은 결과 수 (쿠팡 1 + 검색량 묶음 1)
+    waiting = {kw: 0 if kw in analyzed else 1 for kw in by_kw}
+    for kw in want_volume:
+        waiting[kw] += 1
+
+    coupang_results: dict[str, tuple[str, dict]] = {kw: analyzed[kw] for kw in by_kw if kw in analyzed}
+    done: list[str] = []
+    deferred: list[dict] = []
+    batch: list[tuple[dict, dict | None]] = []
+    finished: list[str] = []  # 이번 묶음의 완료 키워드 (저장 후 진행 기록)
+    unanalyzed: list[str] = []  # 이번 묶음의 쿠팡 분석 없는 키워드 (이어받을 때 다시 시도)
+    failed = 0
+    expired = 0
+
+    def complete(kw: str) -> None:
+        """두 결과가 모인 키워드 1개 → 저장 묶음에 추가"""
+        nonlocal expired, failed, finished, unanalyzed
+        status, coupang = coupang_results[kw]
+        if status == "expired":
+            expired += 1
+            return
+        row = by_kw[kw]
+        prev = carried.get(kw) if status == "skipped" else None
+        if prev:
+            # 증분 갱신: 쿠팡 값은 마지막 분석 그대로, 순위·검색량만 갱신 (market_data는 새로 쌓지 않음)
+            vol = volumes.get(kw) if volumes.get(kw) is not None else prev.get("naver_search_vol")
+            product, _ = _build_records(row, vol, {})
+            product.update(
+                coupang_avg_price=prev.get("coupang_avg_price"),
+                rocket_count=prev.get("rocket_count"),
+                opportunity_score=prev.get("opportunity_score"),
+            )
+            coupang = {"rocket_count": prev.get("rocket_count"), "avg_price": prev.get("coupang_avg_price")}
+            batch.append((product, None))
+        else:
+            product, market = _build_records(row, volumes.get(kw), coupang)
+            # 앞 패스에서 이미 market_data를 쌓은 쿠팡 결과 → Products만 갱신
+            batch.append((product, None if kw in analyzed else market))
+        if status == "deferred" or kw in volume_missed:
+            deferred.append(row)
+        elif status == "failed":
+            # 일시적 API·파싱 오류: 완료로 치지 않음 (재시도 목록에서도 빼지 않음)
+            failed += 1
+            unanalyzed.append(kw)
+        else:
+            done.append(kw)
+            # 한도 밖으로 건너뛴 키워드는 분석 전이므로 완료 기록 대신 다시 시도 대상으로
+            (finished if status == "done" or prev else unanalyzed).append(kw)
+        logger.info(
+            "[%d/%d] %s | 검색량=%s, 로켓=%s, 가격=%s",
+            len(done) + len(deferred) + failed, len(by_kw), kw,
+            volumes.get(kw) if volumes.get(kw) is not None else "-",
+            coupang.get("rocket_count", "-"), coupang.get("avg_price", "-"),
+        )
+        if len(batch) >= WRITE_BATCH_SIZE:
+            _flush(batch, finished, journal, unanalyzed)
+            finished, unanalyzed = [], []
+
+    for kw in by_kw:
+        if not waiting[kw]:
+            complete(kw)
+    step = naver_api.MAX_HINT_KEYWORDS
+    with ThreadPoolExecutor(max_workers=NAVER_WORKERS, thread_name_prefix="naver") as naver_pool, \
+            ThreadPoolExecutor(max_workers=COUPANG_WORKERS, thread_name_prefix="coupang") as coupang_pool:
+        futures = {}
+        for k in range(0, len(want_volume), step):
+            chunk = want_volume[k : k + step]
+            futures[naver_pool.submit(deadline.propagate(_fetch_volumes), chunk, naver_cfg)] = ("volume", chunk)
+        for kw in by_kw:
+            if kw not in analyzed:
+                futures[coupang_pool.submit(deadline.propagate(_analyze), kw, coupang_keywords)] = ("coupang", [kw])
+
+        for future in as_completed(futures):
+            kind, kws = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.exception("%s 조회 오류 %s: %s", "검색량" if kind == "volume" else "쿠팡 분석", kws, e)
+                result = None
+            if kind == "volume":
+                got, missed = result or ({}, set())
+                volumes.update(got)
+                volume_missed |= missed
+            else:
+                coupang_results[kws[0]] = result or ("failed", {})
+
+            for kw in kws:
+                waiting[kw] -= 1
+                if not waiting[kw]:
+                    complete(kw)
+    _flush(batch, finished, journal, unanalyzed)
+    if failed:
+        logger.warning("쿠팡 분석 실패 %d개 → --resume으로 다시 시도", failed)
+    if want_volume:
+        logger.info(naver_api.cache_report())
+    if expired:
+        logger.warning("실행 마감 시각 초과 → 남은 키워드 %d개 건너뜀", expired)
+    return done, deferred, volumes, volume_missed, coupang_results
+
+
+def _retry_deferred(
+    deferred: list[dict],
+    naver_cfg: dict | None,
+    coupang_keywords: set[str],
+    volumes: dict[str, float | None],
+    volume_missed: set[str],
+    analyzed: dict[str, tuple[str, dict]],
+    journal: checkpoint.Journal | None,
+    carried: dict[str, dict],
+) -> tuple[list[dict], list[str]]:
+    """
+    미룬 행 재시도: 검색량만 못 받은 행은 쿠팡 결과를 그대로 두고 검색량만, 쿠팡만 미룬 행은 받은 검색량으로 쿠팡만.
+    빠진 쪽의 차단 회로가 아직 열려 있는 행은 다음 실행으로. (여전히 미룬 행, 처리 완료 키워드) 반환
+    """
+    import coupang_api
+    import naver_api
+    naver_ok = not naver_api.circuit_open()
+    coupang_ok = not coupang_api.circuit_open()
+    retry, waiting = [], []
+    for row in deferred:
+        kw = row["keyword"]
+        need_volume = kw in volume_missed
+        need_coupang = analyzed.get(kw, ("deferred", {}))[0] == "deferred"
+        if (naver_ok or not need_volume) and (coupang_ok or not need_coupang):
+            retry.append(row)
+        else:
+            waiting.append(row)
+    if not retry:
+        return deferred, []
+
+    logger.info("차단 회로로 미룬 키워드 %d개 재시도 (%d개는 회로가 아직 열려 있어 다음 실행으로)", len(retry), len(waiting))
+    retry_kws = {row["keyword"] for row in retry}
+    retried, still, _, _, _ = _process_rows(
+        retry, naver_cfg, [row["keyword"] for row in retry if row["keyword"] in volume_missed], coupang_keywords,
+        {kw: vol for kw, vol in volumes.items() if vol is not None}, journal, carried,
+        analyzed={kw: res for kw, res in analyzed.items() if kw in retry_kws and res[0] != "deferred"},
+    )
+    return waiting + still, retried
+
+
+def _run_workflow(limit: int, resume: bool = False, incremental: bool = False):
     init_db()
     rows = load_trending_keywords()
     if not rows:
         return
 
     naver_cfg = _get_naver_searchad_config()
-    rows = rows[:limit]
+    rows = _with_deferred(rows)[:limit]
+    journal = checkpoint.Journal(RETRY_STAGE, resume=resume)
+    if journal.resumed:
+        rows = [row for row in rows if not journal.is_done(row["keyword"])]
     logger.info("trending_keywords.csv %d건 DB 적재 및 분석 시작 (네이버 검색광고 API: %s)", len(rows), "사용" if naver_cfg else "미사용")
 
-    for i, row in enumerate(rows):
-        kw = row["keyword"]
-        try:
-            # 1) 네이버 검색광고 API로 월간 검색량 조회
-            naver_search_vol = None
-            if naver_cfg:
-                import naver_api
-                naver_search_vol = naver_api.get_monthly_search_volume(
-                    kw,
-                    naver_cfg["customer_id"],
-                    naver_cfg["license_key"],
-                    naver_cfg["secret_key"],
-                )
-                if naver_search_vol is not None:
-                    time.sleep(0.5)  # 검색광고 API 호출 간격
-
-            insert_product(
-                keyword=kw,
-                category=row.get("category", ""),
-                naver_rank=int(row["rank"]) if row.get("rank") else None,
-                naver_search_vol=naver_search_vol,
-            )
-
-            # 2) 쿠팡 분석
-            coupang = run_coupang_analyzer(kw)
-            if not coupang:
-                continue
-
-            trend_up = (row.get("change_trend") or "").strip() not in ("", "-", "0")
-            reliability = calc_reliability_score(
-                naver_rank=int(row["rank"]) if row.get("rank") else None,
-                naver_search_vol=naver_search_vol,
-                coupang_rocket_count=coupang.get("rocket_count"),
-                naver_trend_up=bool(trend_up),
-            )
-            opp_score = calc_opportunity_score(coupang.get("rocket_count", 0))
-
-            insert_product(
-                keyword=kw,
-                category=row.get("category", ""),
-                naver_rank=int(row["rank"]) if row.get("rank") else None,
-                naver_search_vol=naver_search_vol,
-                coupang_avg_price=coupang.get("avg_price"),
-                rocket_count=coupang.get("rocket_count"),
-                opportunity_score=opp_score,
-            )
+    keywords = [row["keyword"] for row in rows]
+    carried: dict[str, dict] = {}
+    coupang_candidates = None
+    if incremental:
+        coupang_candidates, carried = split_by_staleness(keywords, always=set(retry_queue.pending(RETRY_STAGE)))
+        logger.info(
+            "증분 갱신: %d개 중 %d개 다시 분석 (새 키워드·%g시간 지난 분석), %d개는 DB 값 유지",
+            len(keywords), len(coupang_candidates), COUPANG_REFRESH_HOURS, len(carried),
+        )
 
-            # 3) market_data 테이블에 시계열 적재 (키워드, 검색량, 로켓수, 마진율, 신뢰도점수, 수집일)
-            insert_market_data(
-                keyword=kw,
-                search_vol=naver_search_vol,
-                rocket_count=coupang.get("rocket_count"),
-                margin_rate=None,  # 도매가 확보 시 추후 계산
-                credibility_score=reliability,
-            )
+    volume_keywords, coupang_keywords = plan_budget(keywords, naver_cfg, coupang_candidates)
+    done, deferred, volumes, volume_missed, analyzed = _process_rows(
+        rows, naver_cfg, volume_keywords, coupang_keywords, journal=journal, carried=carried,
+    )
 
-            logger.info(
-                "[%d/%d] %s | 검색량=%s, 로켓=%s, 가격=%s, 신뢰도=%.1f",
-                i + 1, len(rows), kw,
-                naver_search_vol if naver_search_vol is not None else "-",
-                coupang.get("rocket_count"), coupang.get("avg_price"), reliability,
-            )
-            time.sleep(2)  # API 제한 회피
-        except Exception as e:
-            logger.exception("키워드 %s 처리 오류: %s", kw, e)
+    # 차단 회로 때문에 건너뛴 키워드: 원인이 된 회로의 대기 시간이 끝났으면 실행 끝에 빠진 쪽만 한 번 더,
+    # 아니면 다음 실행으로
+    if deferred and not deadline.expired():
+        deferred, retried = _retry_deferred(deferred, naver_cfg, coupang_keywords, volumes, volume_missed, analyzed, journal, carried)
+        done += retried
+    retry_queue.resolve(RETRY_STAGE, done)
+    if deferred:
+        retry_queue.defer(RETRY_STAGE, [row["keyword"] for row in deferred], "차단 회로")
+        logger.warning("차단 회로로 처리 못 한 키워드 %d개 → 다음 실행에서 먼저 재시도", len(deferred))
+    if deadline.expired():
+        logger.warning("실행 마감으로 중단 → --resume으로 이어서 실행 가능")
+    elif journal.failed():
+        logger.warning("쿠팡 분석 없이 저장한 키워드 %d개 → --resume으로 그 키워드만 다시 실행 가능", len(journal.failed()))
+    else:
+        journal.finish()
 
     logger.info("워크플로우 완료. DB: coupang_gross.db (Products + market_data)")
+    merged = singleflight.report()
+    if merged:
+        logger.info(merged)
@@ -0,0 +1,93 @@
+"""
+singleflight.py - 동시에 들어온 같은 API 조회를 1회 호출로 병합
+같은 키의 호출이 진행 중이면 뒤이은 스레드는 새로 호출하지 않고 그 결과(또는 예외)를 함께 받음.
+병렬 분석 워커·대시보드·마스터 파이프라인이 같은 키워드를 동시에 조회할 때 중복 호출 제거.
+클라이언트별 실행·병합 횟수를 집계해 report()로 절약한 호출 수 보고.
+"""
+
+import threading
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """진행 중인 호출 1건 (완료 신호 + 결과/예외)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    키별 진행 중 호출 병합기.
+    결과 객체는 대기한 호출자 모두에게 같은 인스턴스로 전달되므로 호출자는 수정하지 않아야 함.
+    완료된 호출은 보관하지 않음 (결과 재사용은 캐시의 역할).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+        _registry.append(self)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """key 호출이 진행 중이면 완료를 기다려 결과 공유, 아니면 fn() 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"name": self.name, "executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.executed = 0
+            self.shared = 0
+
+
+_registry: list[SingleFlight] = []
+
+
+def all_stats() -> list[dict]:
+    """등록된 모든 병합기 통계"""
+    return [sf.stats() for sf in _registry]
+
+
+def report() -> str:
+    """요청 병합 한 줄 요약 (병합이 있었던 클라이언트만, 없으면 빈 문자열)"""
+    parts = [
+        f"{s['name']} 실행 {s['executed']} · 병합 {s['shared']}"
+        for s in all_stats()
+        if s["shared"]
+    ]
+    if not parts:
+        return ""
+    saved = sum(s["shared"] for s in all_stats())
+    return f"동시 요청 병합: API 호출 {saved}회 절약 ({', '.join(parts)})"
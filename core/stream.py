@@ -0,0 +1,180 @@
+"""
+stream.py - 키워드 단위 스트리밍 파이프라인 (단계 사이 크기 제한 큐)
+CSV 단계처럼 앞 단계가 전부 끝나길 기다리지 않고, 키워드 하나가 처리되는 대로 다음 단계로 넘김.
+단계마다 자기 워커 수·초당 처리 한도를 가지며, 큐가 차면 앞 단계가 기다림(배압).
+전체 시간은 각 단계 시간의 합이 아니라 가장 느린 단계에 가까워짐.
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import ExitStack
+from typing import Callable, ContextManager, Iterable
+
+from core.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 20
+
+_DONE = object()  # 앞 단계 종료 신호
+
+
+class StreamStage:
+    """
+    스트리밍 단계 하나.
+    fn: 항목 → 다음 단계로 넘길 항목 (None이면 여기서 제외). opener가 있으면 fn(항목, 자원)
+    workers: 동시 처리 워커 수, rate_per_sec: 단계 전체 초당 처리 한도 (None이면 제한 없음)
+    opener: 워커 스레드마다 한 번 여는 자원 (브라우저 세션 등, with 문으로 닫힘)
+    queue_size: 이 단계 입력 큐 크기
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        workers: int = 1,
+        rate_per_sec: float | None = None,
+        opener: Callable[[], ContextManager] | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(rate_per_sec) if rate_per_sec else None
+        self.opener = opener
+        self.queue_size = queue_size
+        self.received = 0
+        self.passed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy_sec = 0.0
+        self._lock = threading.Lock()
+        self._alive = self.workers
+
+    def _count(self, field: str, busy: float = 0.0) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+            self.busy_sec += busy
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received, "passed": self.passed, "dropped": self.dropped,
+            "failed": self.failed, "busy_sec": round(self.busy_sec, 1), "workers": self.workers,
+        }
+
+
+def _worker(stage: StreamStage, inq: queue.Queue, outq: queue.Queue) -> None:
+    with ExitStack() as stack:
+        resource = None
+        broken = False
+        if stage.opener is not None:
+            try:
+                resource = stack.enter_context(stage.opener())
+            except Exception as e:
+                logger.error("[%s] 자원 준비 실패 → 이 워커의 항목은 실패 처리: %s", stage.name, e)
+                broken = True
+        while True:
+            item = inq.get()
+            if item is _DONE:
+                inq.put(_DONE)  # 같은 단계의 다른 워커도 종료하도록
+                break
+            stage._count("received")
+            if broken:
+                stage._count("failed")
+                continue
+            if stage.bucket is not None:
+                wait = stage.bucket.reserve()
+                if wait > 0:
+                    time.sleep(wait)
+            started = time.monotonic()
+            try:
+                out = stage.fn(item, resource) if stage.opener is not None else stage.fn(item)
+            except Exception as e:
+                logger.warning("[%s] 처리 실패: %s", stage.name, e)
+                stage._count("failed", time.monotonic() - started)
+                continue
+            if out is None:
+                stage._count("dropped", time.monotonic() - started)
+            else:
+                stage._count("passed", time.monotonic() - started)
+                outq.put(out)
+    with stage._lock:
+        stage._alive -= 1
+        last = stage._alive == 0
+    if last:
+        outq.put(_DONE)
+
+
+def _feed(source: Iterable, outq: queue.Queue) -> None:
+    try:
+        for item in source:
+            outq.put(item)
+    except Exception as e:
+        logger.exception("스트림 입력 오류: %s", e)
+    finally:
+        outq.put(_DONE)
+
+
+class StreamReport:
+    """실행 결과: 마지막 단계 출력, 단계별 통계, 전체·첫 결과까지 걸린 시간"""
+
+    def __init__(self, results: list, stages: list[StreamStage], wall_sec: float, first_result_sec: float | None):
+        self.results = results
+        self.stages = stages
+        self.wall_sec = wall_sec
+        self.first_result_sec = first_result_sec
+
+    def format(self) -> str:
+        lines = []
+        for s in self.stages:
+            st = s.stats()
+            lines.append(
+                f"  {s.name}: 입력 {st['received']}, 통과 {st['passed']}, 제외 {st['dropped']}, "
+                f"실패 {st['failed']}, 작업 {st['busy_sec']:.0f}초 (워커 {st['workers']})"
+            )
+        busy_total = sum(s.busy_sec for s in self.stages)
+        first = f"{self.first_result_sec:.0f}초" if self.first_result_sec is not None else "없음"
+        lines.append(f"  전체 {self.wall_sec:.0f}초 (단계 작업 합계 {busy_total:.0f}초), 첫 결과 {first}, 결과 {len(self.results)}건")
+        return "스트리밍 파이프라인\n" + "\n".join(lines)
+
+
+def run_stream(
+    source: Iterable,
+    stages: list[StreamStage],
+    on_result: Callable[[object], None] | None = None,
+) -> StreamReport:
+    """
+    source 항목을 stages 순서로 흘려보냄. 마지막 단계 출력은 도착하는 대로 on_result 호출 후 모아서 반환.
+    source는 별도 스레드에서 읽으므로 느린 수집(API 페이지 등)도 생성기로 넘기면 됨.
+    """
+    started = time.monotonic()
+    queues = [queue.Queue(maxsize=max(1, s.queue_size)) for s in stages]
+    queues.append(queue.Queue())  # 마지막 단계 출력 (결과 수집은 이 스레드에서 바로 소비)
+    threads = [threading.Thread(target=_feed, args=(source, queues[0]), name="stream-source", daemon=True)]
+    for i, stage in enumerate(stages):
+        for n in range(stage.workers):
+            threads.append(threading.Thread(
+                target=_worker, args=(stage, queues[i], queues[i + 1]), name=f"stream-{stage.name}-{n}", daemon=True,
+            ))
+    for t in threads:
+        t.start()
+
+    results = []
+    first_result_sec = None
+    while True:
+        item = queues[-1].get()
+        if item is _DONE:
+            break
+        if first_result_sec is None:
+            first_result_sec = time.monotonic() - started
+        results.append(item)
+        if on_result is not None:
+            try:
+                on_result(item)
+            except Exception as e:
+                logger.warning("스트림 결과 처리 실패: %s", e)
+    for t in threads:
+        t.join()
+    return StreamReport(results, stages, time.monotonic() - started, first_result_sec)
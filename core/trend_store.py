@@ -0,0 +1,91 @@
+"""
+trend_store.py - 네이버 데이터랩 월별 검색 트렌드 저장소 (SQLite datalab_trend 테이블)
+(키워드, 월) 단위로 ratio를 저장 → 이미 받은 달은 다시 요청하지 않음.
+저장값은 기준(앵커) 키워드 배율로 환산된 값이라 키워드끼리 비교 가능. scale 열에 기준 이름 기록
+(기준 키워드가 바뀌면 예전 값은 다른 배율이므로 조회에서 제외).
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from core.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+DATE_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS datalab_trend (
+            keyword TEXT NOT NULL,
+            month TEXT NOT NULL,
+            ratio REAL NOT NULL,
+            scale TEXT NOT NULL DEFAULT '',
+            fetched_at TEXT NOT NULL,
+            PRIMARY KEY (keyword, month)
+        )
+    """)
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(datalab_trend)")}
+    if "scale" not in cols:  # scale 열 추가 전에 만든 DB
+        conn.execute("ALTER TABLE datalab_trend ADD COLUMN scale TEXT NOT NULL DEFAULT ''")
+    return conn
+
+
+def load_series(
+    keywords: list[str], start_month: str, end_month: str, scale: str, db_path: Path = DB_PATH
+) -> dict[str, dict[str, tuple[float, datetime]]]:
+    """{키워드: {"YYYY-MM": (저장 ratio, 수집 시각)}} (start_month~end_month, 같은 scale로 저장된 달만)"""
+    result: dict[str, dict[str, tuple[float, datetime]]] = {kw: {} for kw in keywords}
+    kws = list(result)
+    if not kws:
+        return result
+    try:
+        conn = _connect(db_path)
+        try:
+            for i in range(0, len(kws), 500):  # SQLite 변수 개수 제한
+                chunk = kws[i : i + 500]
+                ph = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT keyword, month, ratio, fetched_at FROM datalab_trend "
+                    f"WHERE keyword IN ({ph}) AND month >= ? AND month <= ? AND scale = ?",
+                    (*chunk, start_month, end_month, scale),
+                ).fetchall()
+                for kw, month, ratio, fetched_at in rows:
+                    result[kw][month] = (float(ratio), datetime.strptime(fetched_at, DATE_FMT))
+        finally:
+            conn.close()
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning("트렌드 저장소 조회 실패: %s", e)
+    return result
+
+
+def save_series(series: dict[str, dict[str, float]], scale: str, db_path: Path = DB_PATH) -> int:
+    """{키워드: {"YYYY-MM": ratio}} 저장 (같은 달은 최신값으로 갱신). 저장 행 수 반환."""
+    fetched_at = datetime.now().strftime(DATE_FMT)
+    params = [
+        (kw, month, float(ratio), scale, fetched_at)
+        for kw, months in series.items()
+        for month, ratio in months.items()
+    ]
+    if not params:
+        return 0
+    try:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO datalab_trend (keyword, month, ratio, scale, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    params,
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("트렌드 저장 실패: %s", e)
+        return 0
+    return len(params)
+
@@ -2,8 +2,11 @@
 validator.py - 데이터 검증기
 - 가격 0원/검색결과 없음 필터링
 - 네이버 트렌드 vs 쿠팡 검색량 비교 → 신뢰도 0~100
+- 비율 추정치의 Wilson 신뢰구간 (표본 크기별 로켓 비율 신뢰도)
 """
 
+import math
+
 
 def filter_invalid(rows: list[dict]) -> list[dict]:
     """
@@ -63,3 +66,17 @@ def calc_reliability_score(
         score += 10
 
     return max(0.0, min(100.0, round(score, 1)))
+
+
+def wilson_interval(successes: int, n: int, z: float = 1.96) -> tuple[float, float]:
+    """
+    비율 successes/n의 Wilson 점수 신뢰구간 (기본 95%). n=0이면 (0.0, 1.0).
+    표본이 작거나 비율이 0·1에 가까워도 구간이 [0, 1]을 벗어나지 않음.
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
@@ -0,0 +1,124 @@
+"""
+volume_cache.py - 월간 검색량 2단 캐시 (메모리 LRU → SQLite keyword_volume)
+naver_api의 모든 검색량 조회가 이 캐시를 거침. TTL(기본 7일) 안의 값은 API 없이 반환.
+메모리 적중 / 디스크 적중 / 미스 횟수를 집계해 스크립트 종료 시 보고.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core import volume_store
+from core.database import DB_PATH
+from core.volume_store import normalize_keyword
+
+DEFAULT_TTL_DAYS = 7.0
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class VolumeCache:
+    """
+    키워드 월간 검색량 캐시.
+    - 메모리: 프로세스 안에서 같은 키워드 반복 조회 (대시보드·도매 검색 등 단건 조회)
+    - 디스크: keyword_volume 테이블 (다른 스크립트·다음 실행과 공유)
+    키는 정규화 키워드(공백 제거 + 대문자), 값은 PC+모바일 합산 검색량.
+    """
+
+    def __init__(
+        self,
+        ttl_days: float = DEFAULT_TTL_DAYS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        db_path: Path = DB_PATH,
+    ):
+        self.ttl = timedelta(days=ttl_days)
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._memory: OrderedDict[str, tuple[float, datetime]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def ttl_days(self) -> float:
+        return self.ttl.total_seconds() / 86400
+
+    def _remember(self, norm: str, value: float, fetched_at: datetime) -> None:
+        self._memory[norm] = (value, fetched_at)
+        self._memory.move_to_end(norm)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keywords: list[str]) -> dict[str, float]:
+        """TTL 안의 캐시 값 조회. {입력 키워드: 검색량} (미스 키워드는 제외)"""
+        now = datetime.now()
+        result: dict[str, float] = {}
+        pending: list[str] = []
+        with self._lock:
+            for kw in keywords:
+                norm = normalize_keyword(kw)
+                entry = self._memory.get(norm)
+                if entry and now - entry[1] <= self.ttl:
+                    self._memory.move_to_end(norm)
+                    result[kw] = entry[0]
+                    self.memory_hits += 1
+                else:
+                    if entry:
+                        del self._memory[norm]
+                    pending.append(kw)
+        if not pending:
+            return result
+        stored = volume_store.get_volume_entries(pending, self.ttl_days, self.db_path)
+        with self._lock:
+            for kw in pending:
+                if kw in stored:
+                    value, fetched_at = stored[kw]
+                    self._remember(normalize_keyword(kw), value, fetched_at)
+                    result[kw] = value
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+        return result
+
+    def get(self, keyword: str) -> float | None:
+        return self.get_many([keyword]).get(keyword)
+
+    def save_rows(self, rows: list[dict], hint_keywords: str = "") -> int:
+        """keywordstool 파싱 행 저장 (디스크 + 메모리)"""
+        now = datetime.now()
+        with self._lock:
+            for r in rows:
+                kw = (r.get("keyword") or "").strip()
+                if kw:
+                    total = float(int(r.get("pc_volume") or 0) + int(r.get("mobile_volume") or 0))
+                    self._remember(normalize_keyword(kw), total, now)
+        return volume_store.save_volumes(rows, hint_keywords, self.db_path)
+
+    def put(self, keyword: str, value: float) -> None:
+        """메모리에만 기록 (정확 일치 행이 없어 관련어 값으로 대신한 키워드 등)"""
+        with self._lock:
+            self._remember(normalize_keyword(keyword), float(value), datetime.now())
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "ttl_days": self.ttl_days,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (
+            f"검색량 캐시(TTL {s['ttl_days']:g}일): 조회 {s['lookups']}건 · 메모리 적중 {s['memory_hits']} · "
+            f"디스크 적중 {s['disk_hits']} · 미스 {s['misses']} (적중률 {s['hit_rate']:.0%})"
+        )
@@ -0,0 +1,114 @@
+"""
+volume_store.py - 키워드 월간 검색량 저장소 (SQLite keyword_volume 테이블)
+keywordstool 응답의 keywordList 전체(연관 키워드 수백 개)를 수집 시각과 함께 저장.
+조회 시 저장소를 먼저 읽어, 앞서 연관어로 받은 키워드는 API를 다시 호출하지 않음.
+"""
+
+import logging
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.database import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+DATE_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def normalize_keyword(keyword: str) -> str:
+    """keywordstool relKeyword 비교용: 공백 제거 + 대문자 (API가 공백을 없애고 영문을 대문자로 반환)"""
+    return re.sub(r"\s+", "", keyword or "").upper()
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS keyword_volume (
+            norm_keyword TEXT PRIMARY KEY,
+            keyword TEXT NOT NULL,
+            pc_volume INTEGER,
+            mobile_volume INTEGER,
+            total_volume INTEGER,
+            comp_idx TEXT,
+            hint_keywords TEXT,
+            fetched_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keyword_volume_fetched ON keyword_volume(fetched_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keyword_volume_total ON keyword_volume(total_volume)")
+    return conn
+
+
+def save_volumes(rows: list[dict], hint_keywords: str = "", db_path: Path = DB_PATH) -> int:
+    """
+    검색량 행 저장 (키워드별 최신값으로 갱신). 저장 행 수 반환.
+    rows: [{"keyword", "pc_volume", "mobile_volume", "comp_idx"?}, ...] (naver_api가 파싱한 keywordList)
+    """
+    fetched_at = datetime.now().strftime(DATE_FMT)
+    params = []
+    for r in rows:
+        kw = (r.get("keyword") or "").strip()
+        if not kw:
+            continue
+        pc = int(r.get("pc_volume") or 0)
+        mo = int(r.get("mobile_volume") or 0)
+        params.append((normalize_keyword(kw), kw, pc, mo, pc + mo, r.get("comp_idx"), hint_keywords, fetched_at))
+    if not params:
+        return 0
+    try:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO keyword_volume (
+                        norm_keyword, keyword, pc_volume, mobile_volume, total_volume,
+                        comp_idx, hint_keywords, fetched_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, params)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("검색량 저장 실패: %s", e)
+        return 0
+    return len(params)
+
+
+def get_volume_entries(
+    keywords: list[str], max_age_days: float, db_path: Path = DB_PATH
+) -> dict[str, tuple[float, datetime]]:
+    """저장소에서 max_age_days 이내 수집된 검색량 조회. {입력 키워드: (합산 검색량, 수집 시각)} (없는 키워드는 제외)"""
+    by_norm: dict[str, list[str]] = {}
+    for kw in keywords:
+        if kw:
+            by_norm.setdefault(normalize_keyword(kw), []).append(kw)
+    if not by_norm:
+        return {}
+    since = (datetime.now() - timedelta(days=max_age_days)).strftime(DATE_FMT)
+    result: dict[str, tuple[float, datetime]] = {}
+    norms = list(by_norm)
+    try:
+        conn = _connect(db_path)
+        try:
+            for i in range(0, len(norms), 500):  # SQLite 변수 개수 제한
+                chunk = norms[i : i + 500]
+                ph = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT norm_keyword, total_volume, fetched_at FROM keyword_volume "
+                    f"WHERE norm_keyword IN ({ph}) AND fetched_at >= ?",
+                    (*chunk, since),
+                ).fetchall()
+                for norm, total, fetched_at in rows:
+                    for kw in by_norm[norm]:
+                        result[kw] = (float(total or 0), datetime.strptime(fetched_at, DATE_FMT))
+        finally:
+            conn.close()
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning("검색량 저장소 조회 실패: %s", e)
+    return result
+
+
+def get_volumes(keywords: list[str], max_age_days: float, db_path: Path = DB_PATH) -> dict[str, float]:
+    """저장소에서 max_age_days 이내 수집된 검색량 조회. {입력 키워드: 합산 검색량} (없는 키워드는 제외)"""
+    return {kw: vol for kw, (vol, _) in get_volume_entries(keywords, max_age_days, db_path).items()}
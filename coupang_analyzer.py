@@ -1,75 +1,85 @@
 """
 쿠팡 시장성 분석기 - 진입 가능성 점수 (쿠팡 파트너스 API 사용)
-가격 분할 수집: 다중 API 호출 → 병합·중복제거 → 로켓 비율 재계산
-정확도 레이팅: 샘플 수에 따라 '데이터 부족' / '신뢰도 높음'
+적응형 표본 수집: 호출마다 병합·중복제거 → 신규 상품이 없거나 로켓 비율 신뢰구간이 좁혀지면 조기 종료
+정확도 레이팅: 샘플 수에 따라 '데이터 부족' / '신뢰도 높음' + 로켓 비율 95% 신뢰구간
 멀티스레딩: 키워드 단위 병렬 분석 (API I/O 바운드)
+집계는 상품 스냅샷(core.product_store) 위에서 수행 → --from-store: API 호출 없이 재점수화
 """
 
 import csv
-import time
+import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from coupang_api import search_products
+from coupang_api import cache_report, configure_pool, extract_products, is_rocket, product_id, search_products
+from core import singleflight
+from core.product_store import empty_stats, keyword_stats
+from core.validator import wilson_interval
 
 # 설정
 TRENDING_CSV = "trending_keywords.csv"
 OUTPUT_CSV = "niche_score_report.csv"
 PRODUCTS_PER_CALL = 10  # 쿠팡 API limit 허용 범위 내
-CALLS_PER_KEYWORD = 3  # 키워드당 API 호출 횟수 (가격 구간 대체)
-DELAY_BETWEEN_CALLS = 2
+MAX_CALLS_PER_KEYWORD = 4  # 키워드당 최대 API 호출 횟수 (가격 구간 대체, 수렴하면 조기 종료)
+MIN_NEW_PRODUCTS = 1  # 재호출에서 새 상품이 이보다 적으면 표본 포화로 보고 종료
+CI_HALF_WIDTH = 0.15  # 로켓 비율 95% 신뢰구간 반폭이 이하이고 SAMPLE_HIGH 이상이면 종료
+STORE_MAX_AGE_HOURS = 24  # --from-store 재점수화 시 병합할 스냅샷 범위
 TEST_LIMIT = 50
-MAX_WORKERS = 3  # 병렬 워커 수 (API rate limit 고려)
+MAX_WORKERS = 3  # 병렬 워커 수 (호출 속도는 coupang_api 공유 버킷이 제한)
 
 # 정확도 레이팅
 SAMPLE_LOW = 20   # 미만 → 데이터 부족
 SAMPLE_HIGH = 30  # 이상 → 신뢰도 높음
 
 
-def _extract_products(js: dict) -> list:
-    """API 응답에서 상품 리스트 추출"""
-    if not js:
-        return []
-    data = js.get("data", js)
-    if not isinstance(data, dict):
-        return []
-    products = (
-        data.get("productData") or data.get("products") or data.get("productList")
-        or data.get("items") or data.get("results") or []
-    )
-    return products if isinstance(products, list) else []
-
-
-def _is_rocket(p: dict) -> bool:
-    """로켓 배송 여부 판별"""
-    if not isinstance(p, dict):
-        return False
-    return bool(
-        p.get("isRocket") or p.get("rocket") or p.get("isRocketDelivery")
-        or "로켓" in str(p.get("productName", ""))
-    )
+def _summarize(stats: dict) -> dict:
+    """스냅샷 집계값 → 분석 결과 (정확도 레이팅 + 로켓 비율 신뢰구간 포함)"""
+    total = stats["total_products"]
+    ci_low, ci_high = wilson_interval(stats["rocket_count"], total)
+    result = {
+        "rocket_count": stats["rocket_count"],
+        "avg_price": stats["avg_price"],
+        "min_price": stats["min_price"],
+        "max_price": stats["max_price"],
+        "price_range": stats["price_range"],
+        "avg_reviews": 0,
+        "total_products": total,
+        "accuracy_rating": "데이터 부족",
+        "sample_calls": stats.get("fetches", 0),
+        "rocket_ratio_low": round(ci_low, 3),
+        "rocket_ratio_high": round(ci_high, 3),
+        "stop_reason": "",
+    }
+    if total < SAMPLE_LOW:
+        result["accuracy_rating"] = "데이터 부족"
+    elif total >= SAMPLE_HIGH:
+        result["accuracy_rating"] = "신뢰도 높음"
+    else:
+        result["accuracy_rating"] = "보통"
+    return result
 
 
-def _product_id(p: dict) -> str:
-    """중복 제거용 상품 식별자"""
-    if not isinstance(p, dict):
-        return ""
-    pid = p.get("productId") or p.get("product_id") or p.get("itemId") or p.get("id")
-    url = p.get("productUrl") or p.get("product_url") or p.get("link") or ""
-    return str(pid) if pid else (url.split("/")[-1] or url[:80])
+def analyze_from_store(keywords: list[str]) -> dict[str, dict]:
+    """
+    저장된 상품 스냅샷만으로 분석 (API 호출 없음).
+    키워드별 최근 STORE_MAX_AGE_HOURS 이내 수집분(최대 MAX_CALLS_PER_KEYWORD회)을 상품ID로 중복 제거 → 통계 재계산.
+    """
+    stats = keyword_stats(keywords, fetches=MAX_CALLS_PER_KEYWORD, max_age_hours=STORE_MAX_AGE_HOURS)
+    return {kw: _summarize(s) for kw, s in stats.items()}
 
 
-def _get_price(p: dict) -> int | None:
-    """상품 가격 추출"""
-    if not isinstance(p, dict):
-        return None
-    price = p.get("productPrice") or p.get("price") or p.get("salePrice") or p.get("product_price")
-    if price is None:
-        return None
-    try:
-        return int(price)
-    except (ValueError, TypeError):
-        return None
+def _sampling_done(call_idx: int, new_count: int, rockets: int, n: int) -> str:
+    """표본 수집 종료 사유 (계속이면 빈 문자열)"""
+    if n == 0:
+        return "검색 결과 없음"
+    low, high = wilson_interval(rockets, n)
+    if n >= SAMPLE_HIGH and (high - low) / 2 <= CI_HALF_WIDTH:
+        return "신뢰구간 수렴"
+    if call_idx > 0 and new_count < MIN_NEW_PRODUCTS:
+        return "신규 상품 없음"
+    if call_idx + 1 >= MAX_CALLS_PER_KEYWORD:
+        return "최대 호출"
+    return ""
 
 
 def analyze_keyword_api(
@@ -78,52 +88,33 @@ def analyze_keyword_api(
     secret_key: str,
 ) -> dict:
     """
-    가격 분할 대체: 3회 이상 API 호출 → 병합 → 중복 제거 → 로켓 비율 재계산.
+    가격 분할 대체: API 호출 → 상품 스냅샷 저장 → 병합·중복 제거 집계로 로켓 비율 재계산.
     (API는 가격 필터 미지원이므로 동일 조건 다중 호출로 샘플 확대)
+    호출마다 신규 상품 수와 로켓 비율 신뢰구간을 확인해, 표본이 포화·수렴하면 남은 호출 생략.
     """
-    result = {
-        "rocket_count": 0,
-        "avg_price": 0,
-        "min_price": 0,
-        "max_price": 0,
-        "price_range": 0,
-        "avg_reviews": 0,
-        "total_products": 0,
-        "accuracy_rating": "데이터 부족",
-    }
-
-    seen: dict[str, dict] = {}
-    for call_idx in range(CALLS_PER_KEYWORD):
-        js = search_products(keyword, PRODUCTS_PER_CALL, access_key, secret_key)
-        products = _extract_products(js)
-        for p in products:
-            pid = _product_id(p)
+    seen: dict[str, bool] = {}  # 상품ID → 로켓 여부
+    calls = 0
+    stop_reason = ""
+    for call_idx in range(MAX_CALLS_PER_KEYWORD):
+        # 첫 호출만 캐시 사용 (반복 호출은 표본을 넓히려는 것이므로 항상 API)
+        js = search_products(keyword, PRODUCTS_PER_CALL, access_key, secret_key, use_cache=call_idx == 0)
+        if js is None:
+            stop_reason = "API 오류"
+            break
+        calls += 1
+        new_count = 0
+        for p in extract_products(js):
+            pid = product_id(p)
             if pid and pid not in seen:
-                seen[pid] = p
-        time.sleep(DELAY_BETWEEN_CALLS)
-
-    merged = list(seen.values())
-    result["total_products"] = len(merged)
-
-    if not merged:
-        return result
-
-    rocket_count = sum(1 for p in merged if _is_rocket(p))
-    prices = [pr for p in merged if (pr := _get_price(p)) is not None]
-
-    result["rocket_count"] = rocket_count
-    result["avg_price"] = round(sum(prices) / len(prices), 0) if prices else 0
-    result["min_price"] = min(prices) if prices else 0
-    result["max_price"] = max(prices) if prices else 0
-    result["price_range"] = result["max_price"] - result["min_price"]
-
-    if result["total_products"] < SAMPLE_LOW:
-        result["accuracy_rating"] = "데이터 부족"
-    elif result["total_products"] >= SAMPLE_HIGH:
-        result["accuracy_rating"] = "신뢰도 높음"
-    else:
-        result["accuracy_rating"] = "보통"
-
+                seen[pid] = is_rocket(p)
+                new_count += 1
+        stop_reason = _sampling_done(call_idx, new_count, sum(seen.values()), len(seen))
+        if stop_reason:
+            break
+
+    stats = keyword_stats([keyword], fetches=calls).get(keyword.strip()) if calls else None
+    result = _summarize(stats or empty_stats())
+    result["stop_reason"] = stop_reason
     return result
 
 
@@ -147,16 +138,62 @@ def _process_single(args: tuple) -> tuple[dict, dict]:
     return row, data
 
 
-def main():
+def _result_row(row: dict, data: dict) -> dict:
+    """CSV 출력 행"""
+    score = calc_opportunity_score(data["rocket_count"], data["avg_reviews"], data["price_range"])
+    return {
+        "category": row.get("category", ""),
+        "rank": row.get("rank", ""),
+        "keyword": (row.get("keyword") or "").strip(),
+        "change_trend": row.get("change_trend", ""),
+        "rocket_count": data["rocket_count"],
+        "avg_price": int(data["avg_price"]),
+        "min_price": int(data["min_price"]),
+        "max_price": int(data["max_price"]),
+        "price_range": int(data["price_range"]),
+        "avg_reviews": data["avg_reviews"],
+        "opportunity_score": score,
+        "total_products": data["total_products"],
+        "accuracy_rating": data["accuracy_rating"],
+        "sample_calls": data["sample_calls"],
+        "rocket_ratio_low": data["rocket_ratio_low"],
+        "rocket_ratio_high": data["rocket_ratio_high"],
+        "stop_reason": data["stop_reason"],
+    }
+
+
+def _progress_line(data: dict) -> str:
+    """키워드 1건 진행 로그"""
+    return (
+        f"로켓 {data['rocket_count']}개, 샘플 {data['total_products']}개({data['sample_calls']}회), "
+        f"로켓비율 {data['rocket_ratio_low']:.0%}~{data['rocket_ratio_high']:.0%}, {data['accuracy_rating']}"
+        + (f" [{data['stop_reason']}]" if data["stop_reason"] else "")
+    )
+
+
+def _write_report(results: list[dict]):
+    """niche_score_report.csv 저장"""
+    out_path = Path(OUTPUT_CSV)
+    fieldnames = [
+        "category", "rank", "keyword", "change_trend",
+        "rocket_count", "avg_price", "min_price", "max_price", "price_range",
+        "avg_reviews", "opportunity_score", "total_products", "accuracy_rating",
+        "sample_calls", "rocket_ratio_low", "rocket_ratio_high", "stop_reason",
+    ]
+    with open(out_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print()
+    print(f"저장 완료: {out_path.absolute()}")
+
+
+def main(from_store: bool = False):
+    """from_store=True: API 호출 없이 저장된 상품 스냅샷만으로 재점수화"""
     print("쿠팡 시장성 분석기 (파트너스 API) - 다중 호출 병합 + 병렬 분석")
     print("-" * 50)
 
-    try:
-        from coupang_config import COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY
-    except ImportError:
-        print("오류: coupang_config.py가 없습니다.")
-        return
-
     path = Path(TRENDING_CSV)
     if not path.exists():
         print(f"오류: {TRENDING_CSV} 없음")
@@ -170,13 +207,29 @@ def main():
                 rows.append(row)
 
     rows = rows[:TEST_LIMIT]
-    print(f"분석 대상: {len(rows)}개 키워드 | 호출/키워드: {CALLS_PER_KEYWORD}회 | 워커: {MAX_WORKERS}")
+    results = []
+
+    if from_store:
+        print(f"재점수화: {len(rows)}개 키워드 (저장된 상품 스냅샷 집계, API 호출 없음)")
+        stored = analyze_from_store([row["keyword"] for row in rows])
+        for row in rows:
+            results.append(_result_row(row, stored[row["keyword"].strip()]))
+        _write_report(results)
+        return
+
+    try:
+        from coupang_config import COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY
+    except ImportError:
+        print("오류: coupang_config.py가 없습니다.")
+        return
+
+    print(f"분석 대상: {len(rows)}개 키워드 | 호출/키워드: 최대 {MAX_CALLS_PER_KEYWORD}회(수렴 시 조기 종료) | 워커: {MAX_WORKERS}")
     print()
 
-    results = []
     use_mp = len(rows) >= 3 and MAX_WORKERS > 1
 
     if use_mp:
+        configure_pool(MAX_WORKERS)  # 워커당 1개 연결 유지 (핸드셰이크 재사용)
         args_list = [(row, COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY) for row in rows]
         with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
             futures = {ex.submit(_process_single, a): a[0] for a in args_list}
@@ -185,42 +238,11 @@ def main():
                 kw = (row.get("keyword") or "").strip()
                 try:
                     _, data = future.result()
-                    score = calc_opportunity_score(
-                        data["rocket_count"], data["avg_reviews"], data["price_range"]
-                    )
-                    results.append({
-                        "category": row.get("category", ""),
-                        "rank": row.get("rank", ""),
-                        "keyword": kw,
-                        "change_trend": row.get("change_trend", ""),
-                        "rocket_count": data["rocket_count"],
-                        "avg_price": int(data["avg_price"]),
-                        "min_price": int(data["min_price"]),
-                        "max_price": int(data["max_price"]),
-                        "price_range": int(data["price_range"]),
-                        "avg_reviews": data["avg_reviews"],
-                        "opportunity_score": score,
-                        "total_products": data["total_products"],
-                        "accuracy_rating": data["accuracy_rating"],
-                    })
-                    print(f"[{i+1}/{len(rows)}] {kw} | 로켓 {data['rocket_count']}개, 샘플 {data['total_products']}개, {data['accuracy_rating']}")
+                    results.append(_result_row(row, data))
+                    print(f"[{i+1}/{len(rows)}] {kw} | {_progress_line(data)}")
                 except Exception as e:
                     print(f"[{i+1}/{len(rows)}] {kw} 오류: {e}")
-                    results.append({
-                        "category": row.get("category", ""),
-                        "rank": row.get("rank", ""),
-                        "keyword": kw,
-                        "change_trend": row.get("change_trend", ""),
-                        "rocket_count": 0,
-                        "avg_price": 0,
-                        "min_price": 0,
-                        "max_price": 0,
-                        "price_range": 0,
-                        "avg_reviews": 0,
-                        "opportunity_score": 0,
-                        "total_products": 0,
-                        "accuracy_rating": "데이터 부족",
-                    })
+                    results.append(_result_row(row, _summarize(empty_stats())))
     else:
         for i, row in enumerate(rows):
             kw = (row.get("keyword") or "").strip()
@@ -228,40 +250,15 @@ def main():
                 continue
             print(f"[{i + 1}/{len(rows)}] {kw}")
             data = analyze_keyword_api(kw, COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY)
-            score = calc_opportunity_score(
-                data["rocket_count"], data["avg_reviews"], data["price_range"]
-            )
-            results.append({
-                "category": row.get("category", ""),
-                "rank": row.get("rank", ""),
-                "keyword": kw,
-                "change_trend": row.get("change_trend", ""),
-                "rocket_count": data["rocket_count"],
-                "avg_price": int(data["avg_price"]),
-                "min_price": int(data["min_price"]),
-                "max_price": int(data["max_price"]),
-                "price_range": int(data["price_range"]),
-                "avg_reviews": data["avg_reviews"],
-                "opportunity_score": score,
-                "total_products": data["total_products"],
-                "accuracy_rating": data["accuracy_rating"],
-            })
-            print(f"  로켓 {data['rocket_count']}개, 샘플 {data['total_products']}개, {data['accuracy_rating']}")
-
-    out_path = Path(OUTPUT_CSV)
-    fieldnames = [
-        "category", "rank", "keyword", "change_trend",
-        "rocket_count", "avg_price", "min_price", "max_price", "price_range",
-        "avg_reviews", "opportunity_score", "total_products", "accuracy_rating",
-    ]
-    with open(out_path, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(results)
+            results.append(_result_row(row, data))
+            print(f"  {_progress_line(data)}")
 
-    print()
-    print(f"저장 완료: {out_path.absolute()}")
+    _write_report(results)
+    print(cache_report())
+    merged = singleflight.report()
+    if merged:
+        print(merged)
 
 
 if __name__ == "__main__":
-    main()
+    main(from_store="--from-store" in sys.argv)
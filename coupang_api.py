@@ -1,17 +1,129 @@
 """
 쿠팡 파트너스 API 클라이언트 (HMAC 인증)
+공유 세션 풀(keep-alive)로 스레드 간 연결 재사용
+검색 응답은 raw_scrapes 테이블에 캐시 (keyword, limit, subId 기준, COUPANG_CACHE_TTL_HOURS 동안 재사용)
+API로 새로 받은 응답은 상품 단위로 coupang_products 스냅샷에 저장 (분석 스크립트는 이 테이블을 집계)
+호출 속도는 API 키별 공유 버킷(api_rate_state.db)으로 제어 → 동시에 실행 중인 스크립트끼리도 예산 공유
+config의 COUPANG_KEYS로 계정을 추가하면 요청을 키마다 나눠 보냄 (키별 버킷·일일 사용량, 한도 초과 시 다른 키로 전환)
+동시에 들어온 같은 검색은 core.singleflight로 1회 호출로 병합
 """
 
 import hashlib
 import hmac
+import threading
 import time
 from urllib.parse import quote
 
 import requests
 
+from core import deadline
+from core.circuit_breaker import breaker
+from core.http_pool import get_session
+from core.key_pool import KeyPool, normalize_keys
+from database.db import get_raw_scrape, save_raw_scrape
+from core.product_store import has_snapshot, save_snapshot
+from core.rate_limit import AimdController, SharedTokenBucket, parse_retry_after
+from core.singleflight import SingleFlight
+
 BASE_URL = "https://api-gateway.coupang.com"
 # 파트너스 상품 검색 API 경로 (v1 포함)
 SEARCH_PATH = "/v2/providers/affiliate_open_api/apis/openapi/v1/products/search"
+SESSION_NAME = "coupang"
+POOL_SIZE = 4  # 동시 워커 수에 맞춰 configure_pool()로 조정
+
+
+def _load_rate_config() -> tuple[float, int]:
+    """config.py의 COUPANG_RATE_PER_SEC / COUPANG_BURST (없으면 기본값)"""
+    try:
+        from config import COUPANG_RATE_PER_SEC, COUPANG_BURST
+        return float(COUPANG_RATE_PER_SEC), int(COUPANG_BURST)
+    except (ImportError, TypeError, ValueError):
+        return 1.0, 3
+
+
+def _load_cache_ttl() -> float:
+    """config.py의 COUPANG_CACHE_TTL_HOURS (0이면 캐시 미사용)"""
+    try:
+        from config import COUPANG_CACHE_TTL_HOURS
+        return float(COUPANG_CACHE_TTL_HOURS)
+    except (ImportError, TypeError, ValueError):
+        return 12.0
+
+
+def _load_key_config() -> tuple[list, int]:
+    """config.py의 COUPANG_KEYS(추가 계정 [(access, secret), ...]) / COUPANG_DAILY_QUOTA(키당 일일 한도, 0 = 무제한)"""
+    try:
+        from config import COUPANG_KEYS, COUPANG_DAILY_QUOTA
+        return list(COUPANG_KEYS or []), int(COUPANG_DAILY_QUOTA or 0)
+    except (ImportError, TypeError, ValueError):
+        return [], 0
+
+
+RATE_PER_SEC, BURST = _load_rate_config()
+EXTRA_KEYS, DAILY_QUOTA = _load_key_config()
+CACHE_TTL_HOURS = _load_cache_ttl()
+CACHE_SOURCE = "coupang_search"
+MIN_RATE_PER_SEC = 0.1
+MAX_RATE_PER_SEC = 5.0
+THROTTLE_RETRIES = 2  # 한도 초과 응답 시 감속 후 재시도 횟수
+REQUEST_TIMEOUT_SEC = 15  # 실행 마감(core.deadline)이 더 가까우면 남은 시간까지만
+
+# API 키별 속도 제어기. 버킷은 모든 스레드·프로세스가 공유 (호출자 쪽 sleep 불필요)
+# 성공하면 조금씩 가속, 한도 초과면 절반으로 감속. 학습된 속도는 버킷 행에 남아 다음 실행의 시작값.
+_throttles: dict[str, AimdController] = {}
+_pools: dict[tuple, KeyPool] = {}
+_throttles_lock = threading.Lock()
+
+# 동시에 들어온 같은 검색 요청 병합 (병렬 분석 워커·대시보드·파이프라인이 같은 키워드를 조회할 때)
+_flight = SingleFlight("coupang")
+# 응답 시간 p95를 넘긴 검색은 한 번 더 보내 먼저 온 응답 사용 (키별 버킷에 토큰이 남아 있을 때만)
+_latency = deadline.tracker("coupang")
+# 차단(401·403)·서버 오류·연결 실패가 이어지면 남은 검색은 요청 없이 바로 실패 처리 (캐시 적중은 그대로 사용)
+_circuit = breaker("coupang")
+
+
+def _key_id(access_key: str) -> str:
+    """상태 DB에 키 원문 대신 저장할 식별자"""
+    return hashlib.sha256((access_key or "").encode("utf-8")).hexdigest()[:10]
+
+
+def _get_throttle(access_key: str) -> AimdController:
+    kid = _key_id(access_key)
+    with _throttles_lock:
+        throttle = _throttles.get(kid)
+        if throttle is None:
+            bucket = SharedTokenBucket(f"coupang:{kid}", RATE_PER_SEC, BURST)
+            throttle = AimdController(bucket.name, bucket, MIN_RATE_PER_SEC, MAX_RATE_PER_SEC, state_db=None)
+            _throttles[kid] = throttle
+        return throttle
+
+
+def _get_pool(access_key: str, secret_key: str) -> KeyPool:
+    """호출부가 넘긴 키 + config의 추가 키로 구성한 키 풀 (같은 구성이면 같은 풀 재사용)"""
+    keys = tuple(normalize_keys([(access_key, secret_key)] + EXTRA_KEYS))
+    with _throttles_lock:
+        pool = _pools.get(keys)
+        if pool is None:
+            pool = _pools[keys] = KeyPool("coupang", list(keys), DAILY_QUOTA)
+        return pool
+
+
+def configure_pool(pool_size: int):
+    """연결 풀 크기 설정 (병렬 워커 수와 맞추면 워커마다 warm 연결 재사용)"""
+    global POOL_SIZE
+    POOL_SIZE = max(1, int(pool_size))
+    get_session(SESSION_NAME, POOL_SIZE)
+
+
+def configure_rate_limit(rate_per_sec: float, burst: int | None = None):
+    """초당 요청 수·burst 변경 (사용 중인 키 버킷에 즉시 적용, 다른 프로세스에도 공유됨)"""
+    global RATE_PER_SEC, BURST
+    RATE_PER_SEC = float(rate_per_sec)
+    BURST = BURST if burst is None else int(burst)
+    with _throttles_lock:
+        throttles = list(_throttles.values())
+    for throttle in throttles:
+        throttle.bucket.set_rate(RATE_PER_SEC, BURST)
 
 
 def generate_hmac(method: str, path: str, query_string: str, secret_key: str, access_key: str) -> str:
@@ -29,6 +141,212 @@ def generate_hmac(method: str, path: str, query_string: str, secret_key: str, ac
     return f"CEA algorithm=HmacSHA256, access-key={access_key}, signed-date={datetime_str}, signature={signature}"
 
 
+def _is_throttle_message(msg: str) -> bool:
+    """rCode 오류 메시지가 호출 한도 초과인지 판별"""
+    m = (msg or "").lower()
+    return any(w in m for w in ("limit", "exceed", "too many", "초과", "제한"))
+
+
+def _search_query(
+    keyword: str,
+    limit: int,
+    sub_id: str,
+    min_price: int | None = None,
+    max_price: int | None = None,
+) -> str:
+    """상품 검색 query string (서명 메시지에도 그대로 사용)"""
+    encoded_kw = quote(keyword, safe="", encoding="utf-8")
+    query_string = f"keyword={encoded_kw}&limit={limit}&subId={sub_id}"
+    # 참고: 쿠팡 파트너스 API는 minPrice/maxPrice 미지원. 향후 지원 시 사용.
+    if min_price is not None:
+        query_string += f"&minPrice={min_price}"
+    if max_price is not None:
+        query_string += f"&maxPrice={max_price}"
+    return query_string
+
+
+_cache_stats = {"hits": 0, "misses": 0}
+_cache_stats_lock = threading.Lock()
+
+
+def _cache_source(limit: int, sub_id: str, min_price: int | None = None, max_price: int | None = None) -> str:
+    """raw_scrapes.source 값: 검색 조건(limit, subId, 가격대)을 담아 조건별로 따로 캐시"""
+    source = f"{CACHE_SOURCE}?limit={limit}&subId={sub_id}"
+    if min_price is not None:
+        source += f"&minPrice={min_price}"
+    if max_price is not None:
+        source += f"&maxPrice={max_price}"
+    return source
+
+
+def cache_get(keyword: str, source: str) -> dict | None:
+    """TTL 이내 캐시된 검색 응답 (CACHE_TTL_HOURS <= 0 또는 DB 오류면 None)"""
+    if CACHE_TTL_HOURS <= 0:
+        return None
+    try:
+        data = get_raw_scrape(source, keyword, CACHE_TTL_HOURS)
+    except Exception as e:
+        print(f"  [캐시 오류] {e}")
+        data = None
+    with _cache_stats_lock:
+        _cache_stats["hits" if data is not None else "misses"] += 1
+    return data
+
+
+def pending_keywords(keywords: list[str], limit: int, sub_id: str = "coupang_gross") -> list[str]:
+    """캐시에 TTL 이내 응답이 없어 API 호출이 필요한 키워드 (호출 예산 계획용, 캐시 통계 미반영)"""
+    if CACHE_TTL_HOURS <= 0:
+        return list(keywords)
+    source = _cache_source(limit, sub_id)
+    pending = []
+    for kw in keywords:
+        try:
+            cached = get_raw_scrape(source, kw, CACHE_TTL_HOURS)
+        except Exception:
+            cached = None
+        if cached is None:
+            pending.append(kw)
+    return pending
+
+
+def cache_put(keyword: str, source: str, data: dict) -> None:
+    if CACHE_TTL_HOURS <= 0:
+        return
+    try:
+        save_raw_scrape(source, keyword, data)
+    except Exception as e:
+        print(f"  [캐시 오류] {e}")
+
+
+def cache_report() -> str:
+    """검색 응답 캐시 적중 요약 (스크립트 종료 시 출력용)"""
+    with _cache_stats_lock:
+        hits, misses = _cache_stats["hits"], _cache_stats["misses"]
+    total = hits + misses
+    rate = hits / total if total else 0.0
+    return f"쿠팡 검색 캐시(TTL {CACHE_TTL_HOURS:g}시간): 조회 {total}건 · 적중 {hits} · API 호출 {misses} (적중률 {rate:.0%})"
+
+
+def extract_products(js: dict | None) -> list:
+    """API 응답에서 상품 리스트 추출"""
+    if not js:
+        return []
+    data = js.get("data", js)
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    products = (
+        data.get("productData") or data.get("products") or data.get("productList")
+        or data.get("items") or data.get("results") or []
+    )
+    return products if isinstance(products, list) else []
+
+
+def is_rocket(p: dict) -> bool:
+    """로켓 배송 여부 판별"""
+    if not isinstance(p, dict):
+        return False
+    return bool(
+        p.get("isRocket") or p.get("rocket") or p.get("isRocketDelivery")
+        or "로켓" in str(p.get("productName", ""))
+    )
+
+
+def product_id(p: dict) -> str:
+    """중복 제거용 상품 식별자"""
+    if not isinstance(p, dict):
+        return ""
+    pid = p.get("productId") or p.get("product_id") or p.get("itemId") or p.get("id")
+    url = p.get("productUrl") or p.get("product_url") or p.get("link") or ""
+    return str(pid) if pid else (url.split("/")[-1] or url[:80])
+
+
+def get_price(p: dict) -> int | None:
+    """상품 가격 추출"""
+    if not isinstance(p, dict):
+        return None
+    price = p.get("productPrice") or p.get("price") or p.get("salePrice") or p.get("product_price")
+    if price is None:
+        return None
+    try:
+        return int(price)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_products(js: dict | None) -> list[dict]:
+    """응답 → 스냅샷 행 [{"product_id", "name", "price", "is_rocket"}] (응답 순서 유지, dict 아닌 항목 제외)"""
+    return [
+        {
+            "product_id": product_id(p),
+            "name": str(p.get("productName") or p.get("name") or ""),
+            "price": get_price(p),
+            "is_rocket": is_rocket(p),
+        }
+        for p in extract_products(js)
+        if isinstance(p, dict)
+    ]
+
+
+def record_snapshot(keyword: str, data: dict, from_cache: bool = False) -> None:
+    """
+    응답을 상품 스냅샷으로 저장 (API 응답 1건당 1회).
+    from_cache=True: 캐시 적중 응답은 TTL 이내 수집 기록이 없을 때만 저장 (스냅샷 도입 전 캐시 대비)
+    """
+    try:
+        if from_cache and has_snapshot(keyword, max(CACHE_TTL_HOURS, 0)):
+            return
+        save_snapshot(keyword, parse_products(data))
+    except Exception as e:
+        print(f"  [스냅샷 오류] {e}")
+
+
+def record_circuit(status_code: int | None) -> None:
+    """응답 상태를 차단 회로에 반영 (None = 연결 실패). 429·요청 오류(400 등)는 엔드포인트 장애로 보지 않음"""
+    if status_code == 200:
+        _circuit.record_success()
+    elif status_code is None or status_code in (401, 403) or status_code >= 500:
+        _circuit.record_failure("연결 실패" if status_code is None else f"HTTP {status_code}")
+
+
+def circuit_open() -> bool:
+    """쿠팡 API 차단 회로가 열려 있는지 (호출부가 키워드를 나중에 재시도하도록 구분)"""
+    return _circuit.is_open
+
+
+def _check_response(
+    status_code: int,
+    text: str,
+    data: dict | None,
+    retry_after: str | None,
+    throttle: AimdController,
+    attempt: int,
+) -> str:
+    """
+    응답 판정 + 속도 제어 반영. "ok" / "retry"(한도 초과, 감속 후 재시도) / "error" 반환.
+    동기(search_products)·비동기(async_api.coupang) 클라이언트 공용.
+    """
+    if status_code == 429:
+        throttle.on_throttle(parse_retry_after(retry_after))
+        print(f"  [API 제한] HTTP 429 → {throttle.rate:.2f}회/초로 감속 (시도 {attempt})")
+        return "retry"
+    if status_code != 200 or data is None:
+        print(f"  [API 오류] HTTP {status_code}: {text[:200]}")
+        return "error"
+    rcode = data.get("rCode") or data.get("code")
+    if rcode == "ERROR" or rcode == "400" or (isinstance(rcode, int) and rcode >= 400):
+        msg = data.get("rMessage") or data.get("message", "Unknown")
+        if _is_throttle_message(msg):
+            throttle.on_throttle(parse_retry_after(retry_after))
+            print(f"  [API 제한] rMessage: {msg} → {throttle.rate:.2f}회/초로 감속 (시도 {attempt})")
+            return "retry"
+        print(f"  [API 오류] rCode: {rcode} | rMessage: {msg}")
+        return "error"
+    throttle.on_success()
+    return "ok"
+
+
 def search_products(
     keyword: str,
     limit: int,
@@ -37,45 +355,93 @@ def search_products(
     sub_id: str = "coupang_gross",
     min_price: int | None = None,
     max_price: int | None = None,
+    use_cache: bool = True,
 ) -> dict | None:
     """
     쿠팡 파트너스 API - 상품 검색
     subId: 채널 ID (미입력 시 일부 계정에서 data 미반환될 수 있음)
+    호출 한도 초과(429·rCode 제한) 시 속도를 낮추고 Retry-After만큼 대기 후 재시도.
+    use_cache=True: raw_scrapes 캐시를 먼저 읽고, 새로 받은 성공 응답은 캐시에 기록.
+    use_cache=False: 캐시를 읽지 않고 항상 API 호출 (응답은 캐시에 기록)
+    동시에 같은 조건(키·키워드·검색 조건)으로 들어온 use_cache=True 호출은 1회로 병합 (결과 공유, 수정 금지).
+    use_cache=False는 표본 확대용 재호출이므로 병합하지 않음.
     """
-    time.sleep(1.5)  # API 차단 방지: 요청 간격 유지
-    encoded_kw = quote(keyword, safe="", encoding="utf-8")
-    query_string = f"keyword={encoded_kw}&limit={limit}&subId={sub_id}"
-    # 참고: 쿠팡 파트너스 API는 minPrice/maxPrice 미지원. 향후 지원 시 사용.
-    if min_price is not None:
-        query_string += f"&minPrice={min_price}"
-    if max_price is not None:
-        query_string += f"&maxPrice={max_price}"
+    source = _cache_source(limit, sub_id, min_price, max_price)
+    if not use_cache:
+        return _search_products(keyword, limit, access_key, secret_key, sub_id, min_price, max_price, source, False)
+    return _flight.do(
+        (_key_id(access_key), source, keyword),
+        lambda: _search_products(keyword, limit, access_key, secret_key, sub_id, min_price, max_price, source, True),
+    )
 
+
+def _search_products(
+    keyword: str,
+    limit: int,
+    access_key: str,
+    secret_key: str,
+    sub_id: str,
+    min_price: int | None,
+    max_price: int | None,
+    source: str,
+    use_cache: bool,
+) -> dict | None:
+    """search_products 본체 (캐시 조회 → API 호출 → 캐시·스냅샷 기록)"""
+    if use_cache:
+        cached = cache_get(keyword, source)
+        if cached is not None:
+            record_snapshot(keyword, cached, from_cache=True)
+            return cached
+    query_string = _search_query(keyword, limit, sub_id, min_price, max_price)
     path = SEARCH_PATH
     method = "GET"
-    authorization = generate_hmac(method, path, query_string, secret_key, access_key)
-
     url = BASE_URL + path + "?" + query_string
+    pool = _get_pool(access_key, secret_key)
 
-    try:
-        resp = requests.get(
-            url,
-            headers={
-                "Authorization": authorization,
-                "Content-Type": "application/json; charset=utf-8",
-            },
-            timeout=15,
-        )
-        if resp.status_code != 200:
-            print(f"  [API 오류] HTTP {resp.status_code}: {resp.text[:200]}")
+    # 한도 초과 시 같은 키로 감속 재시도하거나 다른 키로 전환 → 키 수만큼 시도 횟수 추가
+    for attempt in range(1, THROTTLE_RETRIES + len(pool) + 1):
+        if deadline.expired():
+            print(f"  [마감] 실행 마감 시각 초과 → 검색 중단: {keyword}")
             return None
-        data = resp.json()
-        rcode = data.get("rCode") or data.get("code")
-        if rcode == "ERROR" or rcode == "400" or (isinstance(rcode, int) and rcode >= 400):
-            msg = data.get("rMessage") or data.get("message", "Unknown")
-            print(f"  [API 오류] rCode: {rcode} | rMessage: {msg}")
+        if not _circuit.allow():
+            print(f"  [차단 회로] 쿠팡 API 연속 실패 → 요청 생략 ({_circuit.retry_in():.0f}초 후 재시도): {keyword}")
+            return None
+        key = pool.pick()
+        if key is None:
+            print("  [API 한도] 사용 가능한 쿠팡 키 없음 (모든 키 일일 한도 소진)")
+            return None
+        throttle = _get_throttle(key[0])
+        throttle.acquire()  # API 차단 방지: 키별 공유 토큰 버킷으로 요청 속도 유지
+        try:
+            # 서명 시각이 요청에 들어가므로 헤지 요청도 새로 서명
+            resp = deadline.hedged(
+                lambda: get_session(SESSION_NAME, POOL_SIZE).get(
+                    url,
+                    headers={
+                        "Authorization": generate_hmac(method, path, query_string, key[1], key[0]),
+                        "Content-Type": "application/json; charset=utf-8",
+                    },
+                    timeout=deadline.timeout_for(REQUEST_TIMEOUT_SEC),
+                ),
+                _latency,
+                lambda: throttle.try_acquire() and pool.charge(key),
+            )
+            record_circuit(resp.status_code)
+            data = resp.json() if resp.status_code == 200 else None
+            verdict = _check_response(
+                resp.status_code, resp.text, data, resp.headers.get("Retry-After"), throttle, attempt
+            )
+            if verdict == "retry":
+                pool.cooldown(key, parse_retry_after(resp.headers.get("Retry-After")))
+                continue
+            if verdict != "ok":
+                return None
+            cache_put(keyword, source, data)
+            record_snapshot(keyword, data)
+            return data
+        except Exception as e:
+            print(f"  [API 오류] {e}")
+            if isinstance(e, requests.exceptions.RequestException):
+                record_circuit(None)
             return None
-        return data
-    except Exception as e:
-        print(f"  [API 오류] {e}")
     return None
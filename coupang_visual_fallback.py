@@ -1,6 +1,7 @@
 """
 coupang_visual_fallback.py - 시각 검증용 스크래퍼 (차단 시 예외 처리)
 API 로켓수 0일 때 보조 검증용. 쿠팡이 차단하면 실패하고 스크린샷은 저장되지 않음.
+차단(Access Denied)이 이어지면 차단 회로가 열려 대기 시간 동안 브라우저를 띄우지 않고 바로 실패 반환.
 """
 
 import sys
@@ -9,8 +10,13 @@ from urllib.parse import quote
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from core.circuit_breaker import breaker
+
 DEBUG_SCREENSHOTS = Path(__file__).resolve().parent / "debug_screenshots"
 COUPANG_SEARCH_URL = "https://www.coupang.com/np/search"
+BLOCKED_ERROR = "쿠팡 차단 (Access Denied)"
+
+_circuit = breaker("coupang_web")
 
 
 def scrape_and_save(keyword: str) -> dict:
@@ -28,6 +34,10 @@ def scrape_and_save(keyword: str) -> dict:
         result["error"] = "playwright 미설치"
         return result
 
+    if not _circuit.allow():
+        result["error"] = f"{BLOCKED_ERROR} - 연속 차단으로 {_circuit.retry_in():.0f}초 동안 시도 생략"
+        return result
+
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
@@ -43,8 +53,10 @@ def scrape_and_save(keyword: str) -> dict:
 
                 body = page.inner_text("body") or ""
                 if "Access Denied" in body or "접근이 제한" in body:
-                    result["error"] = "쿠팡 차단 (Access Denied)"
+                    _circuit.record_failure("Access Denied")
+                    result["error"] = BLOCKED_ERROR
                     return result
+                _circuit.record_success()
 
                 DEBUG_SCREENSHOTS.mkdir(parents=True, exist_ok=True)
                 page.screenshot(path=str(out_path), full_page=False)
@@ -65,3 +77,8 @@ def scrape_and_save(keyword: str) -> dict:
     except Exception as e:
         result["error"] = str(e)
     return result
+
+
+def circuit_open() -> bool:
+    """연속 차단으로 시각 검증을 쉬는 중인지"""
+    return _circuit.is_open
@@ -1,14 +1,11 @@
 """대시보드용 API 헬퍼 - 트렌드/검색량 조회"""
 
 import sys
-from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-import requests
-
-API_URL = "https://openapi.naver.com/v1/datalab/search"
+TREND_START_MONTH = "2023-01"  # seasonal_analyzer와 같은 구간 → 저장소 공유
 
 
 def load_naver_datalab_config():
@@ -25,36 +22,16 @@ def load_naver_datalab_config():
 
 
 def fetch_trend_3year(keyword: str) -> tuple[list[str], list[float]]:
-    """3년치 월별 트렌드 조회 (periods, ratios)"""
+    """3년치 월별 트렌드 조회 (periods, ratios). naver_datalab 저장소 경유 → 본 적 없는 달만 API 요청"""
     cid, sec = load_naver_datalab_config()
     if not cid or not sec:
         return [], []
-    body = {
-        "startDate": "2023-01-01",
-        "endDate": datetime.now().strftime("%Y-%m-%d"),
-        "timeUnit": "month",
-        "keywordGroups": [{"groupName": keyword, "keywords": [keyword]}],
-    }
     try:
-        r = requests.post(
-            API_URL,
-            headers={
-                "X-Naver-Client-Id": cid,
-                "X-Naver-Client-Secret": sec,
-                "Content-Type": "application/json",
-            },
-            json=body,
-            timeout=30,
-        )
-        if r.status_code != 200:
-            return [], []
-        data = r.json()
-        for res in data.get("results", []):
-            if res.get("title") == keyword:
-                pts = res.get("data", [])
-                periods = [p.get("period", "") for p in pts]
-                ratios = [float(p.get("ratio", 0) or 0) for p in pts]
-                return periods, ratios
+        from naver_datalab import get_monthly_trends
+        pts = get_monthly_trends([keyword], TREND_START_MONTH, cid, sec).get(keyword, [])
+        periods = [p.get("period", "") for p in pts]
+        ratios = [float(p.get("ratio", 0) or 0) for p in pts]
+        return periods, ratios
     except Exception:
         pass
     return [], []
@@ -3,9 +3,10 @@ SQLite 데이터베이스 모듈
 상품명, 수집일, 네이버 검색량, 쿠팡 로켓수, 도매가 등 시계열 저장
 """
 
+import json
 import sqlite3
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 DB_PATH = Path(__file__).resolve().parent.parent / "coupang_gross.db"
@@ -56,16 +57,25 @@ def init_db():
             CREATE INDEX IF NOT EXISTS idx_keyword_collected 
             ON keyword_data(keyword, collected_at)
         """)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS raw_scrapes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source TEXT NOT NULL,
-                keyword TEXT,
-                raw_json TEXT,
-                scraped_at TEXT,
-                success INTEGER
-            )
-        """)
+        _create_raw_scrapes(cur)
+
+
+def _create_raw_scrapes(cur):
+    """원본 응답 저장 테이블 (API 응답 캐시로도 사용)"""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS raw_scrapes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            keyword TEXT,
+            raw_json TEXT,
+            scraped_at TEXT,
+            success INTEGER
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_raw_source_keyword
+        ON raw_scrapes(source, keyword, scraped_at)
+    """)
 
 
 def insert_keyword_data(
@@ -131,3 +141,38 @@ def get_latest_by_keywords(keywords: list[str]) -> list[dict]:
             )
         """, keywords)
         return [dict(row) for row in cur.fetchall()]
+
+
+def save_raw_scrape(source: str, keyword: str, raw: dict | list | str, success: bool = True):
+    """원본 응답 저장 (source 예: 'coupang_search?limit=10&subId=coupang_gross')"""
+    raw_json = raw if isinstance(raw, str) else json.dumps(raw, ensure_ascii=False)
+    with db_session() as conn:
+        cur = conn.cursor()
+        _create_raw_scrapes(cur)
+        # 같은 (source, keyword)의 이전 응답은 최신 1건만 남김 (캐시 용도라 이력 불필요)
+        cur.execute("DELETE FROM raw_scrapes WHERE source = ? AND keyword = ?", (source, keyword))
+        cur.execute("""
+            INSERT INTO raw_scrapes (source, keyword, raw_json, scraped_at, success)
+            VALUES (?, ?, ?, ?, ?)
+        """, (source, keyword, raw_json, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 1 if success else 0))
+
+
+def get_raw_scrape(source: str, keyword: str, max_age_hours: float) -> dict | list | None:
+    """max_age_hours 이내에 성공한 최신 원본 응답 (없으면 None)"""
+    since = (datetime.now() - timedelta(hours=max_age_hours)).strftime("%Y-%m-%d %H:%M:%S")
+    with db_session() as conn:
+        cur = conn.cursor()
+        _create_raw_scrapes(cur)
+        cur.execute("""
+            SELECT raw_json FROM raw_scrapes
+            WHERE source = ? AND keyword = ? AND success = 1 AND scraped_at >= ?
+            ORDER BY scraped_at DESC
+            LIMIT 1
+        """, (source, keyword, since))
+        row = cur.fetchone()
+    if row is None:
+        return None
+    try:
+        return json.loads(row["raw_json"])
+    except (TypeError, ValueError):
+        return None
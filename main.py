@@ -42,7 +42,7 @@ def run_pipeline(limit: int = 20):
 
     logger.info("네이버 쇼핑 인사이트 TOP 키워드 수집")
     keywords_data = []
-    for cat_name, cid in [("생활/주방", "50000008"), ("디지털/가전", "50000003")]:
+    for cat_name, cid in naver.categories:
         try:
             items = naver.scrape_category_top(cat_name, cid, limit=limit // 2)
             keywords_data.extend(items)
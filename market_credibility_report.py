@@ -10,18 +10,13 @@ niche_test.csv를 읽어 '데이터 기반 진입 신뢰도 리포트' 생성
 import csv
 import platform
 import re
-import time
-from datetime import datetime, timedelta
 from pathlib import Path
 
-import requests
+from naver_datalab import as_api_response, get_monthly_trends, months_ago
 
 INPUT_CSV = "niche_test.csv"
 OUTPUT_CSV = "market_credibility_report.csv"
 OUTPUT_DIR = "credibility_charts"
-API_URL = "https://openapi.naver.com/v1/datalab/search"
-KEYWORDS_PER_REQUEST = 5
-DELAY_SEC = 1
 TREND_YEARS = 1  # 1년 (3년은 startDate 2016-01-01 제한 있음)
 
 
@@ -54,35 +49,9 @@ def load_niche_data() -> list[dict]:
 
 
 def fetch_trend(client_id: str, client_secret: str, keywords: list[str]) -> dict | None:
-    """Naver DataLab API로 키워드별 검색 트렌드 조회 (월간, 1년)"""
-    end = datetime.now()
-    start = end - timedelta(days=365 * TREND_YEARS)
-    start_str = start.strftime("%Y-%m-%d")
-    end_str = end.strftime("%Y-%m-%d")
-
-    groups = [{"groupName": kw, "keywords": [kw]} for kw in keywords[:KEYWORDS_PER_REQUEST]]
-    body = {
-        "startDate": start_str,
-        "endDate": end_str,
-        "timeUnit": "month",
-        "keywordGroups": groups,
-    }
-    try:
-        r = requests.post(
-            API_URL,
-            headers={
-                "X-Naver-Client-Id": client_id,
-                "X-Naver-Client-Secret": client_secret,
-                "Content-Type": "application/json",
-            },
-            json=body,
-            timeout=30,
-        )
-        if r.status_code == 200:
-            return r.json()
-    except Exception as e:
-        print(f"  [API 오류] {e}")
-    return None
+    """Naver DataLab 키워드별 검색 트렌드 조회 (월간, 1년, 데이터랩 응답 형식). 저장소에 없는 달만 API 요청."""
+    trends = get_monthly_trends(keywords, months_ago(12 * TREND_YEARS), client_id, client_secret)
+    return as_api_response(trends) if trends else None
 
 
 def analyze_trend(data_list: list[dict]) -> dict:
@@ -233,19 +202,10 @@ def main():
     print(f"대상 키워드 {len(keywords_all)}개, Naver DataLab API 호출 중...")
 
     trend_by_keyword = {}
-    for i in range(0, len(keywords_all), KEYWORDS_PER_REQUEST):
-        batch = keywords_all[i : i + KEYWORDS_PER_REQUEST]
-        js = fetch_trend(client_id, client_secret, batch)
-        time.sleep(DELAY_SEC)
-        if not js:
-            for kw in batch:
-                trend_by_keyword[kw] = analyze_trend([])
-            continue
-        for res in js.get("results", []):
-            kw = res.get("title", "")
-            data = res.get("data", [])
-            trend_by_keyword[kw] = analyze_trend(data)
-        print(f"  {i + len(batch)}/{len(keywords_all)} 수집")
+    js = fetch_trend(client_id, client_secret, keywords_all) or {}
+    for res in js.get("results", []):
+        trend_by_keyword[res.get("title", "")] = analyze_trend(res.get("data", []))
+    print(f"  {len(trend_by_keyword)}/{len(keywords_all)} 수집")
 
     # margin 30%+ 키워드 (final_sourcing_list 있으면)
     margin_30_keywords = set()
@@ -1,24 +1,104 @@
 """
 naver_api.py - 네이버 검색광고 API 연동
-keywordstool로 키워드별 월간 검색량(PC+모바일) 조회
-retry + logging 포함
+keywordstool로 키워드별 월간 검색량(PC+모바일) 조회 (최대 5개씩 묶음 조회 지원)
+응답의 연관 키워드 검색량은 모두 저장하고, 조회 시 캐시(메모리 LRU → SQLite, TTL 기본 7일)를 먼저 확인
+retry + logging 포함, 호출 한도 초과(429) 시 AIMD로 호출 속도 자동 조절
+호출 속도 상태는 키별로 api_rate_state.db에 공유 → 동시에 실행 중인 스크립트끼리 예산 공유
+config의 NAVER_SEARCHAD_KEYS로 계정을 추가하면 요청을 계정마다 나눠 보냄 (계정별 버킷·일일 사용량)
 """
 
 import hashlib
 import hmac
 import base64
 import logging
+import re
+import threading
 import time
 from typing import Callable, TypeVar
 
 import requests
 
+from core import deadline
+from core.circuit_breaker import breaker
+from core.http_pool import get_session
+from core.key_pool import KeyPool, normalize_keys
+from core.rate_limit import AimdController, SharedTokenBucket, parse_retry_after
+from core.singleflight import SingleFlight
+from core.volume_cache import VolumeCache
+from core.volume_store import get_volume_entries, normalize_keyword
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.searchad.naver.com"
 KEYWORDSTOOL_URI = "/keywordstool"
+SESSION_NAME = "naver_searchad"
+MAX_HINT_KEYWORDS = 5  # keywordstool hintKeywords 최대 개수
 MAX_RETRIES = 3
 RETRY_DELAY_SEC = 2
+REQUEST_TIMEOUT_SEC = 15  # 실행 마감(core.deadline)이 더 가까우면 남은 시간까지만
+# keywordstool 호출 속도 (기존 0.25초 간격 = 초당 4회에서 시작, 성공 시 가속·429 시 감속)
+RATE_PER_SEC = 4.0
+BURST = 2
+MIN_RATE_PER_SEC = 0.5
+MAX_RATE_PER_SEC = 10.0
+
+
+def _load_cache_ttl() -> float:
+    """config.py의 NAVER_VOLUME_TTL_DAYS (월간 검색량은 하루 단위로 거의 변하지 않음, 기본 7일)"""
+    try:
+        from config import NAVER_VOLUME_TTL_DAYS
+        return float(NAVER_VOLUME_TTL_DAYS)
+    except (ImportError, TypeError, ValueError):
+        return 7.0
+
+
+def _load_key_config() -> tuple[list, int]:
+    """config.py의 NAVER_SEARCHAD_KEYS(추가 계정 [(customer_id, license, secret), ...]) / NAVER_SEARCHAD_DAILY_QUOTA(0 = 무제한)"""
+    try:
+        from config import NAVER_SEARCHAD_KEYS, NAVER_SEARCHAD_DAILY_QUOTA
+        return list(NAVER_SEARCHAD_KEYS or []), int(NAVER_SEARCHAD_DAILY_QUOTA or 0)
+    except (ImportError, TypeError, ValueError):
+        return [], 0
+
+
+EXTRA_KEYS, DAILY_QUOTA = _load_key_config()
+
+# 모든 검색량 조회가 거치는 공용 캐시 (대시보드·도매 검색·runner·CSV 스크립트 공통)
+_cache = VolumeCache(ttl_days=_load_cache_ttl())
+# 동시에 들어온 같은 keywordstool 조회 병합
+_flight = SingleFlight("keywordstool")
+# 응답 시간 p95를 넘긴 호출은 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+_latency = deadline.tracker("keywordstool")
+# 403(키 차단·미승인)·서버 오류가 이어지면 남은 조회는 재시도·대기 없이 바로 실패 처리
+_circuit = breaker("keywordstool")
+
+_throttles: dict[str, AimdController] = {}
+_pools: dict[tuple, KeyPool] = {}
+_throttles_lock = threading.Lock()
+
+
+def _get_throttle(customer_id: str, license_key: str) -> AimdController:
+    """API 키별 공유 속도 제어기 (상태 DB에는 키 해시만 저장)"""
+    kid = hashlib.sha256(f"{customer_id}:{license_key}".encode("utf-8")).hexdigest()[:10]
+    with _throttles_lock:
+        throttle = _throttles.get(kid)
+        if throttle is None:
+            bucket = SharedTokenBucket(f"naver_searchad:{kid}", RATE_PER_SEC, BURST)
+            throttle = AimdController(
+                bucket.name, bucket, MIN_RATE_PER_SEC, MAX_RATE_PER_SEC, increase=0.1, state_db=None
+            )
+            _throttles[kid] = throttle
+        return throttle
+
+
+def _get_pool(customer_id: str, license_key: str, secret_key: str) -> KeyPool:
+    """호출부가 넘긴 계정 + config의 추가 계정으로 구성한 키 풀"""
+    keys = tuple(normalize_keys([(customer_id, license_key, secret_key)] + EXTRA_KEYS))
+    with _throttles_lock:
+        pool = _pools.get(keys)
+        if pool is None:
+            pool = _pools[keys] = KeyPool("naver_searchad", list(keys), DAILY_QUOTA)
+        return pool
 
 
 def _get_secret_bytes(secret_key: str) -> bytes:
@@ -77,79 +157,251 @@ def _parse_monthly_count(val: str | int | None) -> int:
         return 0
 
 
-def get_monthly_search_volume(
-    keyword: str,
+def _row_total(item: dict) -> int:
+    """keywordList 행의 PC + 모바일 월간 검색량"""
+    return _parse_monthly_count(item.get("monthlyPcQcCnt")) + _parse_monthly_count(item.get("monthlyMobileQcCnt"))
+
+
+def _harvest(keyword_list: list[dict], hint_label: str) -> dict[str, float]:
+    """
+    응답의 keywordList 전체(연관 키워드 포함)를 검색량 저장소에 기록.
+    {정규화 키워드: 합산 검색량} 반환 → 같은 실행 안에서도 바로 재사용.
+    """
+    rows = []
+    harvested: dict[str, float] = {}
+    for item in keyword_list:
+        rel = (item.get("relKeyword") or "").strip()
+        if not rel:
+            continue
+        pc = _parse_monthly_count(item.get("monthlyPcQcCnt"))
+        mo = _parse_monthly_count(item.get("monthlyMobileQcCnt"))
+        rows.append({"keyword": rel, "pc_volume": pc, "mobile_volume": mo, "comp_idx": item.get("compIdx")})
+        harvested.setdefault(normalize_keyword(rel), float(pc + mo))
+    _cache.save_rows(rows, hint_label)
+    return harvested
+
+
+def _keywordstool_params(hint_keywords: list[str]) -> dict:
+    """hintKeywords는 공백·쉼표 제거 후 쉼표로 연결 (최대 MAX_HINT_KEYWORDS개)"""
+    hints = [re.sub(r"[\s,]+", "", kw) for kw in hint_keywords][:MAX_HINT_KEYWORDS]
+    return {"hintKeywords": ",".join(hints), "showDetail": 1}
+
+
+def _request_keywordstool(
+    hint_keywords: list[str],
     customer_id: str,
     license_key: str,
     secret_key: str,
-) -> float | None:
+) -> list[dict] | None:
     """
-    네이버 검색광고 keywordstool API로 해당 키워드의 월간 검색량 조회.
-    PC + 모바일 합산 반환. 실패 시 None.
+    keywordstool 1회 조회 (hintKeywords 최대 MAX_HINT_KEYWORDS개, 쉼표 구분).
+    keywordList 반환, 재시도 후에도 실패 시 None.
+    같은 계정·같은 힌트 키워드 조회가 진행 중이면 새로 호출하지 않고 그 응답을 공유.
     """
+    key = (customer_id, tuple(normalize_keyword(h) for h in hint_keywords))
+    return _flight.do(key, lambda: _fetch_keywordstool(hint_keywords, customer_id, license_key, secret_key))
+
+
+def _fetch_keywordstool(
+    hint_keywords: list[str],
+    customer_id: str,
+    license_key: str,
+    secret_key: str,
+) -> list[dict] | None:
+    """keywordstool 호출 본체 (속도 제어·재시도)"""
     uri = KEYWORDSTOOL_URI
-    params = {"hintKeywords": keyword, "showDetail": 1}
+    params = _keywordstool_params(hint_keywords)
+    label = params["hintKeywords"]
+    pool = _get_pool(customer_id, license_key, secret_key)
 
-    for attempt in range(1, MAX_RETRIES + 1):
+    # 한도 초과 시 다른 계정으로 전환할 수 있도록 키 수만큼 시도 횟수 추가
+    for attempt in range(1, MAX_RETRIES + len(pool)):
+        if deadline.expired():
+            logger.warning("실행 마감 시각 초과 → keywordstool 조회 중단: %s", label)
+            return None
+        if not _circuit.allow():
+            logger.debug("keywordstool 차단 회로 열림 → 요청 생략: %s", label)
+            return None
+        key = pool.pick()
+        if key is None:
+            logger.warning("사용 가능한 검색광고 API 키 없음 (모든 키 일일 한도 소진): %s", label)
+            return None
+        throttle = _get_throttle(key[0], key[1])
         try:
-            headers = _get_headers(
-                "GET", uri, customer_id, license_key, secret_key
-            )
-            resp = requests.get(
-                BASE_URL + uri,
-                params=params,
-                headers=headers,
-                timeout=15,
+            throttle.acquire()
+            # 헤지 요청은 남은 토큰·일일 한도 안에서만 (서명 타임스탬프는 요청마다 새로)
+            resp = deadline.hedged(
+                lambda: get_session(SESSION_NAME).get(
+                    BASE_URL + uri,
+                    params=params,
+                    headers=_get_headers("GET", uri, *key),
+                    timeout=deadline.timeout_for(REQUEST_TIMEOUT_SEC),
+                ),
+                _latency,
+                lambda: throttle.try_acquire() and pool.charge(key),
             )
+            if resp.status_code == 429:
+                # 한도 초과: 고정 대기 대신 속도를 낮추고 Retry-After만큼 버킷 정지 → 다음 acquire에서 대기
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                throttle.on_throttle(retry_after)
+                pool.cooldown(key, retry_after)
+                logger.warning(
+                    "네이버 검색광고 API 호출 한도 초과 (시도 %d/%d): %s → %.2f회/초",
+                    attempt, MAX_RETRIES, label, throttle.rate,
+                )
+                continue
             resp.raise_for_status()
             data = resp.json()
-            keyword_list = data.get("keywordList") or []
-            # 정확히 일치하는 키워드 또는 첫 번째 결과 사용
-            for item in keyword_list:
-                rel = (item.get("relKeyword") or "").strip()
-                if rel == keyword:
-                    pc = _parse_monthly_count(item.get("monthlyPcQcCnt"))
-                    mo = _parse_monthly_count(item.get("monthlyMobileQcCnt"))
-                    total = pc + mo
-                    logger.debug("키워드 '%s' 월간 검색량: PC=%s, 모바일=%s → %s", keyword, pc, mo, total)
-                    return float(total)
-            # 일치 없으면 첫 번째 관련 키워드 합산값 사용 (대안)
-            if keyword_list:
-                item = keyword_list[0]
-                pc = _parse_monthly_count(item.get("monthlyPcQcCnt"))
-                mo = _parse_monthly_count(item.get("monthlyMobileQcCnt"))
-                total = pc + mo
-                logger.debug("키워드 '%s' 관련어 검색량 사용: %s", keyword, total)
-                return float(total)
-            return 0.0
+            throttle.on_success()
+            _circuit.record_success()
+            return data.get("keywordList") or []
         except requests.exceptions.HTTPError as e:
-            if e.response is not None and e.response.status_code == 403:
+            status = e.response.status_code if e.response is not None else 0
+            if status == 403:
                 logger.warning("API 확인 필요 (403 Forbidden): config.py API 키·승인 확인")
             else:
                 logger.warning(
                     "네이버 검색광고 API 요청 실패 (시도 %d/%d): %s - %s",
-                    attempt, MAX_RETRIES, keyword, e,
+                    attempt, MAX_RETRIES, label, e,
                 )
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY_SEC)
+            if status in (401, 403) or status >= 500:
+                _circuit.record_failure(f"HTTP {status}")
+            if attempt < MAX_RETRIES and not _circuit.is_open:
+                deadline.sleep(RETRY_DELAY_SEC)
             else:
                 return None  # 프로그램 중단 없이 None 반환
         except requests.exceptions.RequestException as e:
             logger.warning("API 확인 필요 (요청 실패): %s", e)
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY_SEC)
+            _circuit.record_failure(type(e).__name__)
+            if attempt < MAX_RETRIES and not _circuit.is_open:
+                deadline.sleep(RETRY_DELAY_SEC)
             else:
                 return None
         except (KeyError, TypeError, ValueError) as e:
             logger.warning("API 확인 필요 (파싱 오류): %s", e)
             if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY_SEC)
+                deadline.sleep(RETRY_DELAY_SEC)
             else:
                 return None
 
     return None
 
 
+def _single_volume(keyword: str, keyword_list: list[dict]) -> float:
+    """단건 조회 응답에서 검색량 선택: 정확히 일치하는 키워드, 없으면 첫 번째 결과"""
+    harvested = _harvest(keyword_list, keyword)
+    target = normalize_keyword(keyword)
+    if target in harvested:
+        logger.debug("키워드 '%s' 월간 검색량: %s", keyword, harvested[target])
+        return harvested[target]
+    # 일치 없으면 첫 번째 관련 키워드 합산값 사용 (대안, 저장소에는 해당 키워드로 기록하지 않음)
+    if keyword_list:
+        total = _row_total(keyword_list[0])
+        logger.debug("키워드 '%s' 관련어 검색량 사용: %s", keyword, total)
+        _cache.put(keyword, total)
+        return float(total)
+    return 0.0
+
+
+def get_monthly_search_volume(
+    keyword: str,
+    customer_id: str,
+    license_key: str,
+    secret_key: str,
+) -> float | None:
+    """
+    네이버 검색광고 keywordstool API로 해당 키워드의 월간 검색량 조회.
+    PC + 모바일 합산 반환. 실패 시 None.
+    캐시에 TTL 이내 값이 있으면 API를 호출하지 않음.
+    """
+    cached = _cache.get(keyword)
+    if cached is not None:
+        return cached
+    keyword_list = _request_keywordstool([keyword], customer_id, license_key, secret_key)
+    if keyword_list is None:
+        return None
+    return _single_volume(keyword, keyword_list)
+
+
+def get_monthly_search_volumes(
+    keywords: list[str],
+    customer_id: str,
+    license_key: str,
+    secret_key: str,
+) -> dict[str, float | None]:
+    """
+    여러 키워드의 월간 검색량 일괄 조회. {입력 키워드: PC+모바일 합산 또는 None(실패)}.
+    1) 캐시(메모리 → 저장소)에 있는 키워드는 API 없이 사용
+    2) 나머지를 hintKeywords 최대 MAX_HINT_KEYWORDS개씩 묶어 호출, 응답의 relKeyword를 입력 키워드에 매핑
+    3) 앞 응답의 연관 키워드로 이미 받은 키워드는 다음 묶음에서 제외
+    묶음 응답에 정확히 일치하는 행이 없는 키워드만 단건 조회(기존 대안 규칙)로 보완.
+    """
+    unique = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    result: dict[str, float | None] = dict(_cache.get_many(unique))
+    pending = [kw for kw in unique if kw not in result]
+    from_store = len(result)
+    harvested: dict[str, float] = {}
+    api_calls = 0
+    reused = 0
+
+    while pending:
+        batch = []
+        while pending and len(batch) < MAX_HINT_KEYWORDS:
+            kw = pending.pop(0)
+            norm = normalize_keyword(kw)
+            if norm in harvested:
+                result[kw] = harvested[norm]
+                reused += 1
+            else:
+                batch.append(kw)
+        if not batch:
+            break
+        keyword_list = _request_keywordstool(batch, customer_id, license_key, secret_key)
+        api_calls += 1
+        if keyword_list is None:
+            for kw in batch:
+                result[kw] = None
+            continue
+        harvested.update(_harvest(keyword_list, ",".join(batch)))
+        for kw in batch:
+            norm = normalize_keyword(kw)
+            if norm in harvested:
+                result[kw] = harvested[norm]
+            else:
+                result[kw] = get_monthly_search_volume(kw, customer_id, license_key, secret_key)
+
+    logger.info(
+        "검색량 %d개: 캐시 %d건, 연관어 재사용 %d건, keywordstool 묶음 호출 %d회",
+        len(unique), from_store, reused, api_calls,
+    )
+    return result
+
+
+def pending_keywords(keywords: list[str]) -> list[str]:
+    """
+    캐시 저장소에 TTL 이내 검색량이 없어 keywordstool 호출이 필요한 키워드 (호출 예산 계획용, API 호출 없음).
+    캐시 통계를 건드리지 않도록 저장소만 조회 (메모리 캐시는 저장소의 부분집합).
+    """
+    unique = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    stored = get_volume_entries(unique, _cache.ttl_days, _cache.db_path)
+    return [kw for kw in unique if kw not in stored]
+
+
+def circuit_open() -> bool:
+    """keywordstool 차단 회로가 열려 있는지 (호출부가 실패 원인을 구분해 나중에 재시도하도록)"""
+    return _circuit.is_open
+
+
+def get_cache_stats() -> dict:
+    """검색량 캐시 통계 (조회·메모리 적중·디스크 적중·미스·적중률)"""
+    return _cache.stats()
+
+
+def cache_report() -> str:
+    """검색량 캐시 통계 한 줄 요약 (스크립트 종료 시 출력용)"""
+    return _cache.report()
+
+
 T = TypeVar("T")
 
 
@@ -4,14 +4,10 @@ naver_api_keys.py에서 키를 불러와 네이버 검색광고 API로 최근 30
 """
 
 import csv
-import time
 from pathlib import Path
 
 from naver_api_keys import CUSTOMER_ID, ACCESS_LICENSE, SECRET_KEY
-from naver_api import get_monthly_search_volume
-
-# 초당 호출 제한 준수 (초당 약 5회 → 0.25초 간격)
-API_CALL_INTERVAL = 0.25
+from naver_api import cache_report, get_monthly_search_volume, get_monthly_search_volumes
 
 INPUT_CSV = Path(__file__).resolve().parent / "niche_test.csv"
 OUTPUT_CSV = Path(__file__).resolve().parent / "niche_with_volume.csv"
@@ -47,20 +43,23 @@ def run():
             rows.append(row)
 
     total = len(rows)
-    print(f"총 {total}개 키워드 검색량 조회 시작 (호출 간격 {API_CALL_INTERVAL}초)")
+    print(f"총 {total}개 키워드 검색량 조회 시작 (5개씩 묶음 조회)")
 
+    volumes = get_monthly_search_volumes(
+        [(row.get("keyword") or "").strip() for row in rows],
+        customer_id=CUSTOMER_ID,
+        license_key=ACCESS_LICENSE,
+        secret_key=SECRET_KEY,
+    )
     for i, row in enumerate(rows):
         kw = (row.get("keyword") or "").strip()
         if not kw:
             row["search_volume"] = 0
             continue
 
-        vol = fetch_search_volume(kw)
-        row["search_volume"] = vol if vol is not None else 0
-        print(f"[{i + 1}/{total}] {kw} → {vol if vol is not None else '실패'}")
-
-        if i < total - 1:
-            time.sleep(API_CALL_INTERVAL)
+        vol = volumes.get(kw)
+        row["search_volume"] = int(vol) if vol is not None else 0
+        print(f"[{i + 1}/{total}] {kw} → {row['search_volume'] if vol is not None else '실패'}")
 
     # 검색량은 많은데 로켓배송은 적은 순 정렬
     def sort_key(r):
@@ -81,6 +80,7 @@ def run():
         writer.writerows(rows)
 
     print(f"저장 완료: {OUTPUT_CSV} (검색량↑ 로켓↓ 순 정렬)")
+    print(cache_report())
 
 
 if __name__ == "__main__":
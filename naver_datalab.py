@@ -0,0 +1,423 @@
+"""
+naver_datalab.py - 네이버 데이터랩 검색어 트렌드(/v1/datalab/search) 연동
+월별 트렌드를 core.trend_store에 (키워드, 월) 단위로 쌓고, 아직 받지 않은 달만 요청 (증분 조회).
+- 지난 달까지는 한 번 받으면 재요청 없음, 진행 중인 이번 달만 CURRENT_MONTH_TTL_HOURS마다 갱신
+- ratio는 요청마다 상대값 → 모든 요청에 기준(앵커) 키워드를 함께 넣고,
+  앵커의 저장 시계열 대비 비율로 같은 요청의 키워드를 환산 (공통 배율, 키워드끼리 비교 가능)
+- 기본 반환은 요청 구간의 최고점 = 100으로 재정규화 → API 응답(단일 키워드 요청)과 같은 형태
+- config의 NAVER_DATALAB_KEYS로 애플리케이션 키를 추가하면 요청을 키마다 나눠 보냄 (키별 일일 한도 관리)
+seasonal_analyzer / market_credibility_report / dashboard_helpers 공용.
+"""
+
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+
+from core import deadline, trend_store
+from core.circuit_breaker import breaker
+from core.database import DB_PATH
+from core.http_pool import get_session
+from core.key_pool import KeyPool, normalize_keys
+from core.rate_limit import AimdController, SharedTokenBucket, parse_retry_after
+from core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://openapi.naver.com/v1/datalab/search"
+SESSION_NAME = "naver_datalab"
+KEYWORDS_PER_REQUEST = 5  # keywordGroups 최대 개수 (앵커 1 + 키워드 4)
+MIN_MONTH = "2016-01"  # 데이터랩 조회 가능 시작
+CURRENT_MONTH_TTL_HOURS = 24  # 진행 중인 달(부분 집계) 재조회 주기
+MAX_RETRIES = 3
+RETRY_DELAY_SEC = 2
+REQUEST_TIMEOUT_SEC = 30  # 실행 마감(core.deadline)이 더 가까우면 남은 시간까지만
+# 호출 속도 (기존 요청 간 1초 대기 = 초당 1회에서 시작, 429 시 감속)
+RATE_PER_SEC = 1.0
+BURST = 1
+MIN_RATE_PER_SEC = 0.2
+MAX_RATE_PER_SEC = 3.0
+
+
+def _load_anchor() -> str:
+    """config.py의 NAVER_DATALAB_ANCHOR (검색량이 꾸준한 중간 규모 키워드가 적합, 바꾸면 저장 트렌드를 새로 받음)"""
+    try:
+        from config import NAVER_DATALAB_ANCHOR
+        return (NAVER_DATALAB_ANCHOR or "").strip() or "물티슈"
+    except ImportError:
+        return "물티슈"
+
+
+def _load_key_config() -> tuple[list, int]:
+    """config.py의 NAVER_DATALAB_KEYS(추가 애플리케이션 [(client_id, client_secret), ...]) / NAVER_DATALAB_DAILY_QUOTA"""
+    try:
+        from config import NAVER_DATALAB_KEYS, NAVER_DATALAB_DAILY_QUOTA
+        return list(NAVER_DATALAB_KEYS or []), int(NAVER_DATALAB_DAILY_QUOTA or 0)
+    except (ImportError, TypeError, ValueError):
+        return [], 1000  # 데이터랩 검색어 트렌드 기본 한도: 애플리케이션당 하루 1,000회
+
+
+ANCHOR_KEYWORD = _load_anchor()
+EXTRA_KEYS, DAILY_QUOTA = _load_key_config()
+
+_throttles: dict[str, AimdController] = {}
+_pools: dict[tuple, KeyPool] = {}
+_throttles_lock = threading.Lock()
+
+# 동시에 들어온 같은 트렌드 조회 병합 (대시보드 상세·파이프라인이 같은 키워드를 조회할 때)
+_flight = SingleFlight("datalab")
+# 응답 시간 p95를 넘긴 요청은 한 번 더 보내 먼저 온 응답 사용
+_latency = deadline.tracker("datalab")
+# 인증 실패·서버 오류가 이어지면 남은 요청은 재시도 없이 바로 실패 처리
+_circuit = breaker("datalab")
+
+
+def _get_throttle(client_id: str) -> AimdController:
+    """Client ID별 공유 속도 제어기 (상태 DB에는 키 해시만 저장)"""
+    kid = hashlib.sha256((client_id or "").encode("utf-8")).hexdigest()[:10]
+    with _throttles_lock:
+        throttle = _throttles.get(kid)
+        if throttle is None:
+            bucket = SharedTokenBucket(f"naver_datalab:{kid}", RATE_PER_SEC, BURST)
+            throttle = AimdController(bucket.name, bucket, MIN_RATE_PER_SEC, MAX_RATE_PER_SEC, state_db=None)
+            _throttles[kid] = throttle
+        return throttle
+
+
+def _get_pool(client_id: str, client_secret: str) -> KeyPool:
+    """호출부가 넘긴 애플리케이션 키 + config의 추가 키로 구성한 키 풀"""
+    keys = tuple(normalize_keys([(client_id, client_secret)] + EXTRA_KEYS))
+    with _throttles_lock:
+        pool = _pools.get(keys)
+        if pool is None:
+            pool = _pools[keys] = KeyPool("naver_datalab", list(keys), DAILY_QUOTA)
+        return pool
+
+
+def shift_month(month: str, delta: int) -> str:
+    """'YYYY-MM'에서 delta개월 이동"""
+    y, m = int(month[:4]), int(month[5:7])
+    idx = y * 12 + (m - 1) + delta
+    return f"{idx // 12:04d}-{idx % 12 + 1:02d}"
+
+
+def month_range(start_month: str, end_month: str) -> list[str]:
+    """start_month~end_month ('YYYY-MM') 월 목록"""
+    months = []
+    m = start_month
+    while m <= end_month:
+        months.append(m)
+        m = shift_month(m, 1)
+    return months
+
+
+def months_ago(n: int, now: datetime | None = None) -> str:
+    """이번 달 기준 n개월 전 'YYYY-MM' (n=12 → 작년 같은 달)"""
+    return shift_month((now or datetime.now()).strftime("%Y-%m"), -n)
+
+
+def _request_body(keywords: list[str], start_month: str) -> dict:
+    """데이터랩 요청 본문 (월 단위, start_month 1일 ~ 오늘)"""
+    return {
+        "startDate": f"{max(start_month, MIN_MONTH)}-01",
+        "endDate": datetime.now().strftime("%Y-%m-%d"),
+        "timeUnit": "month",
+        "keywordGroups": [{"groupName": kw, "keywords": [kw]} for kw in keywords[:KEYWORDS_PER_REQUEST]],
+    }
+
+
+def _request_headers(client_id: str, client_secret: str) -> dict:
+    return {
+        "X-Naver-Client-Id": client_id,
+        "X-Naver-Client-Secret": client_secret,
+        "Content-Type": "application/json",
+    }
+
+
+def _parse_results(data: dict) -> dict[str, dict[str, float]]:
+    """응답 results → {키워드: {"YYYY-MM": ratio}}"""
+    result: dict[str, dict[str, float]] = {}
+    for res in data.get("results", []):
+        result[res.get("title", "")] = {
+            (d.get("period") or "")[:7]: float(d.get("ratio", 0) or 0)
+            for d in res.get("data", [])
+            if d.get("period")
+        }
+    return result
+
+
+def _is_quota_exceeded(text: str) -> bool:
+    """429 응답이 일일 호출 한도 소진(errorCode 010)인지 (초당 제한과 구분)"""
+    return '"010"' in (text or "")
+
+
+def _request_trend(
+    keywords: list[str],
+    start_month: str,
+    client_id: str,
+    client_secret: str,
+) -> dict[str, dict[str, float]] | None:
+    """
+    /v1/datalab/search 1회 조회 (keywordGroups 최대 KEYWORDS_PER_REQUEST개, 월 단위, 오늘까지).
+    {키워드: {"YYYY-MM": ratio}} 반환 (ratio는 이 요청 안에서의 상대값). 재시도 후에도 실패 시 None.
+    """
+    body = _request_body(keywords, start_month)
+    label = ",".join(keywords[:KEYWORDS_PER_REQUEST])
+    pool = _get_pool(client_id, client_secret)
+
+    # 한도 초과 시 다른 애플리케이션 키로 전환할 수 있도록 키 수만큼 시도 횟수 추가
+    for attempt in range(1, MAX_RETRIES + len(pool)):
+        if deadline.expired():
+            logger.warning("실행 마감 시각 초과 → 데이터랩 조회 중단: %s", label)
+            return None
+        if not _circuit.allow():
+            logger.debug("데이터랩 차단 회로 열림 → 요청 생략: %s", label)
+            return None
+        key = pool.pick()
+        if key is None:
+            logger.warning("사용 가능한 데이터랩 API 키 없음 (모든 키 일일 한도 소진): %s", label)
+            return None
+        throttle = _get_throttle(key[0])
+        try:
+            throttle.acquire()
+            resp = deadline.hedged(
+                lambda: get_session(SESSION_NAME).post(
+                    API_URL, headers=_request_headers(*key), json=body,
+                    timeout=deadline.timeout_for(REQUEST_TIMEOUT_SEC),
+                ),
+                _latency,
+                lambda: throttle.try_acquire() and pool.charge(key),
+            )
+            if resp.status_code == 429:
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if _is_quota_exceeded(resp.text):
+                    pool.mark_exhausted(key)
+                    continue
+                throttle.on_throttle(retry_after)
+                pool.cooldown(key, retry_after)
+                logger.warning(
+                    "데이터랩 API 호출 한도 초과 (시도 %d/%d): %s → %.2f회/초",
+                    attempt, MAX_RETRIES, label, throttle.rate,
+                )
+                continue
+            resp.raise_for_status()
+            data = resp.json()
+            throttle.on_success()
+            _circuit.record_success()
+            return _parse_results(data)
+        except requests.exceptions.RequestException as e:
+            logger.warning("데이터랩 API 요청 실패 (시도 %d/%d): %s - %s", attempt, MAX_RETRIES, label, e)
+            status = e.response.status_code if getattr(e, "response", None) is not None else 0
+            if not status or status in (401, 403) or status >= 500:
+                _circuit.record_failure(f"HTTP {status}" if status else type(e).__name__)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("데이터랩 API 응답 파싱 오류: %s", e)
+        if attempt < MAX_RETRIES and not _circuit.is_open:
+            deadline.sleep(RETRY_DELAY_SEC)
+    return None
+
+
+def _missing_months(
+    stored: dict[str, tuple[float, datetime]], months: list[str], current_month: str, now: datetime
+) -> list[str]:
+    """저장소에 없는 달 (이번 달은 CURRENT_MONTH_TTL_HOURS 지나면 다시 받아야 함)"""
+    missing = []
+    for m in months:
+        entry = stored.get(m)
+        if entry is None:
+            missing.append(m)
+        elif m >= current_month and now - entry[1] > timedelta(hours=CURRENT_MONTH_TTL_HOURS):
+            missing.append(m)
+    return missing
+
+
+def _rescale_factor(stored: dict[str, tuple[float, datetime]], fresh: dict[str, float], current_month: str) -> float | None:
+    """
+    응답을 저장 배율로 맞추는 계수 = 겹치는 지난 달들의 (저장값 합 / 새 값 합).
+    겹치는 달이 없거나 모두 0이면 None.
+    """
+    old_sum = new_sum = 0.0
+    for m, ratio in fresh.items():
+        if m < current_month and m in stored:
+            old_sum += stored[m][0]
+            new_sum += ratio
+    if old_sum <= 0 or new_sum <= 0:
+        return None
+    return old_sum / new_sum
+
+
+def _to_data(series: dict[str, float], months: list[str], normalize: bool = True) -> list[dict]:
+    """API 응답 data 형식 [{"period", "ratio"}]으로 변환 (normalize=True면 구간 최고점 = 100)"""
+    scale = 1.0
+    if normalize:
+        peak = max((series.get(m, 0.0) for m in months), default=0.0)
+        scale = 100.0 / peak if peak > 0 else 0.0
+    return [{"period": f"{m}-01", "ratio": round(series.get(m, 0.0) * scale, 5)} for m in months]
+
+
+class TrendJob:
+    """
+    한 번의 트렌드 조회 작업: 저장소 확인 → 요청 묶음 계획 → 응답을 앵커 배율로 환산·저장 → 결과 조립.
+    요청 자체는 호출부가 수행 (동기 get_monthly_trends / 비동기 async_api.datalab 공용).
+    """
+
+    def __init__(self, keywords: list[str], start_month: str, anchor: str | None = None, db_path: Path = DB_PATH):
+        self.anchor = anchor or ANCHOR_KEYWORD
+        self.scale_name = f"anchor:{self.anchor}"
+        self.db_path = db_path
+        self.now = datetime.now()
+        self.current_month = self.now.strftime("%Y-%m")
+        self.months = month_range(max(start_month, MIN_MONTH), self.current_month)
+        self.keywords = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+        self.stored = trend_store.load_series(
+            self.keywords + [self.anchor], MIN_MONTH, self.current_month, self.scale_name, db_path
+        )
+        self.failed: set[str] = set()
+        self.batches = self._plan()
+
+    def _plan(self) -> list[list[tuple[str, str]]]:
+        """(첫 누락 달, 키워드) 묶음 목록. 앵커 자신은 모든 요청에 포함되므로 따로 계획하지 않음."""
+        plan: list[tuple[str, str]] = []
+        for kw in self.keywords:
+            if kw == self.anchor:
+                continue
+            missing = _missing_months(self.stored[kw], self.months, self.current_month, self.now)
+            if missing:
+                plan.append((missing[0], kw))
+        plan.sort()
+        self.planned = len(plan)
+        batch_size = KEYWORDS_PER_REQUEST - 1
+        batches = [plan[i : i + batch_size] for i in range(0, len(plan), batch_size)]
+        if not batches and self.anchor in self.keywords:
+            anchor_missing = _missing_months(self.stored[self.anchor], self.months, self.current_month, self.now)
+            if anchor_missing:
+                batches = [[(anchor_missing[0], self.anchor)]]
+        return batches
+
+    @property
+    def anchor_seeded(self) -> bool:
+        """앵커 기준 시계열이 이미 저장돼 있는지 (없으면 첫 묶음이 기준을 정하므로 먼저 단독 처리)"""
+        return any(m < self.current_month for m in self.stored[self.anchor])
+
+    def request_for(self, chunk: list[tuple[str, str]]) -> tuple[list[str], str]:
+        """묶음의 요청 (키워드 + 앵커, 시작 달)"""
+        batch = [kw for _, kw in chunk if kw != self.anchor]
+        batch_from = chunk[0][0]  # 정렬돼 있으므로 가장 이른 달
+        anchor_months = sorted(m for m in self.stored[self.anchor] if m < self.current_month)
+        if anchor_months:
+            # 앵커 저장 구간과 최소 한 달은 겹쳐야 배율을 이을 수 있음
+            batch_from = min(batch_from, anchor_months[-1])
+        return batch + [self.anchor], batch_from
+
+    def apply(self, request: tuple[list[str], str], fetched: dict[str, dict[str, float]] | None) -> None:
+        """request_for()로 만든 요청의 응답을 앵커 배율로 환산해 저장 (fetched=None이면 실패 처리)"""
+        request_keywords, batch_from = request
+        batch = request_keywords[:-1]
+        anchor = self.anchor
+        if fetched is None:
+            self.failed.update(batch)
+            return
+        fetch_months = month_range(batch_from, self.current_month)
+        anchor_fresh = {m: fetched.get(anchor, {}).get(m, 0.0) for m in fetch_months}
+        if self.anchor_seeded:
+            factor = _rescale_factor(self.stored[anchor], anchor_fresh, self.current_month)
+        else:
+            # 앵커 첫 수집: 이 구간 최고점 = 100을 공통 배율로 고정
+            peak = max(anchor_fresh.values(), default=0.0)
+            factor = 100.0 / peak if peak > 0 else None
+        if factor is None:
+            logger.warning("데이터랩 앵커 '%s' 값이 0이라 배율 환산 불가: %s (더 큰 앵커 키워드 권장)", anchor, ",".join(batch))
+            self.failed.update(batch)
+            return
+
+        # 앵커: 이미 정한 지난 달 값은 고정, 새 달과 이번 달만 추가
+        new_series = {anchor: {
+            m: v * factor for m, v in anchor_fresh.items()
+            if m not in self.stored[anchor] or m >= self.current_month
+        }}
+        for kw in batch:
+            new_series[kw] = {m: fetched.get(kw, {}).get(m, 0.0) * factor for m in fetch_months}  # 응답에 없는 달 = 0
+        trend_store.save_series(new_series, self.scale_name, self.db_path)
+        for kw, series in new_series.items():
+            for m, v in series.items():
+                self.stored[kw][m] = (v, self.now)
+
+    def result(self, normalize: bool = True) -> dict[str, list[dict]]:
+        if self.batches:
+            logger.info(
+                "데이터랩 트렌드 %d개: 저장소 %d개, 데이터랩 요청 %d회 (앵커 '%s')",
+                len(self.keywords), len(self.keywords) - self.planned, len(self.batches), self.anchor,
+            )
+        result: dict[str, list[dict]] = {}
+        for kw in self.keywords:
+            series = {m: v for m, (v, _) in self.stored[kw].items()}
+            if kw in self.failed and any(m not in series for m in self.months if m < self.current_month):
+                continue
+            if not series:
+                continue
+            result[kw] = _to_data(series, self.months, normalize)
+        return result
+
+
+def pending_keywords(
+    keywords: list[str], start_month: str, anchor: str | None = None, db_path: Path = DB_PATH
+) -> list[str]:
+    """저장소에 없는 달이 있어 데이터랩 요청이 필요한 키워드 (호출 예산 계획용, API 호출 없음)"""
+    job = TrendJob(keywords, start_month, anchor, db_path)
+    return [kw for chunk in job.batches for _, kw in chunk]
+
+
+def get_monthly_trends(
+    keywords: list[str],
+    start_month: str,
+    client_id: str,
+    client_secret: str,
+    normalize: bool = True,
+    anchor: str | None = None,
+    db_path: Path = DB_PATH,
+) -> dict[str, list[dict]]:
+    """
+    키워드별 start_month('YYYY-MM')~이번 달 월별 트렌드.
+    {키워드: [{"period": "YYYY-MM-01", "ratio": ...}, ...]}
+    - normalize=True: 키워드별 구간 최고점 100 (기존 단일 요청 응답과 같은 형태)
+    - normalize=False: 앵커 배율 값 (앵커 첫 수집 구간 최고점 = 100) → 키워드끼리 크기 비교 가능
+    저장소에 없는 달만 데이터랩에 요청 (앵커 + 키워드 4개씩 묶음). 수집 실패한 키워드는 결과에서 제외.
+    같은 조건의 조회가 다른 스레드에서 진행 중이면 새로 요청하지 않고 그 결과를 공유 (수정 금지).
+    """
+    key = (
+        client_id, tuple(dict.fromkeys(k.strip() for k in keywords if k and k.strip())),
+        start_month, normalize, anchor or ANCHOR_KEYWORD, str(db_path),
+    )
+    return _flight.do(
+        key, lambda: _fetch_monthly_trends(keywords, start_month, client_id, client_secret, normalize, anchor, db_path)
+    )
+
+
+def _fetch_monthly_trends(
+    keywords: list[str],
+    start_month: str,
+    client_id: str,
+    client_secret: str,
+    normalize: bool,
+    anchor: str | None,
+    db_path: Path,
+) -> dict[str, list[dict]]:
+    """get_monthly_trends 본체 (저장소 확인 → 누락 달 요청 → 결과 조립)"""
+    job = TrendJob(keywords, start_month, anchor, db_path)
+    for chunk in job.batches:
+        request = job.request_for(chunk)
+        job.apply(request, _request_trend(*request, client_id, client_secret))
+    return job.result(normalize)
+
+
+def circuit_open() -> bool:
+    """데이터랩 차단 회로가 열려 있는지"""
+    return _circuit.is_open
+
+
+def as_api_response(trends: dict[str, list[dict]]) -> dict:
+    """get_monthly_trends 결과를 /v1/datalab/search 응답 형식({"results": [{"title", "data"}]})으로"""
+    return {"results": [{"title": kw, "data": data} for kw, data in trends.items()]}
@@ -3,14 +3,10 @@ naver_search_vol.py - 네이버 검색광고 API로 키워드별 지난 30일 PC
 """
 
 import csv
-import time
 from pathlib import Path
 
 from naver_api_keys import CUSTOMER_ID, SECRET_KEY, ACCESS_LICENSE
-from naver_api import get_monthly_search_volume
-
-# API 제한: 초당 5회 내외 → 호출 간 0.25초 대기
-API_CALL_INTERVAL = 0.25
+from naver_api import cache_report, get_monthly_search_volume, get_monthly_search_volumes
 
 TRENDING_CSV = Path(__file__).resolve().parent / "trending_keywords.csv"
 OUTPUT_CSV = Path(__file__).resolve().parent / "trending_with_volume.csv"
@@ -47,20 +43,23 @@ def run_all():
             rows.append(row)
 
     total = len(rows)
-    print(f"총 {total}개 키워드 검색량 조회 시작 (API 호출 간격 {API_CALL_INTERVAL}초)")
+    print(f"총 {total}개 키워드 검색량 조회 시작 (5개씩 묶음 조회, 호출 속도는 naver_api가 제어)")
 
+    volumes = get_monthly_search_volumes(
+        [(row.get("keyword") or "").strip() for row in rows],
+        customer_id=CUSTOMER_ID,
+        license_key=ACCESS_LICENSE,
+        secret_key=SECRET_KEY,
+    )
     for i, row in enumerate(rows):
         kw = (row.get("keyword") or "").strip()
         if not kw:
             row["search_volume"] = ""
             continue
 
-        vol = get_search_volume(kw)
-        row["search_volume"] = vol if vol is not None else ""
-        print(f"[{i + 1}/{total}] {kw} → {vol if vol is not None else '실패'}")
-
-        if i < total - 1:
-            time.sleep(API_CALL_INTERVAL)
+        vol = volumes.get(kw)
+        row["search_volume"] = int(vol) if vol is not None else ""
+        print(f"[{i + 1}/{total}] {kw} → {row['search_volume'] if vol is not None else '실패'}")
 
     with open(OUTPUT_CSV, "w", encoding="utf-8-sig", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -68,6 +67,7 @@ def run_all():
         writer.writerows(rows)
 
     print(f"저장 완료: {OUTPUT_CSV}")
+    print(cache_report())
 
 
 if __name__ == "__main__":
@@ -1,24 +1,40 @@
 """
 네이버 데이터랩 쇼핑 인사이트 인기 검색어 스크래퍼 (API 방식)
 - 네이버 내부 API 직접 호출 (Playwright 불필요)
-- 핵심 카테고리 5개, 카테고리당 상위 50개 키워드 (총 250개 목표)
+- 기본: 핵심 카테고리 5개, 카테고리당 상위 50개 키워드 (총 250개 목표)
+- --all: 1차 카테고리 전체 + 2차 카테고리(수백 개 cid)까지 일괄 수집
+- 공용 세션(keep-alive)으로 카테고리·페이지를 동시에 요청, 전체 요청 속도는 하나의 토큰 버킷으로 제한
 - 중복·노이즈 제거 후, 검색량 순으로 전체 인기순 정렬하여 trending_keywords.csv 저장
 """
 
+import argparse
 import csv
-import time
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import requests
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core.http_pool import get_session
+from core.rate_limit import AimdController, SharedTokenBucket, parse_retry_after
 
 # 기본 설정
 API_URL = "https://datalab.naver.com/shoppingInsight/getCategoryKeywordRank.naver"
+CATEGORY_URL = "https://datalab.naver.com/shoppingInsight/getCategory.naver"
+SESSION_NAME = "naver_shopping_insight"
 OUTPUT_FILE = "trending_keywords.csv"
 KEYWORDS_PER_CATEGORY = 50   # 카테고리당 상위 50개 (총 250개 확보 목표)
-PAGE_SIZE = 20
-DELAY_BETWEEN_REQUESTS = 0.3  # 페이지 요청 간 대기 (속도 개선)
-DELAY_BETWEEN_CATEGORIES = 2  # 카테고리 이동 시 대기
+PAGE_SIZE = 100  # 요청 페이지 크기 (엔드포인트가 더 작게 잘라 주면 첫 응답 크기에 맞춰 페이지 계산)
+MAX_RANK = 200  # 카테고리당 조회 순위 상한
+CONCURRENCY = 8  # 동시 요청 수 (실제 요청 속도는 아래 버킷이 제한)
+# 전체 요청 속도 (기존 페이지 간 0.3초 대기 ≈ 초당 3회, 429 시 감속)
+RATE_PER_SEC = 3.0
+BURST = 3
+MIN_RATE_PER_SEC = 0.5
+MAX_RATE_PER_SEC = 6.0
+THROTTLE_RETRIES = 2  # 429 응답 시 감속 후 재시도 횟수
 
 # 사람처럼 보이게 하는 헤더
 HEADERS = {
@@ -38,6 +54,49 @@ DEFAULT_CATEGORIES = [
     ("가구/인테리어", "50000004"),
 ]
 
+# 1차 카테고리 전체 (--all: 각 카테고리의 2차 카테고리까지 확장)
+TOP_CATEGORIES = [
+    ("패션의류", "50000000"),
+    ("패션잡화", "50000001"),
+    ("화장품/미용", "50000002"),
+    ("디지털/가전", "50000003"),
+    ("가구/인테리어", "50000004"),
+    ("출산/육아", "50000005"),
+    ("식품", "50000006"),
+    ("스포츠/레저", "50000007"),
+    ("생활/건강", "50000008"),
+    ("여가/생활편의", "50000009"),
+]
+
+# 모든 카테고리·페이지 요청이 공유하는 속도 제어 (동시에 실행 중인 스크립트끼리도 공유)
+_throttle = AimdController(
+    SESSION_NAME,
+    SharedTokenBucket(SESSION_NAME, RATE_PER_SEC, BURST),
+    MIN_RATE_PER_SEC,
+    MAX_RATE_PER_SEC,
+    state_db=None,
+)
+
+
+def _post(url: str, data: dict, label: str) -> dict | None:
+    """속도 제한 안에서 공용 세션으로 POST → JSON (429는 감속 후 재시도, 실패 시 None)"""
+    for _ in range(THROTTLE_RETRIES + 1):
+        _throttle.acquire()
+        try:
+            r = get_session(SESSION_NAME, CONCURRENCY).post(url, headers=HEADERS, data=data, timeout=15)
+            if r.status_code == 429:
+                _throttle.on_throttle(parse_retry_after(r.headers.get("Retry-After")))
+                print(f"  [API 제한] {label} → {_throttle.rate:.2f}회/초로 감속")
+                continue
+            if r.status_code == 200:
+                _throttle.on_success()
+                return r.json()
+            print(f"  [API 오류] HTTP {r.status_code} ({label})")
+        except Exception as e:
+            print(f"  [API 오류] {label}: {e}")
+        return None
+    return None
+
 
 def get_date_range_1week():
     """최근 1주일 날짜 범위"""
@@ -46,8 +105,10 @@ def get_date_range_1week():
     return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
 
-def fetch_keyword_rank_page(cid: str, start_date: str, end_date: str, page: int) -> dict | None:
-    """한 페이지(20개) 키워드 순위 조회"""
+def fetch_keyword_rank_page(
+    cid: str, start_date: str, end_date: str, page: int, count: int = PAGE_SIZE
+) -> dict | None:
+    """한 페이지(count개) 키워드 순위 조회"""
     data = {
         "cid": cid,
         "timeUnit": "date",
@@ -57,24 +118,43 @@ def fetch_keyword_rank_page(cid: str, start_date: str, end_date: str, page: int)
         "gender": "",
         "device": "",
         "page": str(page),
-        "count": str(PAGE_SIZE),
+        "count": str(count),
     }
-    try:
-        r = requests.post(API_URL, headers=HEADERS, data=data, timeout=15)
-        if r.status_code == 200:
-            return r.json()
-    except Exception as e:
-        print(f"  [API 오류] {e}")
-    return None
-
-
-def extract_keywords_from_response(js: dict, category: str, page_offset: int = 0) -> list[dict]:
+    return _post(API_URL, data, f"cid={cid}, page={page}")
+
+
+def fetch_child_categories(name: str, cid: str) -> list[tuple[str, str]]:
+    """하위 카테고리 목록 [("상위>하위", cid), ...] (조회 실패 시 빈 목록)"""
+    js = _post(CATEGORY_URL, {"cid": cid}, f"하위 카테고리 cid={cid}") or {}
+    children = []
+    for child in js.get("childList") or []:
+        child_cid = str(child.get("cid") or "").strip()
+        child_name = (child.get("name") or "").strip()
+        if child_cid and child_name:
+            children.append((f"{name}>{child_name}", child_cid))
+    return children
+
+
+def expand_categories(categories: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """카테고리 + 각 카테고리의 2차 카테고리 (상위 바로 뒤에 하위, 하위 목록은 동시 조회)"""
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        children = list(pool.map(lambda c: fetch_child_categories(*c), categories))
+    expanded = []
+    for parent, kids in zip(categories, children):
+        expanded.append(parent)
+        expanded.extend(kids)
+    return expanded
+
+
+def extract_keywords_from_response(
+    js: dict, category: str, page_offset: int = 0, page_size: int = PAGE_SIZE
+) -> list[dict]:
     """API 응답에서 키워드·순위·변화 추이 추출"""
     results = []
     ranks = js.get("ranks") or []
     for i, item in enumerate(ranks):
         keyword = item.get("keyword", "")
-        rank_val = item.get("rank") or (page_offset * PAGE_SIZE + i + 1)
+        rank_val = item.get("rank") or (page_offset * page_size + i + 1)
         change = item.get("rankChange") or item.get("change") or "-"
         if not keyword:
             continue
@@ -87,44 +167,75 @@ def extract_keywords_from_response(js: dict, category: str, page_offset: int = 0
     return results
 
 
+def scrape_categories(
+    categories: list[tuple[str, str]],
+    start_date: str,
+    end_date: str,
+    max_keywords: int = KEYWORDS_PER_CATEGORY,
+) -> dict[str, list[dict]]:
+    """
+    여러 카테고리의 상위 max_keywords개 키워드 동시 수집. {cid: [키워드 행, ...]} (입력 순서)
+    1) 모든 카테고리의 첫 페이지를 동시에 요청 → 엔드포인트가 실제로 준 페이지 크기 확인
+    2) 남은 (카테고리, 페이지)를 한꺼번에 동시에 요청
+    요청 속도는 CONCURRENCY와 관계없이 공유 버킷(RATE_PER_SEC)이 제한.
+    """
+    limit = min(max_keywords, MAX_RANK)
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        firsts = list(pool.map(lambda c: fetch_keyword_rank_page(c[1], start_date, end_date, 1), categories))
+
+        pages: dict[str, dict[int, list[dict]]] = {}
+        sizes: dict[str, int] = {}
+        jobs = []
+        for (name, cid), js in zip(categories, firsts):
+            batch = extract_keywords_from_response(js or {}, name, 0)
+            pages[cid] = {1: batch}
+            if not batch:
+                continue
+            # 요청보다 적게 왔으면 엔드포인트 상한(또는 마지막 페이지) → 그 크기로 다음 페이지 계산
+            size = sizes[cid] = len(batch)
+            for page in range(2, math.ceil(limit / size) + 1):
+                jobs.append((name, cid, page))
+
+        def _fetch(job):
+            name, cid, page = job
+            js = fetch_keyword_rank_page(cid, start_date, end_date, page, sizes[cid])
+            return job, extract_keywords_from_response(js or {}, name, page - 1, sizes[cid])
+
+        for (name, cid, page), batch in pool.map(_fetch, jobs):
+            pages[cid][page] = batch
+
+    result: dict[str, list[dict]] = {}
+    for _, cid in categories:
+        collected: list[dict] = []
+        by_page = pages.get(cid, {})
+        for page in sorted(by_page):
+            batch = by_page[page]
+            collected.extend(batch)
+            if len(batch) < sizes.get(cid, PAGE_SIZE):  # 마지막 페이지 (또는 실패) 이후는 버림
+                break
+        result[cid] = collected[:limit]
+    return result
+
+
 def scrape_category(category_name: str, cid: str, start_date: str, end_date: str, max_keywords: int = KEYWORDS_PER_CATEGORY) -> list[dict]:
-    """한 카테고리에 대해 상위 max_keywords개 키워드 수집"""
-    collected = []
-    page = 1
-    while len(collected) < max_keywords:
-        js = fetch_keyword_rank_page(cid, start_date, end_date, page)
-        time.sleep(DELAY_BETWEEN_REQUESTS)
-        if not js:
-            break
-        batch = extract_keywords_from_response(js, category_name, page - 1)
-        if not batch:
-            break
-        collected.extend(batch)
-        if len(batch) < PAGE_SIZE:
-            break
-        page += 1
-        if page > 10:
-            break
-    return collected[:max_keywords]
-
-
-VOLUME_API_INTERVAL = 0.25
-
-
-def _fetch_search_volume(keyword: str) -> int:
-    """네이버 검색광고 API로 월간 검색량 조회. 실패 시 0."""
+    """한 카테고리에 대해 상위 max_keywords개 키워드 수집 (페이지는 동시 요청)"""
+    return scrape_categories([(category_name, cid)], start_date, end_date, max_keywords)[cid]
+
+
+def _fetch_search_volumes(keywords: list[str]) -> dict[str, int]:
+    """네이버 검색광고 API로 월간 검색량 일괄 조회 (5개씩 묶음). 실패·미설정 시 0."""
     try:
         from naver_api_keys import CUSTOMER_ID, ACCESS_LICENSE, SECRET_KEY
-        from naver_api import get_monthly_search_volume
-        vol = get_monthly_search_volume(
-            keyword=keyword,
+        from naver_api import get_monthly_search_volumes
+        volumes = get_monthly_search_volumes(
+            keywords,
             customer_id=CUSTOMER_ID,
             license_key=ACCESS_LICENSE,
             secret_key=SECRET_KEY,
         )
-        return int(vol) if vol is not None else 0
+        return {kw: int(v) if v is not None else 0 for kw, v in volumes.items()}
     except Exception:
-        return 0
+        return {}
 
 
 def save_to_csv(keywords: list[dict], filepath: str):
@@ -150,23 +261,26 @@ def _is_meaningful_keyword(keyword: str) -> bool:
     return True
 
 
-def main():
+def main(all_categories: bool = False, depth: int = 1, per_category: int = KEYWORDS_PER_CATEGORY):
     print("네이버 데이터랩 쇼핑 인사이트 스크래퍼 (API 방식)")
     print("-" * 50)
 
     start_date, end_date = get_date_range_1week()
     print(f"기간: {start_date} ~ {end_date} (최근 1주일)")
-    print(f"카테고리: {len(DEFAULT_CATEGORIES)}개, 카테고리당 상위 {KEYWORDS_PER_CATEGORY}개")
+    categories = TOP_CATEGORIES if all_categories else DEFAULT_CATEGORIES
+    if depth >= 2:
+        categories = expand_categories(categories)
+    print(f"카테고리: {len(categories)}개, 카테고리당 상위 {per_category}개 (동시 {CONCURRENCY}, 초당 {RATE_PER_SEC:g}회 제한)")
     print()
 
+    started = datetime.now()
+    by_cid = scrape_categories(categories, start_date, end_date, per_category)
     all_keywords = []
-    for idx, (category_name, cid) in enumerate(DEFAULT_CATEGORIES):
-        if idx > 0:
-            time.sleep(DELAY_BETWEEN_CATEGORIES)
-        print(f"카테고리: {category_name} (cid={cid}) 수집 중...")
-        keywords = scrape_category(category_name, cid, start_date, end_date)
+    for category_name, cid in categories:
+        keywords = by_cid.get(cid, [])
         all_keywords.extend(keywords)
-        print(f"  -> {len(keywords)}개 키워드 수집")
+        print(f"카테고리: {category_name} (cid={cid}) -> {len(keywords)}개 키워드 수집")
+    print(f"수집 {len(all_keywords)}건, {(datetime.now() - started).total_seconds():.0f}초")
 
     # 중복 제거: 동일 키워드는 첫 등장(첫 카테고리)만 유지
     seen_kw = set()
@@ -182,14 +296,13 @@ def main():
 
     print(f"\n중복·노이즈 제거 후 총 {len(unique)}개. 검색량 조회 중... (카테고리 무관 전체 인기순 정렬)")
     total = len(unique)
+    volumes = _fetch_search_volumes([row.get("keyword", "") for row in unique])
     for i, row in enumerate(unique):
         kw = row.get("keyword", "")
-        vol = _fetch_search_volume(kw)
+        vol = volumes.get(kw, 0)
         row["search_volume"] = vol
         if (i + 1) % 20 == 0 or i == 0:
             print(f"  [{i + 1}/{total}] {kw} → {vol:,}")
-        if i < total - 1:
-            time.sleep(VOLUME_API_INTERVAL)
 
     unique.sort(key=lambda r: r.get("search_volume", 0) or 0, reverse=True)
     for i, row in enumerate(unique):
@@ -204,4 +317,13 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="1차 카테고리 전체 + 2차 카테고리까지 수집")
+    parser.add_argument("--depth", type=int, default=None, help="1: 지정 카테고리만, 2: 2차 카테고리 포함 (--all 기본 2)")
+    parser.add_argument("--per-category", type=int, default=KEYWORDS_PER_CATEGORY, help="카테고리당 키워드 수")
+    args = parser.parse_args()
+    main(
+        all_categories=args.all,
+        depth=args.depth if args.depth is not None else (2 if args.all else 1),
+        per_category=args.per_category,
+    )
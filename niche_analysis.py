@@ -1,20 +1,20 @@
 """
 쿠팡 니치 파인더 - 경쟁 강도 분석 (쿠팡 파트너스 API 사용)
 trending_keywords.csv를 읽어 API로 검색 → 로켓 개수, 평균가격, 등급
+검색 결과는 상품 스냅샷(core.product_store)으로 저장하고 집계는 그 위에서 수행
 """
 
 import csv
-import time
 from pathlib import Path
 
-from coupang_api import search_products
+from coupang_api import cache_report, extract_products, search_products
+from core.product_store import keyword_stats
 
 # 설정
 TRENDING_CSV = "trending_keywords.csv"
 OUTPUT_CSV = "niche_analysis.csv"
 PRODUCTS_PER_KEYWORD = 10  # 쿠팡 API limit 허용 범위 내 (limit is out of range 방지)
 MAX_KEYWORDS = 50
-DELAY_BETWEEN_CALLS = 2
 
 
 def get_grade(rocket_count: int) -> str:
@@ -25,8 +25,22 @@ def get_grade(rocket_count: int) -> str:
     return "B"
 
 
+def analyze_from_store(keywords: list[str]) -> dict[str, dict]:
+    """저장된 상품 스냅샷(키워드별 최근 수집 1회)으로 분석 (API 호출 없음)"""
+    results = {}
+    for kw, stats in keyword_stats(keywords).items():
+        results[kw] = {
+            "rocket_count": stats["rocket_count"],
+            "total_products": stats["total_products"],
+            "avg_price": stats["avg_price"],
+            "max_reviews": 0,
+            "grade": get_grade(stats["rocket_count"]),
+        }
+    return results
+
+
 def analyze_keyword_api(keyword: str, access_key: str, secret_key: str) -> dict:
-    """쿠팡 파트너스 API로 상품 검색 후 분석"""
+    """쿠팡 파트너스 API로 상품 검색(스냅샷 저장) 후 분석"""
     result = {
         "rocket_count": 0,
         "total_products": 0,
@@ -39,47 +53,14 @@ def analyze_keyword_api(keyword: str, access_key: str, secret_key: str) -> dict:
     if not js:
         return result
 
-    products = []
-    data = js.get("data", js)
-    if isinstance(data, dict):
-        products = (
-            data.get("productData")
-            or data.get("products")
-            or data.get("productList")
-            or data.get("items")
-            or data.get("results")
-            or []
-        )
-    elif isinstance(data, list):
-        products = data
-
-    if not products and js:
+    if not extract_products(js):
         if not getattr(analyze_keyword_api, "_debug_done", False):
             analyze_keyword_api._debug_done = True
             print("  [디버그] rCode:", js.get("rCode"), "| rMessage:", js.get("rMessage", "")[:80])
             print("  [참고] data 없음. 쿠팡 파트너스 최종승인+검색API 권한 확인. subId 추가됨.")
         return result
 
-    result["total_products"] = len(products)
-    prices = []
-    rocket_count = 0
-
-    for p in products:
-        if not isinstance(p, dict):
-            continue
-        if p.get("isRocket") or p.get("rocket") or p.get("isRocketDelivery") or "로켓" in str(p.get("productName", "")):
-            rocket_count += 1
-        price = p.get("productPrice") or p.get("price") or p.get("salePrice") or p.get("product_price")
-        if price is not None:
-            try:
-                prices.append(int(price))
-            except (ValueError, TypeError):
-                pass
-
-    result["rocket_count"] = rocket_count
-    result["avg_price"] = round(sum(prices) / len(prices), 0) if prices else 0
-    result["grade"] = get_grade(rocket_count)
-    return result
+    return analyze_from_store([keyword]).get(keyword.strip(), result)
 
 
 def main():
@@ -108,7 +89,7 @@ def main():
                 rows.append(row)
 
     rows = rows[:MAX_KEYWORDS]
-    print(f"분석 대상: {len(rows)}개 키워드 (전체 상위 {len(rows)}개, API 호출 간 {DELAY_BETWEEN_CALLS}초 대기)")
+    print(f"분석 대상: {len(rows)}개 키워드 (전체 상위 {len(rows)}개, 호출 속도는 coupang_api 토큰 버킷이 제어)")
     print("(API 제한: 시간당 10회 권장. 너무 많은 호출 시 차단될 수 있음)")
     print()
 
@@ -129,7 +110,6 @@ def main():
             "grade": data["grade"],
         })
         print(f"  -> 로켓 {data['rocket_count']}개, 평균가 {data['avg_price']:,.0f}원, 등급 {data['grade']}")
-        time.sleep(DELAY_BETWEEN_CALLS)
 
     out_path = Path(OUTPUT_CSV)
     fieldnames = ["category", "rank", "keyword", "change_trend", "rocket_count", "total_products", "avg_price", "max_reviews", "grade"]
@@ -140,6 +120,7 @@ def main():
 
     print()
     print(f"저장 완료: {out_path.absolute()}")
+    print(cache_report())
     s_count = sum(1 for r in results if r["grade"] == "S")
     a_count = sum(1 for r in results if r["grade"] == "A")
     print(f"S등급 {s_count}개, A등급 {a_count}개, B등급 {len(results) - s_count - a_count}개")
@@ -1,18 +1,20 @@
 """
 trending_keywords.csv 상위 20개만 쿠팡에서 분석 → niche_test.csv 저장
+로켓 수·가격 통계는 저장된 상품 스냅샷(core.product_store) 집계
 """
 
 import csv
-import time
 from pathlib import Path
 
-from coupang_api import search_products
+from core import checkpoint
+from coupang_api import cache_report, extract_products, search_products
+from core.product_store import keyword_stats
 
 TRENDING_CSV = "trending_keywords.csv"
 OUTPUT_CSV = "niche_test.csv"
 PRODUCTS_PER_KEYWORD = 10  # 쿠팡 API limit 허용 범위 내
 MAX_KEYWORDS = 50
-DELAY_BETWEEN_CALLS = 2
+FIELDNAMES = ["category", "rank", "keyword", "change_trend", "rocket_count", "total_products", "min_price", "max_price", "avg_price", "max_reviews", "grade", "verification_needed"]
 
 
 def get_grade(rocket_count: int) -> str:
@@ -23,7 +25,34 @@ def get_grade(rocket_count: int) -> str:
     return "B"
 
 
-def analyze_keyword_api(keyword: str, access_key: str, secret_key: str, try_visual_on_zero: bool = True) -> dict:
+def _from_stats(stats: dict) -> dict:
+    """스냅샷 집계값 → 분석 결과"""
+    return {
+        "rocket_count": stats["rocket_count"],
+        "total_products": stats["total_products"],
+        "min_price": stats["min_price"],
+        "max_price": stats["max_price"],
+        "avg_price": stats["avg_price"],
+        "max_reviews": 0,
+        "grade": get_grade(stats["rocket_count"]),
+        "verification_needed": False,
+    }
+
+
+def analyze_from_store(keywords: list[str]) -> dict[str, dict]:
+    """저장된 상품 스냅샷(키워드별 최근 수집 1회)으로 분석 (API·시각검증 호출 없음, 로켓 0개는 검증 필요 표시)"""
+    results = {}
+    for kw, stats in keyword_stats(keywords).items():
+        results[kw] = _from_stats(stats)
+        results[kw]["verification_needed"] = stats["rocket_count"] == 0
+    return results
+
+
+def analyze_keyword_api(keyword: str, access_key: str, secret_key: str, try_visual_on_zero: bool = True) -> dict | None:
+    """
+    쿠팡 검색 결과로 로켓 수·가격·등급 집계.
+    조회 실패(차단 회로·마감·키 한도·HTTP 오류)는 None → 검색 결과 0개(기본 행)와 구분해 나중에 다시 시도.
+    """
     result = {
         "rocket_count": 0,
         "total_products": 0,
@@ -37,46 +66,15 @@ def analyze_keyword_api(keyword: str, access_key: str, secret_key: str, try_visu
 
     js = search_products(keyword, PRODUCTS_PER_KEYWORD, access_key, secret_key)
     if not js:
-        return result
+        return None
 
-    products = []
-    data = js.get("data", js)
-    if isinstance(data, dict):
-        products = (
-            data.get("productData")
-            or data.get("products")
-            or data.get("productList")
-            or data.get("items")
-            or data.get("results")
-            or []
-        )
-    elif isinstance(data, list):
-        products = data
-
-    if not products and js:
+    if not extract_products(js):
         return result
 
-    result["total_products"] = len(products)
-    prices = []
-    rocket_count = 0
-
-    for p in products:
-        if not isinstance(p, dict):
-            continue
-        if p.get("isRocket") or p.get("rocket") or p.get("isRocketDelivery") or "로켓" in str(p.get("productName", "")):
-            rocket_count += 1
-        price = p.get("productPrice") or p.get("price") or p.get("salePrice") or p.get("product_price")
-        if price is not None:
-            try:
-                prices.append(int(price))
-            except (ValueError, TypeError):
-                pass
-
-    result["rocket_count"] = rocket_count
-    result["min_price"] = min(prices) if prices else 0
-    result["max_price"] = max(prices) if prices else 0
-    result["avg_price"] = round(sum(prices) / len(prices), 0) if prices else 0
-    result["grade"] = get_grade(rocket_count)
+    stats = keyword_stats([keyword]).get(keyword.strip())
+    if stats:
+        result = _from_stats(stats)
+    rocket_count = result["rocket_count"]
 
     # API가 0개 반환 시 시각 스크래퍼로 재검증 시도 (쿠팡 차단 시 실패)
     if rocket_count == 0 and try_visual_on_zero:
@@ -99,7 +97,7 @@ def analyze_keyword_api(keyword: str, access_key: str, secret_key: str, try_visu
     return result
 
 
-def main():
+def main(resume: bool = False):
     print("쿠팡 니치 테스트 - 상위 20개 키워드 분석")
     print("-" * 50)
 
@@ -126,38 +124,61 @@ def main():
     print(f"분석 대상: 상위 {len(rows)}개 키워드")
     print()
 
-    results = []
-    for i, row in enumerate(rows):
-        kw = row["keyword"]
-        print(f"[{i + 1}/{len(rows)}] {kw}")
-        data = analyze_keyword_api(kw, COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY)
-        results.append({
-            "category": row.get("category", ""),
-            "rank": row.get("rank", ""),
-            "keyword": kw,
-            "change_trend": row.get("change_trend", ""),
-            "rocket_count": data["rocket_count"],
-            "total_products": data["total_products"],
-            "min_price": int(data.get("min_price", 0)),
-            "max_price": int(data.get("max_price", 0)),
-            "avg_price": int(data["avg_price"]),
-            "max_reviews": data["max_reviews"],
-            "grade": data["grade"],
-            "verification_needed": "Y" if data.get("verification_needed") else "",
-        })
-        print(f"  -> 로켓 {data['rocket_count']}개, 평균가 {data['avg_price']:,.0f}원, 등급 {data['grade']}")
-        time.sleep(DELAY_BETWEEN_CALLS)
+    # 키워드별 진행 기록: --resume이면 지난 미완료 실행에서 끝난 키워드는 결과를 그대로 사용
+    journal = checkpoint.Journal("niche_test", resume=resume)
+    if journal.resumed:
+        print(f"이어받기: 완료 {len(journal.completed())}개 건너뜀")
 
+    # 키워드마다 바로 한 줄씩 저장 → 중간에 끊겨도 그때까지의 결과는 남음
     out_path = Path(OUTPUT_CSV)
-    fieldnames = ["category", "rank", "keyword", "change_trend", "rocket_count", "total_products", "min_price", "max_price", "avg_price", "max_reviews", "grade", "verification_needed"]
     with open(out_path, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
         writer.writeheader()
-        writer.writerows(results)
+        failed = 0
+        for i, row in enumerate(rows):
+            kw = row["keyword"]
+            saved = journal.result(kw)
+            if saved:
+                writer.writerow(saved)
+                continue
+            print(f"[{i + 1}/{len(rows)}] {kw}")
+            data = analyze_keyword_api(kw, COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY)
+            if data is None:
+                # 조회 실패는 0개 결과로 남기지 않음 → --resume에서 다시 시도
+                failed += 1
+                journal.record(kw, checkpoint.FAILED)
+                print("  -> 쿠팡 조회 실패 (다음 --resume에서 재시도)")
+                continue
+            result = {
+                "category": row.get("category", ""),
+                "rank": row.get("rank", ""),
+                "keyword": kw,
+                "change_trend": row.get("change_trend", ""),
+                "rocket_count": data["rocket_count"],
+                "total_products": data["total_products"],
+                "min_price": int(data.get("min_price", 0)),
+                "max_price": int(data.get("max_price", 0)),
+                "avg_price": int(data["avg_price"]),
+                "max_reviews": data["max_reviews"],
+                "grade": data["grade"],
+                "verification_needed": "Y" if data.get("verification_needed") else "",
+            }
+            writer.writerow(result)
+            f.flush()
+            journal.record(kw, checkpoint.DONE, result)
+            print(f"  -> 로켓 {data['rocket_count']}개, 평균가 {data['avg_price']:,.0f}원, 등급 {data['grade']}")
+    if failed:
+        print(f"조회 실패 {failed}개 → --resume으로 실패한 키워드만 다시 실행")
+    else:
+        journal.finish()
 
     print()
     print(f"저장 완료: {out_path.absolute()}")
+    print(cache_report())
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="지난 미완료 실행에서 끝난 키워드는 건너뛰고 이어서 실행")
+    main(resume=parser.parse_args().resume)
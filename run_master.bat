@@ -3,6 +3,7 @@ chcp 65001 >nul
 cd /d "%~dp0"
 
 echo [마스터 시스템] trending_keywords.csv -> DB -> 분석
+echo 전체 파이프라인(트렌드 수집 ~ 리포트): python run_master.py --pipeline
 echo 로그: logs\system.log
 echo.
 python run_master.py --limit 50
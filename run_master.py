@@ -1,6 +1,9 @@
 """
 main.py - 마스터 실행 매니저
-trending_keywords.csv → DB → 분석 → 업데이트
+기본: trending_keywords.csv → DB → 분석 → 업데이트 (core.runner.run_workflow)
+--pipeline: 트렌드 수집 → 검색량 정렬 → 니치 테스트 → 검색량·도매 → 리포트 전체 (core.pipeline DAG)
+  입력이 바뀌지 않은 단계는 건너뛰고, 서로 독립인 단계는 병렬 실행. --only로 일부 단계(와 선행 단계)만.
+--stream: 단계별 CSV 대신 키워드 단위 스트리밍 소싱 (stream_sourcing.py)
 """
 
 import argparse
@@ -10,11 +13,33 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from config.logging_config import setup_logging
+from core import pipeline
 from core.runner import run_workflow
 
 if __name__ == "__main__":
     setup_logging()
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, default=50, help="처리할 키워드 수")
+    parser.add_argument("--deadline-min", type=float, default=None, help="실행 마감(분). 기본: config RUN_DEADLINE_MINUTES")
+    parser.add_argument("--pipeline", action="store_true", help="트렌드 수집부터 리포트까지 전체 파이프라인(DAG) 실행")
+    parser.add_argument("--only", nargs="+", default=None, metavar="STAGE", help="파이프라인에서 이 단계들(과 선행 단계)만 실행")
+    parser.add_argument("--force", nargs="+", default=None, metavar="STAGE", help="파이프라인: 입력이 같아도 다시 실행할 단계 (all = 전체)")
+    parser.add_argument("--workers", type=int, default=pipeline.DEFAULT_WORKERS, help="파이프라인: 동시에 실행할 단계 수")
+    parser.add_argument("--resume", action="store_true", help="중단된 단계는 끝난 키워드를 건너뛰고 이어서 실행")
+    parser.add_argument("--incremental", action="store_true", help="새 키워드·분석이 오래된 키워드만 쿠팡 재조회, 나머지는 DB 값 유지")
+    parser.add_argument("--stream", action="store_true", help="트렌드 → 쿠팡 → 검색량 → 도매 → 수익 스트리밍 실행")
     args = parser.parse_args()
-    run_workflow(limit=args.limit)
+    if args.stream:
+        import stream_sourcing
+        stream_sourcing.main(limit=args.limit)
+        sys.exit(0)
+    deadline_sec = args.deadline_min * 60 if args.deadline_min else None
+    if not (args.pipeline or args.only):
+        run_workflow(limit=args.limit, deadline_sec=deadline_sec, resume=args.resume, incremental=args.incremental)
+        sys.exit(0)
+    stages = pipeline.default_stages(
+        limit=args.limit, deadline_sec=deadline_sec, resume=args.resume, incremental=args.incremental,
+    )
+    status = pipeline.run(stages, targets=args.only, force=args.force, workers=args.workers, resume=args.resume)
+    print(pipeline.format_summary(status))
+    sys.exit(1 if pipeline.FAILED in status.values() else 0)
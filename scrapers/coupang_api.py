@@ -58,7 +58,6 @@ class CoupangApiScraper(BaseScraper):
                     except (ValueError, TypeError):
                         pass
             avg_price = round(sum(prices) / len(prices), 0) if prices else 0
-            self._random_delay()
             return {
                 "rocket_count": rocket_count,
                 "avg_price": int(avg_price),
@@ -1,15 +1,20 @@
 """
 네이버 쇼핑 인사이트 수집 모듈 (실제 구매 의도)
+카테고리 TOP 순위는 기간(시작~종료일)마다 한 번만 받아 키워드 → (카테고리, 순위, 변화) 색인으로 보관.
+키워드 단건 조회는 색인에서 바로 찾음 (네트워크 요청 없음). 색인은 raw_scrapes에도 저장해 다음 실행과 공유.
 """
 
 import logging
 import sys
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import requests
 
+from database.db import get_raw_scrape, save_raw_scrape
 from scrapers.base import BaseScraper
 
 logger = logging.getLogger(__name__)
@@ -22,81 +27,129 @@ HEADERS = {
     "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
 }
 CATEGORIES = [("생활/주방", "50000008"), ("디지털/가전", "50000003")]
+PAGE_SIZE = 20
+MAX_PAGES = 10
+INDEX_DEPTH = 100  # 색인에 넣을 카테고리당 순위 수
+INDEX_SOURCE = "naver_insight_index"
+INDEX_MAX_AGE_HOURS = 6  # 디스크 색인 재사용 기간 (종료일이 오늘이라 당일 중 순위가 갱신될 수 있음)
+
+
+def _date_range(days: int = 7) -> tuple[str, str]:
+    """최근 days일 (시작일, 종료일)"""
+    end = datetime.now()
+    start = end - timedelta(days=days)
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
 
 class NaverInsightScraper(BaseScraper):
     """네이버 쇼핑 인사이트 인기 검색어"""
 
+    def __init__(self, categories: list[tuple[str, str]] | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.categories = list(categories or CATEGORIES)
+        self._lock = threading.Lock()
+        # (cid, 시작일, 종료일) → (순위 목록, 끝까지 받았는지)
+        self._rows: dict[tuple[str, str, str], tuple[list[dict], bool]] = {}
+        # (시작일, 종료일) → {키워드: {"category", "rank", "change_trend"}}
+        self._index: dict[tuple[str, str], dict[str, dict]] = {}
+        self.requests_made = 0
+
     def get_source_name(self) -> str:
         return "naver_insight"
 
+    def _fetch_category(self, category: str, cid: str, start: str, end: str, limit: int) -> tuple[list[dict], bool]:
+        """카테고리 TOP limit개 요청 → (순위 목록, 끝까지 받았는지). 응답 오류 시 예외"""
+        result = []
+        page = 1
+        while len(result) < limit and page <= MAX_PAGES:
+            data = {
+                "cid": cid, "timeUnit": "date",
+                "startDate": start, "endDate": end,
+                "page": str(page), "count": str(PAGE_SIZE),
+            }
+            r = requests.post(API_URL, headers={**HEADERS, "User-Agent": self._random_user_agent()}, data=data, timeout=15)
+            self.requests_made += 1
+            self._random_delay()
+            r.raise_for_status()
+            ranks = r.json().get("ranks", [])
+            for i, item in enumerate(ranks):
+                kw = (item.get("keyword") or "").strip()
+                if kw:
+                    result.append({
+                        "keyword": kw,
+                        "category": category,
+                        "rank": item.get("rank", (page - 1) * PAGE_SIZE + i + 1),
+                        "change_trend": str(item.get("rankChange", item.get("change", "")) or "-"),
+                    })
+            if len(ranks) < PAGE_SIZE:
+                return result, True
+            page += 1
+        return result, False
+
+    def _category_rows(self, category: str, cid: str, start: str, end: str, limit: int) -> list[dict]:
+        """같은 기간에 이미 받은 순위가 충분하면 재사용, 아니면 요청"""
+        key = (cid, start, end)
+        cached = self._rows.get(key)
+        if cached and (len(cached[0]) >= limit or cached[1]):
+            return cached[0][:limit]
+        rows, exhausted = self._fetch_category(category, cid, start, end, limit)
+        self._rows[key] = (rows, exhausted)
+        return rows[:limit]
+
+    def _index_source(self) -> str:
+        return f"{INDEX_SOURCE}?cids={','.join(cid for _, cid in self.categories)}"
+
+    def build_index(self, start: str, end: str) -> dict[str, dict]:
+        """기간의 키워드 색인 (메모리 → 디스크 → 카테고리 TOP 요청 순). 기간마다 한 번만 만듦"""
+        period = (start, end)
+        with self._lock:
+            index = self._index.get(period)
+            if index is not None:
+                return index
+            period_key = f"{start}~{end}"
+            stored = get_raw_scrape(self._index_source(), period_key, INDEX_MAX_AGE_HOURS)
+            if isinstance(stored, dict):
+                self._index[period] = stored
+                return stored
+
+            index = {}
+            complete = True
+            for cat_name, cid in self.categories:
+                try:
+                    rows = self._category_rows(cat_name, cid, start, end, INDEX_DEPTH)
+                except (requests.RequestException, ValueError) as e:
+                    logger.warning("NaverInsight %s 순위 수집 실패: %s", cat_name, e)
+                    complete = False
+                    continue
+                for row in rows:
+                    # 여러 카테고리에 나오면 먼저 나온 카테고리 순위 사용
+                    index.setdefault(row["keyword"], {
+                        "category": row["category"],
+                        "rank": row["rank"],
+                        "change_trend": row["change_trend"],
+                    })
+            self._index[period] = index
+            if complete:
+                save_raw_scrape(self._index_source(), period_key, index)
+            logger.info("NaverInsight 색인 %s: 키워드 %d개", period_key, len(index))
+            return index
+
     def scrape_keyword(self, keyword: str) -> dict:
-        """단일 키워드는 카테고리 내 순위 검색 미지원 → 전체 TOP 수집 후 키워드 필터"""
+        """단일 키워드는 카테고리 내 순위 검색 미지원 → 기간 색인에서 조회 (없으면 빈 dict)"""
         try:
-            from datetime import datetime, timedelta
-            end = datetime.now()
-            start = end - timedelta(days=7)
-            start_str = start.strftime("%Y-%m-%d")
-            end_str = end.strftime("%Y-%m-%d")
-            for cat_name, cid in CATEGORIES:
-                data = {
-                    "cid": cid, "timeUnit": "date",
-                    "startDate": start_str, "endDate": end_str,
-                    "page": "1", "count": "100",
-                }
-                r = requests.post(API_URL, headers={**HEADERS, "User-Agent": self._random_user_agent()}, data=data, timeout=15)
-                self._random_delay()
-                if r.status_code != 200:
-                    continue
-                js = r.json()
-                for i, item in enumerate(js.get("ranks", [])):
-                    if (item.get("keyword") or "").strip() == keyword:
-                        return {
-                            "rank": item.get("rank", i + 1),
-                            "change_trend": str(item.get("rankChange", item.get("change", "")) or "-"),
-                        }
-            return {}
+            start, end = _date_range()
+            entry = self.build_index(start, end).get(keyword.strip())
+            return dict(entry) if entry else {}
         except Exception as e:
             logger.exception("NaverInsight scrape_keyword error: %s", e)
             return {}
 
     def scrape_category_top(self, category: str, cid: str, limit: int = 100) -> list[dict]:
         """카테고리 TOP 키워드 일괄 수집"""
-        result = []
         try:
-            from datetime import datetime, timedelta
-            end = datetime.now()
-            start = end - timedelta(days=7)
-            page = 1
-            while len(result) < limit:
-                data = {
-                    "cid": cid, "timeUnit": "date",
-                    "startDate": start.strftime("%Y-%m-%d"),
-                    "endDate": end.strftime("%Y-%m-%d"),
-                    "page": str(page), "count": "20",
-                }
-                r = requests.post(API_URL, headers={**HEADERS, "User-Agent": self._random_user_agent()}, data=data, timeout=15)
-                self._random_delay()
-                if r.status_code != 200:
-                    break
-                js = r.json()
-                ranks = js.get("ranks", [])
-                if not ranks:
-                    break
-                for i, item in enumerate(ranks):
-                    kw = (item.get("keyword") or "").strip()
-                    if kw:
-                        result.append({
-                            "keyword": kw,
-                            "category": category,
-                            "rank": item.get("rank", (page - 1) * 20 + i + 1),
-                            "change_trend": str(item.get("rankChange", item.get("change", "")) or "-"),
-                        })
-                if len(ranks) < 20:
-                    break
-                page += 1
-                if page > 10:
-                    break
+            start, end = _date_range()
+            with self._lock:
+                return [dict(row) for row in self._category_rows(category, cid, start, end, limit)]
         except Exception as e:
             logger.exception("NaverInsight scrape_category_top error: %s", e)
-        return result[:limit]
+            return []
@@ -6,22 +6,19 @@ seasonal_analyzer.py - 시즌 헌터(Seasonal Hunter) 엔진
 
 import csv
 import sys
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import requests
-
 # 스크립트 위치를 sys.path에 추가 (config.py 로드용)
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from core import checkpoint, deadline, quota
+from naver_datalab import KEYWORDS_PER_REQUEST, as_api_response, get_monthly_trends, pending_keywords
+
 INPUT_CSV = "niche_test.csv"
 OUTPUT_CSV = "seasonal_hunter_report.csv"
 OUTPUT_CHARTS = "seasonal_charts"
-API_URL = "https://openapi.naver.com/v1/datalab/search"
-KEYWORDS_PER_REQUEST = 5
-DELAY_SEC = 1
-TREND_YEARS = 3  # 2023~2025
+TREND_START_MONTH = "2023-01"  # 2023년~현재 (naver_datalab 저장소에 없는 달만 API 요청)
 SPIKE_THRESHOLD = 2.0  # 평균 대비 200% 이상 = 폭등
 REPEAT_MIN_YEARS = 2   # 최소 2년 연속 같은 월에 폭등해야 재현성 인정
 
@@ -41,7 +38,7 @@ def load_config():
 
 
 def load_keywords() -> list[str]:
-    """niche_test.csv 또는 trending_keywords.csv에서 키워드 로드"""
+    """niche_test.csv 또는 trending_keywords.csv에서 키워드 로드 (파일 순서 = 중요도 순, 개수 제한은 plan_trend_budget이 담당)"""
     for fname in [INPUT_CSV, "trending_keywords.csv"]:
         path = Path(fname)
         if path.exists():
@@ -53,39 +50,29 @@ def load_keywords() -> list[str]:
                     if kw:
                         rows.append(kw)
             if rows:
-                return rows[:100]  # 최대 100개 (API 호출 제한 고려)
+                return rows
     return []
 
 
+def plan_trend_budget(keywords: list[str]) -> list[str]:
+    """
+    데이터랩 남은 일일 한도 안에서 처리할 키워드 (저장소에 있는 키워드는 한도와 무관하게 포함).
+    한도가 모자라면 파일 뒤쪽(순위가 낮은) 키워드부터 제외.
+    """
+    stage = quota.Stage(
+        "시즌 트렌드", "naver_datalab", keywords,
+        pending_keywords(keywords, TREND_START_MONTH), per_call=KEYWORDS_PER_REQUEST - 1,
+    )
+    remaining = quota.remaining_by_api(["naver_datalab"])
+    quota.plan([stage], remaining)
+    print(quota.format_plan([stage], remaining))
+    return stage.allowed
+
+
 def fetch_3year_trend(client_id: str, client_secret: str, keywords: list[str]) -> dict | None:
-    """Naver DataLab API로 최근 3년(2023~2025) 월별 검색 트렌드 조회"""
-    start_str = "2023-01-01"
-    end = datetime.now()
-    end_str = end.strftime("%Y-%m-%d")
-
-    groups = [{"groupName": kw, "keywords": [kw]} for kw in keywords[:KEYWORDS_PER_REQUEST]]
-    body = {
-        "startDate": start_str,
-        "endDate": end_str,
-        "timeUnit": "month",
-        "keywordGroups": groups,
-    }
-    try:
-        r = requests.post(
-            API_URL,
-            headers={
-                "X-Naver-Client-Id": client_id,
-                "X-Naver-Client-Secret": client_secret,
-                "Content-Type": "application/json",
-            },
-            json=body,
-            timeout=30,
-        )
-        if r.status_code == 200:
-            return r.json()
-    except Exception as e:
-        print(f"  [API 오류] {e}")
-    return None
+    """Naver DataLab 최근 3년(2023~) 월별 검색 트렌드 조회 (데이터랩 응답 형식, 키워드별 최고점 100)"""
+    trends = get_monthly_trends(keywords, TREND_START_MONTH, client_id, client_secret)
+    return as_api_response(trends) if trends else None
 
 
 def detect_seasonal_spike(periods: list[str], ratios: list[float]) -> dict | None:
@@ -223,7 +210,7 @@ def ascii_chart(periods: list[str], ratios: list[float], width: int = 40, height
     return "\n".join(lines)
 
 
-def main():
+def main(resume: bool = False):
     print("=" * 50)
     print("시즌 헌터(Seasonal Hunter) - 반복 시즌 키워드 분석")
     print("=" * 50)
@@ -238,65 +225,75 @@ def main():
         print(f"오류: {INPUT_CSV} 또는 trending_keywords.csv에 키워드가 없습니다.")
         return
 
+    keywords = plan_trend_budget(keywords)
     print(f"대상 키워드 {len(keywords)}개, 3년치 데이터 수집 중...")
     now = datetime.now()
     # 앞으로 2개월 (예: 2월이면 3월, 4월)
     upcoming_months = [(now.month + i - 1) % 12 + 1 for i in range(1, 3)]
 
-    report = []
-    for i in range(0, len(keywords), KEYWORDS_PER_REQUEST):
-        batch = keywords[i : i + KEYWORDS_PER_REQUEST]
-        js = fetch_3year_trend(client_id, client_secret, batch)
-        time.sleep(DELAY_SEC)
-
-        if not js:
-            for kw in batch:
-                report.append({
-                    "키워드": kw,
-                    "폭등 시점": "-",
-                    "3년 평균 상승률": "-",
-                    "2개월 내 폭등 예정": "아니오",
-                    "비서의 조언": "(데이터 수집 실패)",
-                    "_ascii": "",
-                })
+    # 키워드별 진행 기록: --resume이면 지난 미완료 실행에서 분석까지 끝난 키워드는 다시 요청하지 않음
+    journal = checkpoint.Journal("seasonal_analyzer", resume=resume)
+    report = [journal.result(kw) for kw in keywords if journal.result(kw)]
+    todo = [kw for kw in keywords if not journal.is_done(kw)]
+    if journal.resumed:
+        print(f"  이어받기: 완료 {len(keywords) - len(todo)}개 건너뜀")
+
+    js = {}
+    if todo:
+        with deadline.run_deadline():  # config RUN_DEADLINE_MINUTES
+            js = fetch_3year_trend(client_id, client_secret, todo) or {}
+    hedges = deadline.report()
+    if hedges:
+        print(f"  {hedges}")
+    data_by_keyword = {res.get("title", ""): res.get("data", []) for res in js.get("results", [])}
+    print(f"  {len(data_by_keyword)}/{len(todo)} 수집")
+
+    for kw in todo:
+        if kw not in data_by_keyword:
+            journal.record(kw, checkpoint.FAILED)
+            report.append({
+                "키워드": kw,
+                "폭등 시점": "-",
+                "3년 평균 상승률": "-",
+                "2개월 내 폭등 예정": "아니오",
+                "비서의 조언": "(데이터 수집 실패)",
+                "_ascii": "",
+            })
             continue
 
-        for res in js.get("results", []):
-            kw = res.get("title", "")
-            data = res.get("data", [])
-            periods = [d.get("period", "") for d in data]
-            ratios = [float(d.get("ratio", 0) or 0) for d in data]
-
-            spike = detect_seasonal_spike(periods, ratios)
-            if spike:
-                peak_month = spike["peak_month"]
-                spike_pct = spike["avg_spike_ratio"]
-                advice = get_secretary_advice(kw, peak_month, spike_pct)
-                is_upcoming = peak_month in upcoming_months
-                report.append({
-                    "키워드": kw,
-                    "폭등 시점": f"매년 {peak_month}월",
-                    "3년 평균 상승률": f"평달 대비 {spike_pct}%",
-                    "2개월 내 폭등 예정": "예" if is_upcoming else "아니오",
-                    "비서의 조언": advice,
-                    "_ascii": ascii_chart(periods, ratios),
-                    "_periods": periods,
-                    "_ratios": ratios,
-                    "_peak_month": peak_month,
-                })
-            else:
-                report.append({
-                    "키워드": kw,
-                    "폭등 시점": "-",
-                    "3년 평균 상승률": "-",
-                    "2개월 내 폭등 예정": "아니오",
-                    "비서의 조언": "반복적 시즌 패턴이 뚜렷하지 않습니다.",
-                    "_ascii": ascii_chart(periods, ratios),
-                    "_periods": periods,
-                    "_ratios": ratios,
-                })
-
-        print(f"  {min(i + KEYWORDS_PER_REQUEST, len(keywords))}/{len(keywords)} 수집")
+        data = data_by_keyword[kw]
+        periods = [d.get("period", "") for d in data]
+        ratios = [float(d.get("ratio", 0) or 0) for d in data]
+
+        spike = detect_seasonal_spike(periods, ratios)
+        if spike:
+            peak_month = spike["peak_month"]
+            spike_pct = spike["avg_spike_ratio"]
+            advice = get_secretary_advice(kw, peak_month, spike_pct)
+            is_upcoming = peak_month in upcoming_months
+            report.append({
+                "키워드": kw,
+                "폭등 시점": f"매년 {peak_month}월",
+                "3년 평균 상승률": f"평달 대비 {spike_pct}%",
+                "2개월 내 폭등 예정": "예" if is_upcoming else "아니오",
+                "비서의 조언": advice,
+                "_ascii": ascii_chart(periods, ratios),
+                "_periods": periods,
+                "_ratios": ratios,
+                "_peak_month": peak_month,
+            })
+        else:
+            report.append({
+                "키워드": kw,
+                "폭등 시점": "-",
+                "3년 평균 상승률": "-",
+                "2개월 내 폭등 예정": "아니오",
+                "비서의 조언": "반복적 시즌 패턴이 뚜렷하지 않습니다.",
+                "_ascii": ascii_chart(periods, ratios),
+                "_periods": periods,
+                "_ratios": ratios,
+            })
+        journal.record(kw, checkpoint.DONE, report[-1])
 
     # 2개월 내 폭등 예정 먼저 정렬
     report.sort(key=lambda x: (0 if x.get("2개월 내 폭등 예정") == "예" else 1, -len(x.get("_ascii", ""))))
@@ -311,6 +308,7 @@ def main():
             writer.writerow({k: r.get(k, "") for k in fieldnames})
 
     print(f"\n저장 완료: {out_path.absolute()}")
+    journal.finish()
 
     # 시즌 키워드 요약
     seasonal = [r for r in report if r.get("폭등 시점") != "-"]
@@ -342,4 +340,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="지난 미완료 실행에서 끝난 키워드는 건너뛰고 이어서 실행")
+    main(resume=parser.parse_args().resume)
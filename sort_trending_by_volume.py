@@ -7,11 +7,9 @@ trending_keywords.csv 전체 키워드에 대해 네이버 검색량을 조회
 """
 
 import csv
-import time
 from pathlib import Path
 
 TRENDING_CSV = Path(__file__).resolve().parent / "trending_keywords.csv"
-API_CALL_INTERVAL = 0.25
 
 
 def main():
@@ -21,7 +19,7 @@ def main():
 
     try:
         from naver_api_keys import CUSTOMER_ID, ACCESS_LICENSE, SECRET_KEY
-        from naver_api import get_monthly_search_volume
+        from naver_api import cache_report, get_monthly_search_volumes
     except ImportError:
         print("오류: naver_api_keys.py 또는 naver_api.py 없음. 네이버 검색광고 API 설정 후 실행하세요.")
         return
@@ -41,24 +39,23 @@ def main():
 
     total = len(rows)
     print(f"트렌드 검색량 정렬: {total}개 키워드 검색량 조회 후 검색량 순 정렬")
-    print(f"(호출 간격 {API_CALL_INTERVAL}초, 약 {total * API_CALL_INTERVAL / 60:.1f}분 소요)")
+    print(f"(5개씩 묶음 조회 → 약 {(total + 4) // 5}회 호출)")
     print()
 
+    try:
+        volumes = get_monthly_search_volumes(
+            [row["keyword"] for row in rows],
+            customer_id=CUSTOMER_ID,
+            license_key=ACCESS_LICENSE,
+            secret_key=SECRET_KEY,
+        )
+    except Exception:
+        volumes = {}
     for i, row in enumerate(rows):
         kw = row["keyword"]
-        try:
-            vol = get_monthly_search_volume(
-                keyword=kw,
-                customer_id=CUSTOMER_ID,
-                license_key=ACCESS_LICENSE,
-                secret_key=SECRET_KEY,
-            )
-            row["search_volume"] = int(vol) if vol is not None else 0
-        except Exception:
-            row["search_volume"] = 0
+        vol = volumes.get(kw)
+        row["search_volume"] = int(vol) if vol is not None else 0
         print(f"[{i + 1}/{total}] {kw} → {row['search_volume']:,}")
-        if i < total - 1:
-            time.sleep(API_CALL_INTERVAL)
 
     rows.sort(key=lambda r: (r.get("search_volume") or 0) if isinstance(r.get("search_volume"), (int, float)) else 0, reverse=True)
 
@@ -70,6 +67,7 @@ def main():
 
     print()
     print(f"저장 완료: {TRENDING_CSV} (검색량 높은 순으로 정렬됨)")
+    print(cache_report())
     print("이제 '니치분석' 또는 '니치테스트'를 실행하면 상위 50개 = 전체 카테고리에서 검색량 상위 50개입니다.")
 
 
@@ -0,0 +1,137 @@
+"""
+stream_sourcing.py - 스트리밍 소싱 (트렌드 → 쿠팡 등급 → 검색량 → 도매 검색 → 수익)
+niche_test.csv·final_sourcing_list.csv를 단계별로 다 채운 뒤 넘기는 대신, 키워드 하나씩 바로 다음 단계로 흘려보냄.
+순마진 목표를 넘는 후보는 나오는 즉시 final_sourcing_list.csv에 한 줄씩 추가.
+"""
+
+import argparse
+import csv
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core.stream import StreamStage, run_stream
+
+BASE_DIR = Path(__file__).resolve().parent
+TRENDING_CSV = BASE_DIR / "trending_keywords.csv"
+OUTPUT_CSV = BASE_DIR / "final_sourcing_list.csv"
+MAX_KEYWORDS = 50
+COUPANG_WORKERS = 2  # 실제 호출 속도는 coupang_api 키별 버킷이 제한
+VOLUME_WORKERS = 2   # naver_api 키별 버킷이 제한
+QUEUE_SIZE = 10
+
+
+def trend_source(from_csv: bool, limit: int = MAX_KEYWORDS):
+    """트렌드 키워드 행을 하나씩 (from_csv면 trending_keywords.csv, 아니면 카테고리별로 실시간 수집)"""
+    seen = set()
+
+    def _unique(rows):
+        for row in rows:
+            kw = (row.get("keyword") or "").strip()
+            if len(kw) <= 1 or kw in seen:
+                continue
+            seen.add(kw)
+            yield {**row, "keyword": kw}
+
+    emitted = 0
+    if from_csv:
+        with open(TRENDING_CSV, "r", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        for row in _unique(rows):
+            yield row
+            emitted += 1
+            if emitted >= limit:
+                return
+        return
+
+    import naver_shopping_insight_scraper as insight
+    start_date, end_date = insight.get_date_range_1week()
+    # 카테고리 하나가 끝날 때마다 바로 흘려보냄 (첫 키워드가 몇 초 안에 다음 단계로)
+    for name, cid in insight.DEFAULT_CATEGORIES:
+        for row in _unique(insight.scrape_category(name, cid, start_date, end_date)):
+            yield row
+            emitted += 1
+            if emitted >= limit:
+                return
+
+
+def build_stages(access_key: str, secret_key: str) -> list[StreamStage]:
+    import niche_test
+    import wholesale_searcher as ws
+
+    def coupang_grade(row: dict) -> dict | None:
+        # 시각 검증(브라우저)은 단계를 막으므로 생략 → 로켓 0개는 검증 필요 표시
+        data = niche_test.analyze_keyword_api(row["keyword"], access_key, secret_key, try_visual_on_zero=False)
+        if data is None:
+            raise RuntimeError(f"쿠팡 조회 실패: {row['keyword']}")  # 제외가 아니라 실패로 집계
+        row = {**row, **data, "avg_price": int(data["avg_price"])}
+        if not ws.is_sourcing_candidate(row) or row["avg_price"] <= 0:
+            return None
+        print(f"[쿠팡] {row['keyword']}: 로켓 {row['rocket_count']}개, 평균가 {row['avg_price']:,}원, 등급 {row['grade']}")
+        return row
+
+    def volume(row: dict) -> dict:
+        return {**row, "monthly_search_volume": ws._get_naver_search_volume(row["keyword"])}
+
+    def wholesale(row: dict, page) -> dict | None:
+        print(f"[도매] {row['keyword']} (쿠팡 평균 {row['avg_price']:,}원)")
+        products = ws.find_wholesale_products(page, row["keyword"], row["avg_price"])
+        return {**row, "products": products} if products else None
+
+    def profit(row: dict) -> dict | None:
+        result = ws.evaluate_profit(row["keyword"], row["avg_price"], row["products"])
+        if result is None:
+            return None
+        result["monthly_search_volume"] = row.get("monthly_search_volume")
+        return result
+
+    return [
+        StreamStage("쿠팡 등급", coupang_grade, workers=COUPANG_WORKERS, queue_size=QUEUE_SIZE),
+        StreamStage("검색량", volume, workers=VOLUME_WORKERS, queue_size=QUEUE_SIZE),
+        # 브라우저 세션은 스레드에 묶이므로 워커 스레드 안에서 열고 1개만 사용
+        StreamStage("도매 검색", wholesale, workers=1, opener=ws.open_wholesale_session, queue_size=QUEUE_SIZE),
+        StreamStage("수익", profit, queue_size=QUEUE_SIZE),
+    ]
+
+
+def main(from_csv: bool = False, limit: int = MAX_KEYWORDS):
+    print("스트리밍 소싱 - 트렌드 → 쿠팡 등급 → 검색량 → 도매 → 수익")
+    print("-" * 50)
+    try:
+        from coupang_config import COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY
+    except ImportError:
+        print("오류: coupang_config.py가 없습니다.")
+        return
+    if from_csv and not TRENDING_CSV.exists():
+        print(f"오류: {TRENDING_CSV.name} 없음")
+        return
+
+    import wholesale_searcher as ws
+
+    started = datetime.now()
+    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=ws.SOURCING_FIELDS)
+        writer.writeheader()
+        f.flush()
+
+        def on_result(r: dict) -> None:
+            writer.writerow(ws.sourcing_row(r))
+            f.flush()  # 대시보드에서 바로 보이도록
+            elapsed = (datetime.now() - started).total_seconds()
+            print(f"  -> [{elapsed:.0f}초] 소싱 후보: {r['keyword']} | {r['final_source']} | 도매 {r['wholesale_price']:,}원 | 순마진율 {r['net_margin_pct']:.1f}% ✓")
+
+        report = run_stream(trend_source(from_csv, limit), build_stages(COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY), on_result)
+
+    print()
+    print(report.format())
+    print(f"저장 완료: {OUTPUT_CSV} ({len(report.results)}건)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--from-csv", action="store_true", help="실시간 수집 대신 trending_keywords.csv 사용")
+    parser.add_argument("--limit", type=int, default=MAX_KEYWORDS, help="흘려보낼 트렌드 키워드 수")
+    args = parser.parse_args()
+    main(from_csv=args.from_csv, limit=args.limit)
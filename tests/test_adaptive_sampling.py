@@ -0,0 +1,78 @@
+"""
+유닛 테스트: coupang_analyzer 적응형 표본 수집 (신규 상품 포화·신뢰구간 수렴 시 조기 종료)
+"""
+
+import functools
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import coupang_analyzer
+from core import product_store
+from core.validator import wilson_interval
+
+
+@pytest.fixture
+def fake_search(tmp_path, monkeypatch):
+    """호출 순서별 상품 ID 목록을 돌려주고 스냅샷은 임시 DB에 저장하는 가짜 search_products"""
+    db = tmp_path / "p.db"
+    pages: list[list[int]] = []
+    calls = []
+
+    def search(keyword, limit, ak, sk, use_cache=True):
+        ids = pages[min(len(calls), len(pages) - 1)]
+        calls.append(use_cache)
+        products = [{"productId": i, "productPrice": 1000 + i, "isRocket": i % 2 == 0} for i in ids]
+        product_store.save_snapshot(keyword, [
+            {"product_id": str(i), "price": 1000 + i, "is_rocket": i % 2 == 0} for i in ids
+        ], db_path=db)
+        return {"data": {"productData": products}}
+
+    monkeypatch.setattr(coupang_analyzer, "search_products", search)
+    monkeypatch.setattr(
+        coupang_analyzer, "keyword_stats", functools.partial(product_store.keyword_stats, db_path=db)
+    )
+    return pages, calls
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(5, 10)
+    assert low < 0.5 < high
+    assert wilson_interval(50, 100)[1] - wilson_interval(50, 100)[0] < high - low
+    assert wilson_interval(0, 10)[0] == 0.0
+
+
+def test_stops_when_no_new_products(fake_search):
+    pages, calls = fake_search
+    pages.extend([list(range(1, 11)), list(range(1, 11))])
+    result = coupang_analyzer.analyze_keyword_api("물티슈", "ak", "sk")
+    assert calls == [True, False]  # 두 번째 호출에서 신규 0개 → 세 번째 호출 생략
+    assert result["stop_reason"] == "신규 상품 없음"
+    assert result["total_products"] == 10
+    assert result["sample_calls"] == 2
+    assert result["rocket_count"] == 5
+    assert result["rocket_ratio_low"] < 0.5 < result["rocket_ratio_high"]
+
+
+def test_keeps_sampling_to_reach_sample_high(fake_search, monkeypatch):
+    pages, calls = fake_search
+    pages.extend([list(range(i * 10 + 1, i * 10 + 11)) for i in range(5)])
+    monkeypatch.setattr(coupang_analyzer, "CI_HALF_WIDTH", 0.2)
+    result = coupang_analyzer.analyze_keyword_api("양말", "ak", "sk")
+    assert result["total_products"] >= coupang_analyzer.SAMPLE_HIGH
+    assert result["stop_reason"] == "신뢰구간 수렴"
+    assert len(calls) == 3
+    assert result["accuracy_rating"] == "신뢰도 높음"
+
+
+def test_empty_result_stops_immediately(fake_search):
+    pages, calls = fake_search
+    pages.append([])
+    result = coupang_analyzer.analyze_keyword_api("없는상품", "ak", "sk")
+    assert len(calls) == 1
+    assert result["stop_reason"] == "검색 결과 없음"
+    assert result["total_products"] == 0
@@ -0,0 +1,75 @@
+"""
+유닛 테스트: 비동기 API 클라이언트 (동시 요청 수 제한, 동기 래퍼, 검색량 묶음 조회)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("aiohttp")
+
+import naver_api
+import naver_datalab
+from async_api import base, datalab, searchad
+from core.circuit_breaker import CircuitBreaker
+from core.volume_cache import VolumeCache
+
+
+def test_gather_limited_respects_concurrency():
+    running = 0
+    peak = 0
+
+    async def work(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return i * 2
+
+    results = base.run_sync(base.gather_limited(range(10), work, concurrency=3))
+    assert results == [i * 2 for i in range(10)]
+    assert peak == 3
+
+
+def test_run_sync_inside_running_loop():
+    async def inner():
+        return 42
+
+    async def outer():
+        return base.run_sync(inner())  # 이벤트 루프 안에서 동기 래퍼 호출
+
+    assert asyncio.run(outer()) == 42
+
+
+def test_async_volumes_batches_and_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(naver_api, "_cache", VolumeCache(ttl_days=7, db_path=tmp_path / "v.db"))
+    calls = []
+
+    async def fake_request(session, hints, *args):
+        calls.append(list(hints))
+        return [{"relKeyword": h, "monthlyPcQcCnt": 1, "monthlyMobileQcCnt": 2} for h in hints if h != "없음"]
+
+    monkeypatch.setattr(searchad, "request_keywordstool", fake_request)
+    keywords = [f"키워드{i}" for i in range(7)] + ["없음"]
+    result = searchad.get_monthly_search_volumes_bulk(keywords, "c", "l", "s")
+    assert sorted(len(c) for c in calls) == [1, 3, 5]  # 묶음 2회 + 일치 없는 키워드 단건 1회
+    assert result["키워드0"] == 3.0
+    assert result["없음"] == 0.0
+    again = searchad.get_monthly_search_volumes_bulk(keywords[:7], "c", "l", "s")
+    assert len(calls) == 3  # 캐시 적중
+    assert all(v == 3.0 for v in again.values())
+
+
+def test_open_circuit_skips_async_naver_requests(monkeypatch):
+    tripped = CircuitBreaker("test", failure_threshold=1, cooldown_sec=60)
+    tripped.record_failure("HTTP 500")
+    monkeypatch.setattr(naver_api, "_circuit", tripped)
+    monkeypatch.setattr(naver_datalab, "_circuit", tripped)
+    # 세션을 쓰면 AttributeError → 요청 전에 회로에서 막혀야 함
+    assert asyncio.run(searchad.request_keywordstool(None, ["키워드"], "c", "l", "s")) is None
+    assert asyncio.run(datalab.request_trend(None, ["키워드"], "2024-01", "id", "secret")) is None
@@ -0,0 +1,71 @@
+"""
+유닛 테스트: 키워드별 진행 기록 (중단 후 --resume으로 완료 키워드 건너뛰기)
+"""
+
+import csv
+import functools
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import checkpoint
+from core.checkpoint import Journal
+
+
+def test_resume_picks_up_unfinished_run(tmp_path):
+    db = tmp_path / "ckpt.db"
+    first = Journal("wholesale", db_path=db)
+    first.record("a", checkpoint.DONE, {"keyword": "a", "price": 1000})
+    first.record("b", checkpoint.SKIPPED)
+    first.record("c", checkpoint.FAILED)
+    # 여기서 중단 (finish 없음)
+
+    resumed = Journal("wholesale", resume=True, db_path=db)
+    assert resumed.resumed and resumed.run_id == first.run_id
+    assert resumed.is_done("a") and resumed.is_done("b") and not resumed.is_done("c")
+    assert resumed.result("a") == {"keyword": "a", "price": 1000}
+    assert resumed.result("b") is None
+    assert list(resumed.completed()) == ["a", "b"]
+
+    resumed.record("c", checkpoint.DONE, {"keyword": "c"})
+    resumed.finish()
+    # 완료된 실행은 이어받지 않음 → 새 실행
+    fresh = Journal("wholesale", resume=True, db_path=db)
+    assert not fresh.resumed and fresh.completed() == {}
+
+
+def test_without_resume_starts_fresh_and_stages_are_separate(tmp_path):
+    db = tmp_path / "ckpt.db"
+    Journal("niche_test", db_path=db).record("a", checkpoint.DONE, {"x": 1})
+    assert Journal("niche_test", db_path=db).completed() == {}
+    assert Journal("seasonal_analyzer", resume=True, db_path=db).completed() == {}
+
+
+def test_niche_test_failed_lookup_is_retried_on_resume(tmp_path, monkeypatch):
+    import niche_test
+    db = tmp_path / "ckpt.db"
+    trending = tmp_path / "trending.csv"
+    trending.write_text("keyword,rank\n가,1\n나,2\n", encoding="utf-8-sig")
+    monkeypatch.setitem(sys.modules, "coupang_config", types.SimpleNamespace(COUPANG_ACCESS_KEY="a", COUPANG_SECRET_KEY="s"))
+    monkeypatch.setattr(niche_test, "TRENDING_CSV", str(trending))
+    monkeypatch.setattr(niche_test, "OUTPUT_CSV", str(tmp_path / "niche.csv"))
+    monkeypatch.setattr(checkpoint, "Journal", functools.partial(Journal, db_path=db))
+    monkeypatch.setattr(niche_test, "cache_report", lambda: "")
+    ok = {"rocket_count": 1, "total_products": 5, "avg_price": 1000, "max_reviews": 0, "grade": "S"}
+    calls = []
+
+    def flaky(kw, *args, **kwargs):
+        calls.append(kw)
+        return ok if kw == "가" or len(calls) > 2 else None  # 첫 실행의 "나"는 차단 회로 등으로 실패
+
+    monkeypatch.setattr(niche_test, "analyze_keyword_api", flaky)
+    niche_test.main()
+    with open(tmp_path / "niche.csv", encoding="utf-8-sig") as f:
+        assert [r["keyword"] for r in csv.DictReader(f)] == ["가"]  # 실패는 0개 결과로 남기지 않음
+
+    niche_test.main(resume=True)
+    assert calls == ["가", "나", "나"]
+    with open(tmp_path / "niche.csv", encoding="utf-8-sig") as f:
+        assert [r["keyword"] for r in csv.DictReader(f)] == ["가", "나"]
@@ -0,0 +1,94 @@
+"""
+유닛 테스트: 차단 회로 (연속 실패 시 열림 → 요청 없이 실패 → 대기 후 시험 요청 1건), 재시도 목록
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import coupang_api
+from core import retry_queue
+from core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from core.key_pool import KeyPool
+
+
+class DeniedResponse:
+    status_code = 403
+    text = "Access Denied"
+    headers: dict = {}
+
+
+class DeniedSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return DeniedResponse()
+
+
+class NoWait:
+    rate = 1.0
+
+    def acquire(self):
+        return 0.0
+
+    def try_acquire(self):
+        return False
+
+
+def test_opens_after_threshold_and_probes_once():
+    cb = CircuitBreaker("test", failure_threshold=2, cooldown_sec=0.05)
+    cb.record_failure()
+    assert cb.state == CLOSED and cb.allow()
+    cb.record_failure()
+    assert cb.state == OPEN and cb.is_open
+    assert cb.allow() is False
+
+    time.sleep(0.06)
+    assert cb.allow() is True  # 시험 요청 1건
+    assert cb.state == HALF_OPEN
+    assert cb.allow() is False  # 시험 중에는 다른 요청 거절
+    cb.record_failure()  # 시험 실패 → 다시 열림
+    assert cb.state == OPEN
+
+    time.sleep(0.06)
+    assert cb.allow() is True
+    cb.record_success()
+    assert cb.state == CLOSED and cb.allow()
+    assert cb.stats()["trips"] == 2
+
+
+def test_success_resets_consecutive_failures():
+    cb = CircuitBreaker("test", failure_threshold=2, cooldown_sec=60)
+    cb.record_failure()
+    cb.record_success()
+    cb.record_failure()
+    assert cb.state == CLOSED
+
+
+def test_coupang_fails_fast_when_blocked(tmp_path, monkeypatch):
+    session = DeniedSession()
+    monkeypatch.setattr(coupang_api, "_circuit", CircuitBreaker("coupang", failure_threshold=2, cooldown_sec=60))
+    monkeypatch.setattr(coupang_api, "get_session", lambda *args: session)
+    monkeypatch.setattr(coupang_api, "_get_throttle", lambda key: NoWait())
+    pool = KeyPool("coupang", [("ak", "sk")], db_path=tmp_path / "rate.db")
+    monkeypatch.setattr(coupang_api, "_get_pool", lambda *args: pool)
+
+    for kw in ["a", "b", "c", "d"]:
+        assert coupang_api.search_products(kw, 10, "ak", "sk", use_cache=False) is None
+    assert session.calls == 2  # 두 번 차단된 뒤로는 요청 없이 실패
+    assert coupang_api.circuit_open()
+
+
+def test_retry_queue_roundtrip(tmp_path):
+    db = tmp_path / "retry.db"
+    retry_queue.defer("run", ["a", "b"], "차단 회로", db_path=db)
+    retry_queue.defer("run", ["a"], "차단 회로", db_path=db)
+    retry_queue.defer("other", ["z"], db_path=db)
+    assert retry_queue.pending("run", db_path=db) == ["a", "b"]
+    retry_queue.resolve("run", ["a"], db_path=db)
+    assert retry_queue.pending("run", db_path=db) == ["b"]
+    assert retry_queue.pending("other", db_path=db) == ["z"]
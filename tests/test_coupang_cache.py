@@ -0,0 +1,85 @@
+"""
+유닛 테스트: 쿠팡 검색 응답 캐시 (raw_scrapes 읽기/쓰기 경유)
+"""
+
+import sys
+from pathlib import Path
+
+import functools
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import coupang_api
+from core import product_store
+from core.key_pool import KeyPool
+from database import db
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+    headers: dict = {}
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return FakeResponse({"rCode": "0", "data": {"productData": [{"productId": self.calls}]}})
+
+
+class NoWait:
+    rate = 1.0
+
+    def acquire(self):
+        return 0.0
+
+    def on_success(self):
+        pass
+
+
+@pytest.fixture
+def fake_api(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "raw.db")
+    snap_db = tmp_path / "products.db"
+    monkeypatch.setattr(coupang_api, "save_snapshot", functools.partial(product_store.save_snapshot, db_path=snap_db))
+    monkeypatch.setattr(coupang_api, "has_snapshot", functools.partial(product_store.has_snapshot, db_path=snap_db))
+    session = FakeSession()
+    monkeypatch.setattr(coupang_api, "get_session", lambda *args: session)
+    monkeypatch.setattr(coupang_api, "_get_throttle", lambda key: NoWait())
+    pool = KeyPool("coupang", [("ak", "sk")], db_path=tmp_path / "rate.db")
+    monkeypatch.setattr(coupang_api, "_get_pool", lambda *args: pool)
+    monkeypatch.setattr(coupang_api, "CACHE_TTL_HOURS", 12.0)
+    return session
+
+
+def test_search_products_reads_through_cache(fake_api):
+    first = coupang_api.search_products("물티슈", 10, "ak", "sk")
+    second = coupang_api.search_products("물티슈", 10, "ak", "sk")
+    assert fake_api.calls == 1
+    assert first == second
+    # limit·subId가 다르면 별도 캐시 키
+    coupang_api.search_products("물티슈", 20, "ak", "sk")
+    coupang_api.search_products("물티슈", 10, "ak", "sk", sub_id="other")
+    assert fake_api.calls == 3
+
+
+def test_search_products_bypass_and_expiry(fake_api, monkeypatch):
+    coupang_api.search_products("양말", 10, "ak", "sk")
+    fresh = coupang_api.search_products("양말", 10, "ak", "sk", use_cache=False)
+    assert fake_api.calls == 2
+    # 우회 호출 결과도 기록 → 다음 캐시 조회는 최신 응답
+    assert coupang_api.search_products("양말", 10, "ak", "sk") == fresh
+    monkeypatch.setattr(coupang_api, "CACHE_TTL_HOURS", 0)
+    coupang_api.search_products("양말", 10, "ak", "sk")
+    assert fake_api.calls == 3
@@ -0,0 +1,95 @@
+"""
+유닛 테스트: 데이터랩 월별 트렌드 저장소 (증분 조회 + 앵커 배율 환산)
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import naver_datalab
+
+ANCHOR = "앵커"
+
+
+def _fake_api(calls, volumes):
+    """
+    가짜 데이터랩: 키워드별 실제 검색량(volumes[kw] × 월 번호)을
+    요청 안의 최댓값 = 100으로 정규화해 반환 (실제 API처럼 요청마다 배율이 달라짐)
+    """
+    def fake_request(keywords, start_month, *args):
+        calls.append((list(keywords), start_month))
+        months = naver_datalab.month_range(start_month, naver_datalab.months_ago(0))
+        raw = {kw: {m: volumes[kw] * (i + 1) for i, m in enumerate(months)} for kw in keywords}
+        peak = max(v for series in raw.values() for v in series.values())
+        return {kw: {m: v / peak * 100 for m, v in series.items()} for kw, series in raw.items()}
+    return fake_request
+
+
+def _trends(keywords, start, db, normalize=True):
+    return naver_datalab.get_monthly_trends(
+        keywords, start, "id", "sec", normalize=normalize, anchor=ANCHOR, db_path=db
+    )
+
+
+def test_month_helpers():
+    assert naver_datalab.shift_month("2024-01", -1) == "2023-12"
+    assert naver_datalab.month_range("2023-11", "2024-02") == ["2023-11", "2023-12", "2024-01", "2024-02"]
+
+
+def test_second_call_uses_store(tmp_path, monkeypatch):
+    db = tmp_path / "trend.db"
+    calls = []
+    monkeypatch.setattr(naver_datalab, "_request_trend", _fake_api(calls, {ANCHOR: 10, "a": 5, "b": 1}))
+    first = _trends(["a", "b"], naver_datalab.months_ago(12), db)
+    assert len(calls) == 1
+    assert calls[0][0] == ["a", "b", ANCHOR]
+    assert max(p["ratio"] for p in first["a"]) == 100.0
+    assert len(first["a"]) == 13
+    # 6개월 구간은 이미 받은 1년 구간의 부분집합 → 재요청 없음
+    again = _trends(["a"], naver_datalab.months_ago(6), db)
+    assert len(calls) == 1
+    assert len(again["a"]) == 7
+    assert again["a"][-1]["ratio"] == 100.0
+
+
+def test_anchor_makes_batches_comparable(tmp_path, monkeypatch):
+    db = tmp_path / "trend.db"
+    calls = []
+    volumes = {ANCHOR: 10, "big": 400, "k1": 1, "k2": 1, "k3": 1, "small": 2}
+    monkeypatch.setattr(naver_datalab, "_request_trend", _fake_api(calls, volumes))
+    start = naver_datalab.months_ago(3)
+    _trends(["k1", "k2", "k3", "big"], start, db)
+    _trends(["small"], start, db)  # 다른 묶음(최댓값이 앵커)에서 수집
+    assert all(ANCHOR in kws and len(kws) <= 5 for kws, _ in calls)
+    scaled = _trends(["big", "small"], start, db, normalize=False)
+    assert len(calls) == 2
+    big = scaled["big"][-1]["ratio"]
+    small = scaled["small"][-1]["ratio"]
+    assert abs(big / small - 200) < 1e-6
+
+
+def test_incremental_fetch_keeps_common_scale(tmp_path, monkeypatch):
+    db = tmp_path / "trend.db"
+    calls = []
+    volumes = {ANCHOR: 10, "a": 5, "b": 20}
+    monkeypatch.setattr(naver_datalab, "_request_trend", _fake_api(calls, volumes))
+    start = naver_datalab.months_ago(4)
+    _trends(["a"], start, db)
+    # 이번 달 값이 하루 넘게 지난 부분 집계가 된 상황
+    conn = sqlite3.connect(str(db))
+    with conn:
+        conn.execute("UPDATE datalab_trend SET fetched_at = '2000-01-01 00:00:00' WHERE month = ?",
+                     (naver_datalab.months_ago(0),))
+    conn.close()
+    result = _trends(["a", "b"], start, db, normalize=False)
+    # b는 처음이라 구간 전체, a는 이번 달만 필요 → 한 묶음 (앵커 겹침 달 포함)
+    assert calls[-1] == (["b", "a", ANCHOR], start)
+    assert abs(result["b"][-1]["ratio"] / result["a"][-1]["ratio"] - 4) < 1e-6
+    assert abs(result["a"][0]["ratio"] / result["a"][-1]["ratio"] - 1 / 5) < 1e-6
+
+
+def test_failed_request_excluded(tmp_path, monkeypatch):
+    monkeypatch.setattr(naver_datalab, "_request_trend", lambda *args: None)
+    assert _trends(["a"], "2024-01", tmp_path / "t.db") == {}
@@ -0,0 +1,113 @@
+"""
+유닛 테스트: 실행 마감 전파 (timeout 단축·재시도 대기 중단), 느린 호출 헤지 (p95 초과 시 추가 요청, 예산 확인)
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import deadline
+from core.rate_limit import TokenBucket
+
+
+def _warm(latency: deadline.LatencyTracker, seconds: float = 0.01) -> None:
+    for _ in range(deadline.HEDGE_MIN_SAMPLES):
+        latency.record(seconds)
+
+
+def test_run_deadline_caps_timeouts():
+    assert deadline.remaining() is None
+    assert deadline.timeout_for(15) == 15
+    with deadline.run_deadline(5):
+        assert deadline.timeout_for(15) <= 5
+        assert deadline.timeout_for(2) == 2
+        with deadline.run_deadline(60):  # 바깥의 더 이른 마감 유지
+            assert deadline.remaining() <= 5
+    assert deadline.remaining() is None
+
+    with deadline.run_deadline(0.05):
+        started = time.monotonic()
+        assert deadline.sleep(10) is False  # 마감에서 끊김
+        assert time.monotonic() - started < 1
+        assert deadline.expired()
+        assert deadline.timeout_for(15) == deadline.MIN_TIMEOUT_SEC
+
+
+def test_deadlines_are_isolated_per_thread():
+    entered = threading.Barrier(2)
+    seen = {}
+
+    def stage(name, seconds, hold):
+        with deadline.run_deadline(seconds):
+            entered.wait()
+            time.sleep(hold)  # 먼저 들어간 쪽이 먼저 끝나지 않도록 순서를 뒤섞음
+            seen[name] = deadline.remaining()
+        seen[name + "_after"] = deadline.remaining()
+
+    threads = [
+        threading.Thread(target=stage, args=("short", 5, 0.1)),
+        threading.Thread(target=stage, args=("long", 60, 0.0)),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert seen["short"] <= 5 and 5 < seen["long"] <= 60
+    assert seen["short_after"] is None and seen["long_after"] is None
+    assert deadline.remaining() is None
+
+
+def test_propagate_carries_deadline_into_workers():
+    from concurrent.futures import ThreadPoolExecutor
+    with deadline.run_deadline(5), ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(deadline.remaining).result() is None  # 워커 스레드는 따로
+        assert pool.submit(deadline.propagate(deadline.remaining)).result() <= 5
+        assert pool.submit(deadline.remaining).result() is None  # 워커 재사용 시 남지 않음
+
+
+def test_hedge_sends_backup_after_p95(monkeypatch):
+    monkeypatch.setattr(deadline, "HEDGE_MIN_DELAY_SEC", 0.05)
+    latency = deadline.LatencyTracker("test")
+    _warm(latency)
+    calls = []
+    lock = threading.Lock()
+
+    def slow_then_fast():
+        with lock:
+            calls.append(1)
+            n = len(calls)
+        time.sleep(2 if n == 1 else 0.01)  # 첫 요청만 멈춤
+        return n
+
+    started = time.monotonic()
+    assert deadline.hedged(slow_then_fast, latency, lambda: True) == 2
+    assert time.monotonic() - started < 1
+    assert latency.hedged == 1 and latency.hedge_wins == 1
+
+
+def test_hedge_respects_budget(monkeypatch):
+    monkeypatch.setattr(deadline, "HEDGE_MIN_DELAY_SEC", 0.05)
+    latency = deadline.LatencyTracker("test")
+    _warm(latency)
+    bucket = TokenBucket(rate=0.1, burst=1)
+    assert bucket.try_acquire() is True
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "ok"
+
+    # 남은 토큰이 없으면 추가 요청 없이 원래 요청을 기다림
+    assert deadline.hedged(slow, latency, bucket.try_acquire) == "ok"
+    assert len(calls) == 1 and latency.hedged == 0
+
+
+def test_no_hedge_without_samples():
+    latency = deadline.LatencyTracker("test")
+    assert latency.p95() is None
+    assert deadline.hedged(lambda: threading.current_thread().name, latency) == threading.current_thread().name
+    assert len(latency) == 1
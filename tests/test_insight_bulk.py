@@ -0,0 +1,59 @@
+"""
+유닛 테스트: 쇼핑 인사이트 일괄 수집 (페이지 크기 상한 자동 맞춤, 카테고리·페이지 동시 요청, 2차 카테고리 확장)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import naver_shopping_insight_scraper as insight
+
+
+class FakeEndpoint:
+    """페이지당 최대 20개만 돌려주는 순위 API + 하위 카테고리 API"""
+
+    CAP = 20
+
+    def __init__(self, sizes: dict[str, int]):
+        self.sizes = sizes  # cid → 전체 키워드 수
+        self.requests: list[tuple] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, data, label):
+        with self.lock:
+            self.requests.append((url, dict(data)))
+        if url == insight.CATEGORY_URL:
+            return {"childList": [{"cid": f"{data['cid']}-{i}", "name": f"하위{i}"} for i in range(2)]}
+        count = min(int(data["count"]), self.CAP)
+        start = (int(data["page"]) - 1) * count
+        total = self.sizes.get(data["cid"], 0)
+        return {"ranks": [
+            {"keyword": f"{data['cid']}_{r}", "rank": r}
+            for r in range(start + 1, min(total, start + count) + 1)
+        ]}
+
+
+def test_scrape_categories_adapts_to_page_cap(monkeypatch):
+    fake = FakeEndpoint({"A": 120, "B": 30, "C": 0})
+    monkeypatch.setattr(insight, "_post", fake)
+    result = insight.scrape_categories([("가", "A"), ("나", "B"), ("다", "C")], "2024-01-01", "2024-01-07", max_keywords=50)
+
+    assert [r["rank"] for r in result["A"]] == list(range(1, 51))
+    assert [r["keyword"] for r in result["B"]] == [f"B_{r}" for r in range(1, 31)]
+    assert result["C"] == []
+    first_counts = {d["cid"]: d["count"] for _, d in fake.requests if d["page"] == "1"}
+    assert first_counts == {"A": str(insight.PAGE_SIZE), "B": str(insight.PAGE_SIZE), "C": str(insight.PAGE_SIZE)}
+    # 첫 응답 크기(20)로 나머지 페이지 요청: A는 2·3페이지, B는 2·3페이지(3페이지 빈 응답), C는 추가 요청 없음
+    later = sorted((d["cid"], d["page"], d["count"]) for _, d in fake.requests if d["page"] != "1")
+    assert later == [("A", "2", "20"), ("A", "3", "20"), ("B", "2", "20"), ("B", "3", "20")]
+
+
+def test_expand_categories(monkeypatch):
+    monkeypatch.setattr(insight, "_post", FakeEndpoint({}))
+    expanded = insight.expand_categories([("패션의류", "1"), ("식품", "2")])
+    assert expanded == [
+        ("패션의류", "1"), ("패션의류>하위0", "1-0"), ("패션의류>하위1", "1-1"),
+        ("식품", "2"), ("식품>하위0", "2-0"), ("식품>하위1", "2-1"),
+    ]
@@ -0,0 +1,77 @@
+"""
+유닛 테스트: 쇼핑 인사이트 키워드 색인 (기간당 한 번 수집, 단건 조회는 요청 없음, 디스크 공유)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import db
+from scrapers import naver_insight
+from scrapers.naver_insight import NaverInsightScraper
+
+
+class FakeResponse:
+    def __init__(self, ranks):
+        self._ranks = ranks
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"ranks": self._ranks}
+
+
+class FakePost:
+    """카테고리마다 키워드 30개 (두 카테고리 모두 '공통' 포함)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, url, headers=None, data=None, timeout=None):
+        self.calls += 1
+        cid, page, count = data["cid"], int(data["page"]), int(data["count"])
+        words = ["공통"] + [f"{cid}_{i}" for i in range(2, 31)]
+        start = (page - 1) * count
+        return FakeResponse([
+            {"keyword": kw, "rank": start + i + 1, "rankChange": "▲1"}
+            for i, kw in enumerate(words[start : start + count])
+        ])
+
+
+def _scraper(monkeypatch, tmp_path):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "raw.db")
+    post = FakePost()
+    monkeypatch.setattr(naver_insight.requests, "post", post)
+    return NaverInsightScraper(delay_min=0, delay_max=0), post
+
+
+def test_keyword_lookups_share_one_index(tmp_path, monkeypatch):
+    scraper, post = _scraper(monkeypatch, tmp_path)
+    assert scraper.scrape_keyword("50000008_5") == {"category": "생활/주방", "rank": 5, "change_trend": "▲1"}
+    calls = post.calls
+    assert calls == 4  # 카테고리 2개 × 2페이지 (20 + 10)
+    assert scraper.scrape_keyword("50000003_30")["rank"] == 30
+    assert scraper.scrape_keyword("공통")["category"] == "생활/주방"
+    assert scraper.scrape_keyword("없는키워드") == {}
+    assert post.calls == calls
+
+
+def test_category_top_reuses_fetched_rows(tmp_path, monkeypatch):
+    scraper, post = _scraper(monkeypatch, tmp_path)
+    top = scraper.scrape_category_top("생활/주방", "50000008", limit=10)
+    assert [r["rank"] for r in top] == list(range(1, 11))
+    scraper.scrape_keyword("공통")
+    again = scraper.scrape_category_top("생활/주방", "50000008", limit=30)
+    assert len(again) == 30
+    assert post.calls == 1 + 2 + 2  # 첫 TOP10, 색인 때 생활/주방 재요청·디지털/가전, 이후 요청 없음
+
+
+def test_index_persists_across_instances(tmp_path, monkeypatch):
+    scraper, post = _scraper(monkeypatch, tmp_path)
+    scraper.scrape_keyword("공통")
+    other = NaverInsightScraper(delay_min=0, delay_max=0)
+    before = post.calls
+    assert other.scrape_keyword("50000003_7")["rank"] == 7
+    assert post.calls == before
@@ -0,0 +1,105 @@
+"""
+유닛 테스트: API 키 풀 (순환 분산, 일일 한도, 한도 초과 시 다른 키로 전환)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import coupang_api
+from core import rate_limit
+from core.key_pool import KeyPool, key_id, normalize_keys
+
+
+class NoWait:
+    rate = 1.0
+
+    def acquire(self):
+        return 0.0
+
+    def on_success(self):
+        pass
+
+    def on_throttle(self, retry_after=None):
+        pass
+
+
+def test_normalize_keys():
+    keys = normalize_keys([("a", "1"), ["a", "1"], ("", "x"), {"id": "b", "secret": "2"}])
+    assert keys == [("a", "1"), ("b", "2")]
+
+
+def test_pool_reuses_the_rate_state_connection(tmp_path):
+    db = tmp_path / "rate.db"
+    pool = KeyPool("test", [("a", "1")], db_path=db)
+    pool.pick()
+    conn = rate_limit._state_connection(db)
+    assert pool.charge(("a", "1")) and pool.pick() == ("a", "1")
+    assert rate_limit._state_connection(db) is conn  # 호출마다 새로 연결하지 않음
+    assert pool.usage()[key_id(("a", "1"))]["used"] == 3
+
+
+def test_round_robin_and_daily_quota(tmp_path):
+    pool = KeyPool("test", [("a", "1"), ("b", "2")], daily_quota=2, db_path=tmp_path / "rate.db")
+    picks = [pool.pick() for _ in range(4)]
+    assert picks == [("a", "1"), ("b", "2"), ("a", "1"), ("b", "2")]
+    assert pool.pick() is None  # 두 키 모두 한도 도달
+    usage = pool.usage()
+    assert usage[key_id(("a", "1"))]["used"] == 2
+    # 같은 DB를 쓰는 다른 프로세스(풀)도 사용량 공유
+    other = KeyPool("test", [("a", "1")], daily_quota=2, db_path=tmp_path / "rate.db")
+    assert other.pick() is None
+
+
+def test_cooldown_and_exhausted_skip_key(tmp_path):
+    pool = KeyPool("test", [("a", "1"), ("b", "2")], db_path=tmp_path / "rate.db")
+    pool.cooldown(("a", "1"), 60)
+    assert [pool.pick() for _ in range(3)] == [("b", "2")] * 3
+    pool.mark_exhausted(("b", "2"))
+    assert pool.pick() == ("a", "1")  # 모두 쉬는 중이면 쉬는 키라도 사용
+    pool.mark_exhausted(("a", "1"))
+    assert pool.pick() is None
+
+
+class FakeResponse:
+    def __init__(self, status, data=None):
+        self.status_code = status
+        self._data = data
+        self.text = ""
+        self.headers = {}
+
+    def json(self):
+        return self._data
+
+
+class ThrottledFirstKey:
+    """access-key=a 요청은 429, 나머지는 정상 응답"""
+
+    def __init__(self):
+        self.keys_used = []
+
+    def get(self, url, headers=None, **kwargs):
+        access = headers["Authorization"].split("access-key=")[1].split(",")[0]
+        self.keys_used.append(access)
+        if access == "a":
+            return FakeResponse(429)
+        return FakeResponse(200, {"rCode": "0", "data": {"productData": [{"productId": 1}]}})
+
+
+def test_search_products_fails_over_to_next_key(tmp_path, monkeypatch):
+    session = ThrottledFirstKey()
+    pool = KeyPool("coupang", [("a", "1"), ("b", "2")], db_path=tmp_path / "rate.db")
+    monkeypatch.setattr(coupang_api, "_get_pool", lambda *args: pool)
+    monkeypatch.setattr(coupang_api, "_get_throttle", lambda key: NoWait())
+    monkeypatch.setattr(coupang_api, "get_session", lambda *args: session)
+    monkeypatch.setattr(coupang_api, "record_snapshot", lambda *args, **kwargs: None)
+    monkeypatch.setattr(coupang_api, "cache_put", lambda *args: None)
+
+    data = coupang_api.search_products("물티슈", 10, "a", "1", use_cache=False)
+    assert data is not None
+    assert session.keys_used == ["a", "b"]
+    # a는 쉬는 중 → 다음 요청은 곧바로 b
+    coupang_api.search_products("양말", 10, "a", "1", use_cache=False)
+    assert session.keys_used[-1] == "b"
+    assert len(session.keys_used) == 3
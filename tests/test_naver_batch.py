@@ -0,0 +1,103 @@
+"""
+유닛 테스트: keywordstool 묶음 조회 → 입력 키워드 매핑
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import naver_api
+from core import volume_store
+from core.volume_cache import VolumeCache
+
+
+@pytest.fixture(autouse=True)
+def temp_volume_store(tmp_path, monkeypatch):
+    """검색량 캐시를 테스트용 임시 DB로 교체"""
+    db = tmp_path / "volume.db"
+    monkeypatch.setattr(naver_api, "_cache", VolumeCache(ttl_days=7, db_path=db))
+    return db
+
+
+def test_get_monthly_search_volumes_maps_rel_keywords(monkeypatch):
+    calls = []
+
+    def fake_request(hints, *args):
+        calls.append(list(hints))
+        return [
+            {"relKeyword": "물티슈", "monthlyPcQcCnt": 100, "monthlyMobileQcCnt": 900},
+            {"relKeyword": "아기물티슈", "monthlyPcQcCnt": "<10", "monthlyMobileQcCnt": "1,000"},
+            {"relKeyword": "NIKE양말", "monthlyPcQcCnt": 10, "monthlyMobileQcCnt": 20},
+        ]
+
+    monkeypatch.setattr(naver_api, "_request_keywordstool", fake_request)
+    result = naver_api.get_monthly_search_volumes(["물티슈", "아기 물티슈", "nike양말"], "c", "l", "s")
+    assert result == {"물티슈": 1000.0, "아기 물티슈": 1005.0, "nike양말": 30.0}
+    assert len(calls) == 1
+
+
+def test_get_monthly_search_volumes_batches_of_five(monkeypatch):
+    calls = []
+
+    def fake_request(hints, *args):
+        calls.append(list(hints))
+        return [{"relKeyword": h, "monthlyPcQcCnt": 1, "monthlyMobileQcCnt": 1} for h in hints]
+
+    monkeypatch.setattr(naver_api, "_request_keywordstool", fake_request)
+    keywords = [f"키워드{i}" for i in range(12)]
+    result = naver_api.get_monthly_search_volumes(keywords, "c", "l", "s")
+    assert [len(c) for c in calls] == [5, 5, 2]
+    assert all(v == 2.0 for v in result.values())
+
+
+def test_get_monthly_search_volumes_failed_batch(monkeypatch):
+    monkeypatch.setattr(naver_api, "_request_keywordstool", lambda hints, *args: None)
+    assert naver_api.get_monthly_search_volumes(["a", "b"], "c", "l", "s") == {"a": None, "b": None}
+
+
+def test_get_monthly_search_volumes_reads_store_first(monkeypatch):
+    calls = []
+
+    def fake_request(hints, *args):
+        calls.append(list(hints))
+        return [
+            {"relKeyword": "물티슈", "monthlyPcQcCnt": 100, "monthlyMobileQcCnt": 900},
+            {"relKeyword": "캡리스물티슈", "monthlyPcQcCnt": 10, "monthlyMobileQcCnt": 40},
+        ]
+
+    monkeypatch.setattr(naver_api, "_request_keywordstool", fake_request)
+    naver_api.get_monthly_search_volumes(["물티슈"], "c", "l", "s")
+    # 연관어로 받은 키워드 + 이미 조회한 키워드 → API 재호출 없음
+    result = naver_api.get_monthly_search_volumes(["캡리스 물티슈", "물티슈"], "c", "l", "s")
+    assert result == {"캡리스 물티슈": 50.0, "물티슈": 1000.0}
+    assert len(calls) == 1
+    assert naver_api.get_monthly_search_volume("캡리스물티슈", "c", "l", "s") == 50.0
+    assert len(calls) == 1
+
+
+def test_volume_store_respects_max_age(temp_volume_store):
+    volume_store.save_volumes([{"keyword": "양말", "pc_volume": 1, "mobile_volume": 2}], db_path=temp_volume_store)
+    assert volume_store.get_volumes(["양말"], 1, db_path=temp_volume_store) == {"양말": 3.0}
+    assert volume_store.get_volumes(["양말"], -1, db_path=temp_volume_store) == {}
+
+
+def test_volume_cache_memory_and_disk_stats(temp_volume_store):
+    cache = VolumeCache(ttl_days=7, db_path=temp_volume_store)
+    cache.save_rows([{"keyword": "텀블러", "pc_volume": 10, "mobile_volume": 90}])
+    assert cache.get("텀블러") == 100.0  # 메모리 적중
+    fresh = VolumeCache(ttl_days=7, db_path=temp_volume_store)  # 다른 프로세스 역할
+    assert fresh.get_many(["텀블러", "없는키워드"]) == {"텀블러": 100.0}
+    assert fresh.get("텀블러") == 100.0
+    stats = fresh.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_volume_cache_lru_eviction(temp_volume_store):
+    cache = VolumeCache(ttl_days=7, max_entries=2, db_path=temp_volume_store)
+    for kw in ("a", "b", "c"):
+        cache.put(kw, 1)
+    assert cache.get("a") is None  # 밀려남 (put은 메모리 전용)
+    assert cache.get("c") == 1.0
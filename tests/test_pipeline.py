@@ -0,0 +1,107 @@
+"""
+유닛 테스트: 파이프라인 DAG (입력 해시가 같으면 건너뜀, 바뀐 단계와 하위만 재실행, 실패 전파, 독립 가지 병렬)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import pipeline
+from core.pipeline import BLOCKED, FAILED, RAN, SKIPPED, Stage
+
+
+def _copy_stage(base: Path, name: str, src: str, dst: str, deps=(), calls=None):
+    def work():
+        if calls is not None:
+            calls.append(name)
+        (base / dst).write_text((base / src).read_text() + f"|{name}", encoding="utf-8")
+    return Stage(name, func=work, inputs=(src,), outputs=(dst,), deps=deps)
+
+
+def _graph(base: Path, calls: list):
+    return [
+        _copy_stage(base, "a", "seed.txt", "a.txt", calls=calls),
+        _copy_stage(base, "b", "a.txt", "b.txt", deps=("a",), calls=calls),
+        _copy_stage(base, "c", "side.txt", "c.txt", deps=("a",), calls=calls),
+    ]
+
+
+def test_skips_unchanged_and_reruns_affected(tmp_path):
+    (tmp_path / "seed.txt").write_text("1")
+    (tmp_path / "side.txt").write_text("x")
+    db = tmp_path / "state.db"
+    calls: list = []
+
+    status = pipeline.run(_graph(tmp_path, calls), base=tmp_path, db_path=db)
+    assert status == {"a": RAN, "b": RAN, "c": RAN}
+
+    calls.clear()
+    status = pipeline.run(_graph(tmp_path, calls), base=tmp_path, db_path=db)
+    assert status == {"a": SKIPPED, "b": SKIPPED, "c": SKIPPED} and calls == []
+
+    # seed만 바뀜 → a, b 재실행 / c(입력 side.txt)는 건너뜀
+    (tmp_path / "seed.txt").write_text("2")
+    status = pipeline.run(_graph(tmp_path, calls), base=tmp_path, db_path=db)
+    assert status == {"a": RAN, "b": RAN, "c": SKIPPED}
+
+    # 출력이 지워지면 다시 실행, force도 다시 실행
+    (tmp_path / "c.txt").unlink()
+    status = pipeline.run(_graph(tmp_path, calls), base=tmp_path, db_path=db, force=["b"])
+    assert status == {"a": SKIPPED, "b": RAN, "c": RAN}
+
+
+def test_in_place_stage_is_skipped_next_time(tmp_path):
+    (tmp_path / "data.txt").write_text("b\na")
+    db = tmp_path / "state.db"
+
+    def sort_file():
+        path = tmp_path / "data.txt"
+        path.write_text("\n".join(sorted(path.read_text().split("\n"))))
+
+    stages = [Stage("sort", func=sort_file, inputs=("data.txt",), outputs=("data.txt",))]
+    assert pipeline.run(stages, base=tmp_path, db_path=db) == {"sort": RAN}
+    assert pipeline.run(stages, base=tmp_path, db_path=db) == {"sort": SKIPPED}
+
+
+def test_failure_blocks_dependents_only(tmp_path):
+    (tmp_path / "seed.txt").write_text("1")
+    (tmp_path / "side.txt").write_text("x")
+
+    def boom():
+        raise RuntimeError("차단")
+
+    stages = [
+        Stage("a", func=boom, inputs=("seed.txt",)),
+        _copy_stage(tmp_path, "b", "seed.txt", "b.txt", deps=("a",)),
+        _copy_stage(tmp_path, "c", "side.txt", "c.txt"),
+    ]
+    status = pipeline.run(stages, base=tmp_path, db_path=tmp_path / "state.db")
+    assert status == {"a": FAILED, "b": BLOCKED, "c": RAN}
+
+
+def test_independent_branches_run_in_parallel(tmp_path):
+    barrier = threading.Barrier(3, timeout=5)  # 세 가지가 동시에 실행 중이어야 통과
+    stages = [Stage("root", func=lambda: None)] + [
+        Stage(name, func=barrier.wait, deps=("root",), params={"n": name}) for name in ("x", "y", "z")
+    ]
+    status = pipeline.run(stages, base=tmp_path, db_path=tmp_path / "state.db", workers=3)
+    assert set(status.values()) == {RAN}
+
+
+def test_plan_orders_targets_and_rejects_cycles():
+    stages = [Stage("a", func=print), Stage("b", func=print, deps=("a",)), Stage("c", func=print, deps=("b",))]
+    assert [s.name for s in pipeline.plan(stages, ["b"])] == ["a", "b"]
+    with pytest.raises(ValueError):
+        pipeline.plan([Stage("a", func=print, deps=("b",)), Stage("b", func=print, deps=("a",))])
+    with pytest.raises(ValueError):
+        pipeline.plan(stages, ["nope"])
+
+
+def test_default_stages_form_a_dag():
+    order = [s.name for s in pipeline.plan(pipeline.default_stages())]
+    assert order.index("trending") < order.index("niche_test") < order.index("seasonal")
+    assert order.index("wholesale") < order.index("credibility")
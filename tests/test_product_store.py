@@ -0,0 +1,65 @@
+"""
+유닛 테스트: 쿠팡 상품 스냅샷 저장소 (수집 1회당 저장, SQL 집계, 상품ID 중복 제거)
+"""
+
+import functools
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import coupang_api
+from core import product_store
+
+
+def _row(pid, price, rocket=False):
+    return {"product_id": pid, "name": f"상품{pid}", "price": price, "is_rocket": rocket}
+
+
+def test_keyword_stats_latest_fetches_dedup(tmp_path):
+    db = tmp_path / "p.db"
+    product_store.save_snapshot("물티슈", [_row("1", 1000, True), _row("2", 3000)], db_path=db)
+    product_store.save_snapshot("물티슈", [_row("2", 5000), _row("3", 2000, True), _row("", None)], db_path=db)
+
+    latest = product_store.keyword_stats(["물티슈"], db_path=db)["물티슈"]
+    assert latest["fetches"] == 1
+    assert latest["total_products"] == 3
+    assert latest["rocket_count"] == 1
+    assert (latest["min_price"], latest["max_price"], latest["avg_price"]) == (2000, 5000, 3500)
+
+    # 최근 2회 병합: 상품 2는 최신 가격(5000)으로 한 번만 집계
+    merged = product_store.keyword_stats(["물티슈"], fetches=2, db_path=db)["물티슈"]
+    assert merged["total_products"] == 4
+    assert merged["rocket_count"] == 2
+    assert merged["price_range"] == 4000
+    assert merged["avg_price"] == round((1000 + 5000 + 2000) / 3, 0)
+
+
+def test_keyword_stats_missing_and_empty_fetch(tmp_path):
+    db = tmp_path / "p.db"
+    product_store.save_snapshot("양말", [], db_path=db)
+    stats = product_store.keyword_stats(["양말", "없는키워드"], db_path=db)
+    assert stats["양말"]["fetches"] == 1
+    assert stats["양말"]["total_products"] == 0
+    assert stats["없는키워드"] == product_store.empty_stats()
+    assert product_store.has_snapshot("양말", 1, db_path=db)
+    assert not product_store.has_snapshot("없는키워드", 1, db_path=db)
+
+
+def test_record_snapshot_parses_response(tmp_path, monkeypatch):
+    db = tmp_path / "p.db"
+    monkeypatch.setattr(coupang_api, "save_snapshot", functools.partial(product_store.save_snapshot, db_path=db))
+    monkeypatch.setattr(coupang_api, "has_snapshot", functools.partial(product_store.has_snapshot, db_path=db))
+    js = {"data": {"productData": [
+        {"productId": 10, "productName": "로켓 물티슈", "productPrice": "4900"},
+        {"productId": 11, "productName": "물티슈", "productPrice": 3900, "isRocket": False},
+        "잘못된 항목",
+    ]}}
+    coupang_api.record_snapshot("물티슈", js)
+    coupang_api.record_snapshot("물티슈", js, from_cache=True)  # 이미 수집 기록 있음 → 저장 생략
+
+    rows = product_store.load_products("물티슈", fetches=5, db_path=db)
+    assert [(r["product_id"], r["price"], r["is_rocket"], r["rank_position"]) for r in rows] == [
+        ("10", 4900, 1, 1),
+        ("11", 3900, 0, 2),
+    ]
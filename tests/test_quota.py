@@ -0,0 +1,51 @@
+"""
+유닛 테스트: API 일일 한도 장부·호출 예산 계획 (우선순위 배분, 캐시 적중 제외, 남은 한도 집계)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import quota
+from core.key_pool import KeyPool
+
+
+def test_stage_needed_excludes_cache_hits():
+    stage = quota.Stage("검색량", "naver_searchad", ["a", "b", "c", "d", "e", "f", "g"], ["b", "c", "d", "e", "f", "g"], per_call=5)
+    assert stage.pending == ["b", "c", "d", "e", "f", "g"]
+    assert stage.needed == 2  # 6개 / 묶음 5개
+
+
+def test_plan_priority_and_keyword_order():
+    kws = [f"k{i}" for i in range(10)]
+    high = quota.Stage("상위", "coupang", kws[:4], kws[:4], priority=0)
+    low = quota.Stage("하위", "coupang", kws, kws[1:], priority=1)  # k0은 캐시 적중
+    other = quota.Stage("다른 API", "naver_datalab", kws, kws, per_call=4)
+    quota.plan([low, high, other], {"coupang": 6, "naver_datalab": None})
+
+    assert high.granted == 4 and high.skipped == []
+    # 남은 2회 → 앞쪽 미적중 키워드 2개 + 캐시 적중 k0
+    assert low.granted == 2
+    assert low.allowed == ["k0", "k1", "k2"]
+    assert low.skipped == kws[3:]
+    # 무제한 API는 필요한 만큼 배정
+    assert other.granted == 3 and other.allowed == kws
+    assert "하위 7개 제외" in quota.format_plan([high, low], {"coupang": 6})
+
+
+def test_quota_status_counts_ledger(tmp_path, monkeypatch):
+    db = tmp_path / "rate.db"
+    monkeypatch.setattr(quota, "_configured_keys", lambda api: ([("a", "1"), ("b", "2")], 3))
+    pool = KeyPool("coupang", [("a", "1"), ("b", "2")], daily_quota=3, db_path=db)
+    pool.pick()
+    pool.pick()
+    pool.mark_exhausted(("b", "2"))
+
+    status = quota.quota_status("coupang", db_path=db)
+    assert status == {"used": 2, "limit": 6, "remaining": 2, "keys": 2}
+    assert quota.format_status("coupang", status) == "쿠팡 2/6"
+    assert quota.remaining_by_api(["coupang"], db_path=db) == {"coupang": 2}
+
+    monkeypatch.setattr(quota, "_configured_keys", lambda api: ([("a", "1")], 0))
+    assert quota.quota_status("coupang", db_path=db)["remaining"] is None
@@ -0,0 +1,117 @@
+"""
+유닛 테스트: 토큰 버킷 속도 제어 / AIMD 적응 제어
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import rate_limit
+from core.rate_limit import AimdController, SharedTokenBucket, TokenBucket, load_rate, parse_retry_after, save_rate
+
+
+def test_token_bucket_burst_then_wait():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    wait = bucket.reserve()
+    assert 0.05 < wait <= 0.1
+
+
+def test_token_bucket_queues_in_order():
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.reserve()
+    first = bucket.reserve()
+    second = bucket.reserve()
+    assert second > first
+
+
+def test_token_bucket_set_rate():
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.reserve()
+    bucket.set_rate(100)
+    assert bucket.reserve() <= 0.02
+
+
+def test_aimd_increase_and_decrease():
+    bucket = TokenBucket(rate=1.0, burst=1)
+    ctrl = AimdController("test", bucket, min_rate=0.2, max_rate=1.2, increase=0.1, state_db=None)
+    ctrl.on_success()
+    assert abs(ctrl.rate - 1.1) < 1e-9
+    ctrl.on_success()
+    ctrl.on_success()
+    assert ctrl.rate == 1.2  # 상한
+    ctrl.on_throttle()
+    assert abs(ctrl.rate - 0.6) < 1e-9
+    ctrl.on_throttle()  # 같은 혼잡 구간 → 추가 감소 없음
+    assert abs(ctrl.rate - 0.6) < 1e-9
+
+
+def test_aimd_persists_rate(tmp_path):
+    db = tmp_path / "state.db"
+    ctrl = AimdController("coupang", TokenBucket(rate=2.0), min_rate=0.1, max_rate=5, state_db=db)
+    ctrl.on_throttle()
+    assert load_rate("coupang", db) == 1.0
+    restarted = AimdController("coupang", TokenBucket(rate=2.0), min_rate=0.1, max_rate=5, state_db=db)
+    restarted.acquire()
+    assert restarted.rate == 1.0
+
+
+def test_shared_bucket_budget_across_instances(tmp_path):
+    db = tmp_path / "rate.db"
+    a = SharedTokenBucket("coupang:k1", rate=10, burst=2, db_path=db)
+    b = SharedTokenBucket("coupang:k1", rate=10, burst=2, db_path=db)  # 다른 프로세스 역할
+    assert a.reserve() == 0.0
+    assert b.reserve() == 0.0
+    assert a.reserve() > 0  # 두 인스턴스가 burst 2개를 나눠 씀
+    other_key = SharedTokenBucket("coupang:k2", rate=10, burst=2, db_path=db)
+    assert other_key.reserve() == 0.0
+
+
+def test_shared_bucket_rate_is_shared(tmp_path):
+    db = tmp_path / "rate.db"
+    a = SharedTokenBucket("naver", rate=4, burst=1, db_path=db)
+    b = SharedTokenBucket("naver", rate=4, burst=1, db_path=db)
+    a.reserve()
+    ctrl = AimdController("naver", a, min_rate=0.5, max_rate=10, state_db=None)
+    ctrl.on_throttle()
+    b.reserve()
+    assert b.rate == 2.0
+
+
+def test_shared_bucket_clamps_saved_rate_to_config(tmp_path):
+    db = tmp_path / "rate.db"
+    save_rate("coupang:k1", 4.0, db)  # 지난 실행에서 학습한 속도
+    bucket = SharedTokenBucket("coupang:k1", rate=1.0, db_path=db)  # 설정을 낮춤
+    bucket.reserve()
+    assert load_rate("coupang:k1", db) == 1.0 and bucket.rate == 1.0
+    SharedTokenBucket("coupang:k1", rate=3.0, db_path=db)  # 상한보다 낮은 학습값은 유지
+    assert load_rate("coupang:k1", db) == 1.0
+
+
+def test_shared_bucket_reuses_connection_per_thread(tmp_path):
+    db = tmp_path / "rate.db"
+    bucket = SharedTokenBucket("naver", rate=4, burst=1, db_path=db)
+    bucket.reserve()
+    conn = rate_limit._state_connection(db)
+    bucket.reserve()
+    ctrl = AimdController("naver", bucket, min_rate=0.5, max_rate=4, state_db=None)
+    ctrl.on_success()  # 이미 상한 → 쓰기 없음
+    assert rate_limit._state_connection(db) is conn and bucket.rate == 4
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+if __name__ == "__main__":
+    test_token_bucket_burst_then_wait()
+    test_token_bucket_queues_in_order()
+    test_token_bucket_set_rate()
+    test_aimd_increase_and_decrease()
+    test_parse_retry_after()
+    print("All rate limit tests passed.")
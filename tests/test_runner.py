@@ -0,0 +1,168 @@
+"""
+유닛 테스트: run_workflow 처리 (네이버·쿠팡 동시 조회 → 키워드별 합쳐 일괄 저장)
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import coupang_api
+from core import runner
+
+CFG = {"customer_id": "c", "license_key": "l", "secret_key": "s"}
+
+
+def _rows(n):
+    return [{"keyword": f"kw{i}", "category": "생활", "rank": str(i + 1), "change_trend": "▲1"} for i in range(n)]
+
+
+def _setup(monkeypatch, volume_delay=0.05, coupang_delay=0.05, missed=()):
+    batches = []
+    active = {"naver": 0, "coupang": 0, "both": False}
+    lock = threading.Lock()
+
+    def track(kind, delay):
+        with lock:
+            active[kind] += 1
+            if active["naver"] and active["coupang"]:
+                active["both"] = True
+        time.sleep(delay)
+        with lock:
+            active[kind] -= 1
+
+    def fake_volumes(keywords, cfg):
+        track("naver", volume_delay)
+        return {kw: (None if kw in missed else 100.0) for kw in keywords}, {kw for kw in keywords if kw in missed}
+
+    def fake_coupang(kw):
+        track("coupang", coupang_delay)
+        return {"rocket_count": 2, "avg_price": 15000, "total_products": 10}
+
+    monkeypatch.setattr(runner, "_fetch_volumes", fake_volumes)
+    monkeypatch.setattr(runner, "run_coupang_analyzer", fake_coupang)
+    monkeypatch.setattr(runner, "save_batch", lambda products, market: batches.append((products, market)))
+    monkeypatch.setattr(coupang_api, "circuit_open", lambda: False)
+    return batches, active
+
+
+def test_naver_and_coupang_run_concurrently_and_join(monkeypatch):
+    batches, active = _setup(monkeypatch)
+    rows = _rows(12)
+    keywords = [r["keyword"] for r in rows]
+    done, deferred, volumes, _, _ = runner._process_rows(rows, CFG, keywords, set(keywords[:10]))
+
+    assert sorted(done) == sorted(keywords) and deferred == []
+    assert active["both"]  # 검색량과 쿠팡 호출이 겹쳐서 진행됨
+    products = [p for ps, _ in batches for p in ps]
+    market = [m for _, ms in batches for m in ms]
+    assert len(products) == 12 and all(p["naver_search_vol"] == 100.0 for p in products)
+    assert sorted(m["keyword"] for m in market) == sorted(keywords[:10])  # 한도 밖 2개는 Products만
+    assert all(len(ps) <= runner.WRITE_BATCH_SIZE for ps, _ in batches)
+
+
+def test_volume_miss_defers_row(monkeypatch):
+    batches, _ = _setup(monkeypatch, volume_delay=0, coupang_delay=0, missed={"kw1"})
+    rows = _rows(3)
+    keywords = [r["keyword"] for r in rows]
+    done, deferred, _, missed, _ = runner._process_rows(rows, CFG, keywords, set(keywords))
+    assert sorted(done) == ["kw0", "kw2"]
+    assert [r["keyword"] for r in deferred] == ["kw1"] and missed == {"kw1"}
+    assert len(batches) == 1 and len(batches[0][0]) == 3  # 미룬 키워드도 쿠팡 결과는 저장
+
+
+def test_retry_fetches_only_the_missing_half(monkeypatch):
+    import naver_api
+    batches, _ = _setup(monkeypatch, volume_delay=0, coupang_delay=0, missed={"kw1"})
+    calls = []
+    monkeypatch.setattr(runner, "run_coupang_analyzer", lambda kw: calls.append(kw) or {"rocket_count": 2, "avg_price": 15000})
+    monkeypatch.setattr(naver_api, "circuit_open", lambda: False)
+    rows = _rows(2)
+    keywords = [r["keyword"] for r in rows]
+    _, deferred, volumes, missed, analyzed = runner._process_rows(rows, CFG, keywords, set(keywords))
+    assert [r["keyword"] for r in deferred] == ["kw1"] and sorted(calls) == keywords
+
+    monkeypatch.setattr(runner, "_fetch_volumes", lambda kws, cfg: ({kw: 50.0 for kw in kws}, set()))
+    still, retried = runner._retry_deferred(deferred, CFG, set(keywords), volumes, missed, analyzed, None, {})
+    assert still == [] and retried == ["kw1"]
+    assert sorted(calls) == keywords  # 쿠팡은 다시 호출하지 않음
+    market = [m["keyword"] for _, ms in batches for m in ms]
+    assert sorted(market) == keywords  # market_data는 키워드당 1행
+    assert batches[-1][0][0]["naver_search_vol"] == 50.0 and batches[-1][0][0]["rocket_count"] == 2
+
+
+def test_retry_waits_while_the_tripped_circuit_is_open(monkeypatch):
+    import naver_api
+    _setup(monkeypatch, volume_delay=0, coupang_delay=0, missed={"kw0"})
+    monkeypatch.setattr(naver_api, "circuit_open", lambda: True)
+    rows = _rows(1)
+    _, deferred, volumes, missed, analyzed = runner._process_rows(rows, CFG, ["kw0"], {"kw0"})
+    monkeypatch.setattr(runner, "_process_rows", lambda *a, **k: (_ for _ in ()).throw(AssertionError("재시도하면 안 됨")))
+    still, retried = runner._retry_deferred(deferred, CFG, {"kw0"}, volumes, missed, analyzed, None, {})
+    assert [r["keyword"] for r in still] == ["kw0"] and retried == []
+
+
+def test_failed_and_budget_skipped_keywords_are_not_journaled_done(tmp_path, monkeypatch):
+    from core import checkpoint
+    _setup(monkeypatch, volume_delay=0, coupang_delay=0)
+    monkeypatch.setattr(runner, "run_coupang_analyzer", lambda kw: {} if kw == "kw1" else {"rocket_count": 2, "avg_price": 15000})
+    journal = checkpoint.Journal(runner.RETRY_STAGE, db_path=tmp_path / "ckpt.db")
+    rows = _rows(3)
+    done, deferred, _, _, _ = runner._process_rows(rows, CFG, [], {"kw0", "kw1"}, journal=journal)
+
+    assert sorted(done) == ["kw0", "kw2"] and deferred == []  # kw1: 차단 회로 없이 분석 실패
+    assert list(journal.completed()) == ["kw0"]
+    assert journal.failed() == {"kw1", "kw2"}  # kw2: 한도 밖 → 분석 전이므로 이어받을 때 다시
+
+
+def test_save_batch_upserts_in_one_write(tmp_path, monkeypatch):
+    from core import database
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "gross.db")
+    database.init_db()
+    database.insert_product("kw0", naver_search_vol=1.0)
+    database.save_batch(
+        [{"keyword": "kw0", "naver_search_vol": 5.0, "rocket_count": 1}, {"keyword": "kw1"}],
+        [{"keyword": "kw0", "search_vol": 5.0, "rocket_count": 1, "credibility_score": 70.0}],
+    )
+    products = {p["keyword"]: p for p in database.get_all_products()}
+    assert set(products) == {"kw0", "kw1"}
+    assert products["kw0"]["naver_search_vol"] == 5.0 and products["kw0"]["rocket_count"] == 1
+    with database.db_session() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM market_data").fetchone()[0] == 1
+
+
+def test_split_by_staleness_carries_fresh_keywords(tmp_path, monkeypatch):
+    from core import database
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "gross.db")
+    database.init_db()
+    for kw in ("fresh", "old", "deferred"):
+        database.insert_product(kw, naver_search_vol=10.0, rocket_count=1)
+    database.insert_market_data("fresh", rocket_count=1)
+    database.insert_market_data("deferred", rocket_count=1)
+    database.insert_market_data("old", rocket_count=1, collected_at="2000-01-01 00:00:00")
+
+    stale, carried = runner.split_by_staleness(["new", "fresh", "old", "deferred"], 72, always={"deferred"})
+    assert stale == ["new", "old", "deferred"]
+    assert set(carried) == {"fresh"} and carried["fresh"]["rocket_count"] == 1
+
+
+def test_carried_keywords_keep_db_values_without_coupang(monkeypatch):
+    batches, _ = _setup(monkeypatch, volume_delay=0, coupang_delay=0, missed={"kw1"})
+    called = []
+    monkeypatch.setattr(runner, "run_coupang_analyzer", lambda kw: called.append(kw) or {"rocket_count": 2, "avg_price": 15000})
+    rows = _rows(3)
+    keywords = [r["keyword"] for r in rows]
+    carried = {
+        kw: {"naver_search_vol": 7.0, "coupang_avg_price": 9000, "rocket_count": 4, "opportunity_score": 55.0}
+        for kw in ("kw0", "kw1")
+    }
+    done, deferred, _, _, _ = runner._process_rows(rows, CFG, keywords, {"kw2"}, carried=carried)
+
+    assert called == ["kw2"]
+    assert sorted(done) == ["kw0", "kw2"] and [r["keyword"] for r in deferred] == ["kw1"]
+    products = {p["keyword"]: p for ps, _ in batches for p in ps}
+    assert products["kw0"]["rocket_count"] == 4 and products["kw0"]["naver_search_vol"] == 100.0
+    assert products["kw1"]["opportunity_score"] == 55.0 and products["kw1"]["naver_search_vol"] == 7.0
+    assert [m["keyword"] for _, ms in batches for m in ms] == ["kw2"]  # 유지한 키워드는 market_data 안 쌓음
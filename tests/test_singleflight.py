@@ -0,0 +1,79 @@
+"""
+유닛 테스트: 동시 요청 병합 (같은 키는 1회 실행·결과 공유, 예외 전파, 통계)
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import naver_api
+from core.singleflight import SingleFlight
+
+
+def _run_concurrently(n: int, fn):
+    barrier = threading.Barrier(n)
+
+    def task():
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        futures = [ex.submit(task) for _ in range(n)]
+        return [f.result() for f in futures]
+
+
+def test_concurrent_same_key_runs_once():
+    sf = SingleFlight("test")
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 42}
+
+    results = _run_concurrently(5, lambda: sf.do("k", slow))
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert sf.stats()["executed"] == 1
+    assert sf.stats()["shared"] == 4
+    # 완료된 호출은 보관하지 않음 → 다음 호출은 새로 실행
+    sf.do("k", slow)
+    assert len(calls) == 2
+
+
+def test_errors_propagate_to_waiters():
+    sf = SingleFlight("test")
+
+    def boom():
+        time.sleep(0.1)
+        raise ValueError("실패")
+
+    def call():
+        with pytest.raises(ValueError):
+            sf.do("k", boom)
+        return True
+
+    assert all(_run_concurrently(3, call))
+    assert sf.stats()["in_flight"] == 0
+
+
+def test_keywordstool_requests_coalesced(monkeypatch):
+    calls = []
+
+    def fake_fetch(hints, *args):
+        calls.append(list(hints))
+        time.sleep(0.2)
+        return [{"relKeyword": "물티슈", "monthlyPcQcCnt": 1, "monthlyMobileQcCnt": 2}]
+
+    monkeypatch.setattr(naver_api, "_fetch_keywordstool", fake_fetch)
+    results = _run_concurrently(4, lambda: naver_api._request_keywordstool(["물티슈"], "c", "l", "s"))
+    assert len(calls) == 1
+    assert all(r == results[0] for r in results)
+    naver_api._request_keywordstool(["기저귀"], "c", "l", "s")
+    assert len(calls) == 2
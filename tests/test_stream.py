@@ -0,0 +1,85 @@
+"""
+유닛 테스트: 스트리밍 파이프라인 (단계 겹침, 제외·실패 집계, 워커별 자원, 크기 제한 큐)
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.stream import StreamStage, run_stream
+
+
+def _slow(delay, fn=lambda x: x):
+    def work(item):
+        time.sleep(delay)
+        return fn(item)
+    return work
+
+
+def test_stages_overlap_instead_of_summing():
+    stages = [StreamStage("a", _slow(0.02)), StreamStage("b", _slow(0.02)), StreamStage("c", _slow(0.02))]
+    report = run_stream(range(10), stages)
+    assert sorted(report.results) == list(range(10))
+    # 순차 CSV 단계라면 0.6초, 스트리밍이면 가장 느린 단계(0.2초) 근처
+    assert report.wall_sec < 0.45
+    assert report.first_result_sec < 0.2
+
+
+def test_drops_and_failures_are_counted():
+    def check(x):
+        if x == 3:
+            raise RuntimeError("차단")
+        return x if x % 2 == 0 else None
+
+    seen = []
+    report = run_stream(range(6), [StreamStage("check", check, workers=2), StreamStage("double", lambda x: x * 2)], seen.append)
+    assert sorted(report.results) == [0, 4, 8] and sorted(seen) == [0, 4, 8]
+    check_stage = report.stages[0].stats()
+    assert (check_stage["received"], check_stage["passed"], check_stage["dropped"], check_stage["failed"]) == (6, 3, 2, 1)
+
+
+def test_opener_runs_once_per_worker_thread():
+    opened = []
+
+    @contextmanager
+    def session():
+        opened.append(threading.current_thread())  # ident는 끝난 스레드 것을 재사용할 수 있음
+        yield f"page-{len(opened)}"
+
+    report = run_stream(["x", "y", "z"], [StreamStage("browser", lambda item, page: (item, page), workers=2, opener=session)])
+    assert len(opened) == 2 and len(set(opened)) == 2
+    assert sorted(item for item, _ in report.results) == ["x", "y", "z"]
+
+
+def test_failed_opener_does_not_hang():
+    @contextmanager
+    def broken():
+        raise RuntimeError("로그인 실패")
+        yield
+
+    report = run_stream(range(30), [StreamStage("browser", lambda item, page: item, opener=broken, queue_size=2)])
+    assert report.results == []
+    assert report.stages[0].stats()["failed"] == 30
+
+
+def test_bounded_queue_applies_backpressure():
+    produced = []
+
+    def source():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    gate = threading.Event()
+    stage = StreamStage("slow", lambda x: gate.wait() and x, queue_size=2)
+    t = threading.Thread(target=lambda: run_stream(source(), [stage]))
+    t.start()
+    time.sleep(0.1)
+    assert len(produced) <= 5  # 큐 2 + 처리 중 1 + 넣으려고 기다리는 1
+    gate.set()
+    t.join(timeout=5)
+    assert len(produced) == 20
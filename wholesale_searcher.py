@@ -11,11 +11,14 @@ import re
 import sys
 import time
 import random
+from contextlib import contextmanager
 from pathlib import Path
 from urllib.parse import quote
 
 from playwright.sync_api import sync_playwright  # type: ignore[reportMissingImports]
 
+from core import checkpoint
+
 # 네이버 검색광고 API (우승 상품 한 달 검색량 심화 분석용)
 def _get_naver_search_volume(keyword: str) -> int | None:
     """순마진 15% 이상 우승 상품에 대해 네이버 한 달 검색량 조회. 실패 시 None."""
@@ -59,6 +62,10 @@ DELAY_MAX = 4.0
 BASE_DIR = Path(__file__).resolve().parent
 DEBUG_SCREENSHOT_DIR = BASE_DIR / "debug_screenshots"
 
+
+class WholesaleSearchError(Exception):
+    """도매처 검색 자체가 실패 (브라우저 종료·로그인 만료·네트워크 끊김 등) → 결과 없음과 구분해 다시 시도"""
+
 # 대형/부피 화물 제외 (Bulky & Heavy Item Exclusion)
 BULKY_KEYWORDS_BLACKLIST = {
     "금고", "안마의자", "침대", "소파", "식탁", "냉장고", "세탁기", "에어컨", "책상", "옷장",
@@ -131,13 +138,8 @@ def load_keywords() -> list[dict]:
     with open(path, "r", encoding="utf-8-sig") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            g = (row.get("grade") or "").strip().upper()
-            if g not in ("S", "A"):
-                continue
-            kw = (row.get("keyword") or "").strip()
-            if kw in BULKY_KEYWORDS_BLACKLIST:
-                continue
-            rows.append(row)
+            if is_sourcing_candidate(row):
+                rows.append(row)
     return rows
 
 
@@ -603,8 +605,8 @@ def search_domeggook(page, keyword: str) -> list[dict]:
             except Exception:
                 pass
         return products[:3]
-    except Exception:
-        return []
+    except Exception as e:
+        raise WholesaleSearchError(f"도매꾹 검색 실패: {e}") from e
 
 
 def search_ownerclan(page, keyword: str) -> list[dict]:
@@ -711,36 +713,40 @@ def search_ownerclan(page, keyword: str) -> list[dict]:
             except Exception:
                 pass
         return products[:3]
-    except Exception:
-        return []
+    except Exception as e:
+        raise WholesaleSearchError(f"오너클랜 검색 실패: {e}") from e
 
 
-def main():
-    print("=" * 50)
-    print(" [자동 로그인 최저가 탐지기] - 도매꾹 & 오너클랜")
-    print("=" * 50)
-    print("-" * 50)
+SOURCING_FIELDS = ["키워드", "쿠팡가", "도매가(최저)", "광고비", "부가세", "최종 순마진액", "순마진율", "한 달 검색량", "태그", "최종 소싱처", "도매처링크"]
 
-    keywords_data = load_keywords()
-    if not keywords_data:
-        return
-    print(f"S/A등급 키워드 {len(keywords_data)}개 로드")
 
-    results = []
+def is_sourcing_candidate(row: dict) -> bool:
+    """S, A등급이고 대형 화물 키워드(블랙리스트)가 아닌 키워드만 도매 검색 대상"""
+    g = (row.get("grade") or "").strip().upper()
+    kw = (row.get("keyword") or "").strip()
+    return g in ("S", "A") and kw not in BULKY_KEYWORDS_BLACKLIST
+
 
-    # config.py에서 개인 회원 계정 정보 로드
-    base_dir = Path(__file__).resolve().parent
-    if str(base_dir) not in sys.path:
-        sys.path.insert(0, str(base_dir))
+def _load_accounts() -> tuple[str, str, str, str]:
+    """config.py에서 개인 회원 계정 정보 로드 (도매꾹 ID/PW, 오너클랜 ID/PW)"""
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
     try:
         import config
-        domeggook_id = (getattr(config, "DOEMEGGOOK_ID", "") or "").strip()
-        domeggook_pw = (getattr(config, "DOEMEGGOOK_PW", "") or "").strip()
-        ownerclan_id = (getattr(config, "OWNERCLAN_ID", "") or "").strip()
-        ownerclan_pw = (getattr(config, "OWNERCLAN_PW", "") or "").strip()
+        return (
+            (getattr(config, "DOEMEGGOOK_ID", "") or "").strip(),
+            (getattr(config, "DOEMEGGOOK_PW", "") or "").strip(),
+            (getattr(config, "OWNERCLAN_ID", "") or "").strip(),
+            (getattr(config, "OWNERCLAN_PW", "") or "").strip(),
+        )
     except ImportError:
-        domeggook_id = domeggook_pw = ownerclan_id = ownerclan_pw = ""
+        return "", "", "", ""
 
+
+@contextmanager
+def open_wholesale_session():
+    """브라우저 실행 + 도매 사이트 자동 로그인 → 검색용 page (with 블록 종료 시 브라우저 닫음)"""
+    domeggook_id, domeggook_pw, ownerclan_id, ownerclan_pw = _load_accounts()
     if not (domeggook_id and domeggook_pw) and not (ownerclan_id and ownerclan_pw):
         print("※ config.py에 DOEMEGGOOK_ID/PW, OWNERCLAN_ID/PW를 입력하면 개인 회원 전용 가격을 수집합니다.")
 
@@ -754,182 +760,241 @@ def main():
                 "--no-sandbox",
             ],
         )
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-            locale="ko-KR",
-            viewport={"width": 1920, "height": 1080},
-        )
-        # 자동화 감지 완화
-        context.add_init_script("Object.defineProperty(navigator, 'webdriver', { get: () => undefined });")
-        page = context.new_page()
+        try:
+            context = browser.new_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+                locale="ko-KR",
+                viewport={"width": 1920, "height": 1080},
+            )
+            # 자동화 감지 완화
+            context.add_init_script("Object.defineProperty(navigator, 'webdriver', { get: () => undefined });")
+            page = context.new_page()
 
-        # 네이티브 다이얼로그(alert/confirm/prompt) 자동 수락/닫기
-        def _handle_dialog(dialog):
+            # 네이티브 다이얼로그(alert/confirm/prompt) 자동 수락/닫기
+            def _handle_dialog(dialog):
+                try:
+                    dialog.accept()  # alert/confirm 모두 수락 후 닫기
+                except Exception:
+                    pass
+            page.on("dialog", _handle_dialog)
+
+            # 프로그램 시작 시 모든 사이트 자동 로그인 (세션 유지 → 회원 전용가 적용)
+            domeggook_ok, ownerclan_ok = login_all_sites(
+                page, domeggook_id, domeggook_pw, ownerclan_id, ownerclan_pw
+            )
+            _random_delay()  # 로그인 후 검색 전 랜덤 대기 (봇 차단 방지)
+
+            # 대시보드 신호등용 로그인 상태 저장
             try:
-                dialog.accept()  # alert/confirm 모두 수락 후 닫기
+                status_path = BASE_DIR / "wholesale_login_status.json"
+                status = {
+                    "domeggook": domeggook_ok,
+                    "ownerclan": ownerclan_ok,
+                    "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                with open(status_path, "w", encoding="utf-8") as f:
+                    json.dump(status, f, ensure_ascii=False)
             except Exception:
                 pass
-        page.on("dialog", _handle_dialog)
 
-        # 프로그램 시작 시 모든 사이트 자동 로그인 (세션 유지 → 회원 전용가 적용)
-        domeggook_ok, ownerclan_ok = login_all_sites(
-            page, domeggook_id, domeggook_pw, ownerclan_id, ownerclan_pw
-        )
-        _random_delay()  # 로그인 후 검색 전 랜덤 대기 (봇 차단 방지)
+            yield page
+        finally:
+            browser.close()
 
-        # 대시보드 신호등용 로그인 상태 저장
-        try:
-            status_path = base_dir / "wholesale_login_status.json"
-            status = {
-                "domeggook": domeggook_ok,
-                "ownerclan": ownerclan_ok,
-                "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
-            }
-            with open(status_path, "w", encoding="utf-8") as f:
-                json.dump(status, f, ensure_ascii=False)
-        except Exception:
-            pass
 
-        for i, row in enumerate(keywords_data):
-            kw = (row.get("keyword") or "").strip()
-            coupang_avg = int(row.get("avg_price") or 0)
-            if not kw or coupang_avg <= 0:
-                continue
+def _log_no_result(keyword: str, reason: str = "") -> None:
+    try:
+        log_path = BASE_DIR / "no_results_log.txt"
+        fields = [keyword, reason, time.strftime("%Y-%m-%d %H:%M:%S")] if reason else [keyword, time.strftime("%Y-%m-%d %H:%M:%S")]
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("\t".join(fields) + "\n")
+    except Exception:
+        pass
 
-            print(f"[{i + 1}/{len(keywords_data)}] {kw} (쿠팡 평균 {coupang_avg:,}원)")
 
-            all_products = []
+def find_wholesale_products(page, kw: str, coupang_avg: int) -> list[dict]:
+    """
+    도매꾹·오너클랜 검색 → 부속품·이상치·대형화물 제외 후 후보 상품 (없으면 빈 목록, no_results_log 기록).
+    검색 자체가 실패하면 WholesaleSearchError (한쪽 결과만으로 판정하지 않음)
+    """
+    all_products = []
+
+    # 도매꾹
+    for p in search_domeggook(page, kw):
+        p["site"] = "도매꾹"
+        all_products.append(p)
+    _random_delay()
+
+    # 오너클랜
+    for p in search_ownerclan(page, kw):
+        p["site"] = "오너클랜"
+        all_products.append(p)
+    _random_delay()
+
+    if not all_products:
+        print(f"  -> 검색결과없음")
+        _log_no_result(kw)
+        return []
 
-            # 도매꾹
-            try:
-                prods = search_domeggook(page, kw)
-                for p in prods:
-                    p["site"] = "도매꾹"
-                    all_products.append(p)
-            except Exception:
-                pass
-            _random_delay()
+    # 부속품/이상치 제거 (가격 하한·키워드 일치·고가 최소 도매가, 쿠팡 2만 원 이하는 예외)
+    all_products = _filter_outlier_products(all_products, kw, coupang_avg)
+    if not all_products:
+        print(f"  -> 필터 후 후보 없음 (부속품/키워드불일치 제외)")
+        _log_no_result(kw, "필터제외")
+        return []
 
-            # 오너클랜
-            try:
-                prods = search_ownerclan(page, kw)
-                for p in prods:
-                    p["site"] = "오너클랜"
-                    all_products.append(p)
-            except Exception:
-                pass
-            _random_delay()
+    # 대형/부피 화물·착불·화물배송 제외 (경량 상품은 대형 상품명 필터만 느슨)
+    all_products = _filter_bulky_and_shipping(all_products, kw)
+    if not all_products:
+        print(f"  -> 필터 후 후보 없음 (대형화물/착불·화물 제외)")
+        _log_no_result(kw, "대형/착불제외")
+        return []
+    return all_products
 
-            if not all_products:
-                print(f"  -> 검색결과없음")
-                try:
-                    log_path = base_dir / "no_results_log.txt"
-                    with open(log_path, "a", encoding="utf-8") as f:
-                        f.write(f"{kw}\t{time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                except Exception:
-                    pass
-                continue
 
-            # 부속품/이상치 제거 (가격 하한·키워드 일치·고가 최소 도매가, 쿠팡 2만 원 이하는 예외)
-            all_products = _filter_outlier_products(all_products, kw, coupang_avg)
-            if not all_products:
-                print(f"  -> 필터 후 후보 없음 (부속품/키워드불일치 제외)")
-                try:
-                    log_path = base_dir / "no_results_log.txt"
-                    with open(log_path, "a", encoding="utf-8") as f:
-                        f.write(f"{kw}\t필터제외\t{time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                except Exception:
-                    pass
-                continue
+def evaluate_profit(kw: str, coupang_avg: int, products: list[dict]) -> dict | None:
+    """최저 도매가 후보로 순이익 계산 → 결과 행 (순마진 TARGET_NET_MARGIN 미만이면 None)"""
+    # 수익 계산 (config 연동)
+    min_prod = min(products, key=lambda x: x["price"])
+    wholesale_price = min_prod["price"]
+    _, net_profit, net_margin_ratio, ad_cost, vat_cost = calculate_net_profit(coupang_avg, wholesale_price)
+    net_margin_pct = net_margin_ratio * 100
 
-            # 대형/부피 화물·착불·화물배송 제외 (경량 상품은 대형 상품명 필터만 느슨)
-            all_products = _filter_bulky_and_shipping(all_products, kw)
-            if not all_products:
-                print(f"  -> 필터 후 후보 없음 (대형화물/착불·화물 제외)")
-                try:
-                    log_path = base_dir / "no_results_log.txt"
-                    with open(log_path, "a", encoding="utf-8") as f:
-                        f.write(f"{kw}\t대형/착불제외\t{time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                except Exception:
-                    pass
-                continue
+    # TARGET_NET_MARGIN 미만 → 과감히 제외
+    if net_margin_ratio < TARGET_NET_MARGIN:
+        print(f"  -> 도매 최저 {wholesale_price:,}원, 순이익 {net_profit:,.0f}원, 순마진 {net_margin_pct:.1f}% (목표 {TARGET_NET_MARGIN*100:.0f}% 미만 제외)")
+        return None
 
-            # 수익 계산 (config 연동)
-            min_prod = min(all_products, key=lambda x: x["price"])
-            wholesale_price = min_prod["price"]
-            _, net_profit, net_margin_ratio, ad_cost, vat_cost = calculate_net_profit(coupang_avg, wholesale_price)
-            net_margin_pct = net_margin_ratio * 100
+    # 최종 소싱처: 도매꾹/오너클랜 중 더 저렴한 곳
+    final_source = min_prod.get("site", "도매꾹")
+    link = (min_prod.get("url") or "").strip()
+    # 저장 전 최종 검수: 절대 URL이 아니면 소싱처별 베이스 URL 강제 부착
+    if link and not link.startswith("http"):
+        base = "https://www.domeggook.com" if "도매꾹" in final_source else "https://www.ownerclan.com"
+        link = base + (link if link.startswith("/") else "/" + link)
+    if not link:
+        link = "검색결과없음"
+
+    return {
+        "keyword": kw,
+        "coupang_price": coupang_avg,
+        "wholesale_price": wholesale_price,
+        "net_profit": int(round(net_profit, 0)),
+        "net_margin_ratio": net_margin_ratio,
+        "net_margin_pct": round(net_margin_pct, 1),
+        "ad_cost": int(round(ad_cost, 0)),
+        "vat_cost": int(round(vat_cost, 0)),
+        "final_source": final_source,
+        "wholesale_link": link,
+        "monthly_search_volume": None,
+    }
+
+
+def sourcing_row(r: dict) -> dict:
+    """결과 행 → final_sourcing_list.csv 행"""
+    sv = r.get("monthly_search_volume")
+    sv_display = sv if sv is not None else "API 확인 필요"
+    tag = "[강력 추천]" if (sv or 0) >= 5000 and r["net_margin_ratio"] >= 0.15 else ""
+    return {
+        "키워드": r["keyword"],
+        "쿠팡가": r["coupang_price"],
+        "도매가(최저)": r["wholesale_price"],
+        "광고비": r["ad_cost"],
+        "부가세": r["vat_cost"],
+        "최종 순마진액": r["net_profit"],
+        "순마진율": f"{r['net_margin_pct']}%",
+        "한 달 검색량": sv_display,
+        "태그": tag,
+        "최종 소싱처": r["final_source"],
+        "도매처링크": r["wholesale_link"],
+    }
+
+
+def main(resume: bool = False):
+    print("=" * 50)
+    print(" [자동 로그인 최저가 탐지기] - 도매꾹 & 오너클랜")
+    print("=" * 50)
+    print("-" * 50)
 
-            # TARGET_NET_MARGIN 미만 → 과감히 제외
-            if net_margin_ratio < TARGET_NET_MARGIN:
-                print(f"  -> 도매 최저 {wholesale_price:,}원, 순이익 {net_profit:,.0f}원, 순마진 {net_margin_pct:.1f}% (목표 {TARGET_NET_MARGIN*100:.0f}% 미만 제외)")
-                continue
+    keywords_data = load_keywords()
+    if not keywords_data:
+        return
+    print(f"S/A등급 키워드 {len(keywords_data)}개 로드")
 
-            # 최종 소싱처: 도매꾹/오너클랜 중 더 저렴한 곳
-            final_source = min_prod.get("site", "도매꾹")
-            link = (min_prod.get("url") or "").strip()
-            # 저장 전 최종 검수: 절대 URL이 아니면 소싱처별 베이스 URL 강제 부착
-            if link and not link.startswith("http"):
-                base = "https://www.domeggook.com" if "도매꾹" in final_source else "https://www.ownerclan.com"
-                link = base + (link if link.startswith("/") else "/" + link)
-            if not link:
-                link = "검색결과없음"
-
-            # 우승 상품(순마진 15% 이상) → 네이버 검색광고 API로 한 달 검색량 심화 분석 (403/에러 시 중단 없이 'API 확인 필요' 표기)
-            try:
-                monthly_search_volume = _get_naver_search_volume(kw)
-            except Exception:
-                monthly_search_volume = None
-            if monthly_search_volume is not None:
-                print(f"  -> [심화] 한 달 검색량: {monthly_search_volume:,}회")
-            else:
-                print(f"  -> [심화] 한 달 검색량: API 확인 필요")
-
-            results.append({
-                "keyword": kw,
-                "coupang_price": coupang_avg,
-                "wholesale_price": wholesale_price,
-                "net_profit": int(round(net_profit, 0)),
-                "net_margin_ratio": net_margin_ratio,
-                "net_margin_pct": round(net_margin_pct, 1),
-                "ad_cost": int(round(ad_cost, 0)),
-                "vat_cost": int(round(vat_cost, 0)),
-                "final_source": final_source,
-                "wholesale_link": link,
-                "monthly_search_volume": monthly_search_volume,
-            })
-            print(f"  -> 최종 소싱처: {final_source} | 도매 {wholesale_price:,}원 | 최종 순마진액 {net_profit:,.0f}원 | 순마진율 {net_margin_pct:.1f}% ✓")
-            print(f"  -> 최종 소싱처 링크: {link}")
-
-        browser.close()
+    # 키워드별 진행 기록: --resume이면 지난 미완료 실행에서 끝난 키워드는 건너뛰고 결과 재사용
+    journal = checkpoint.Journal("wholesale_searcher", resume=resume)
+    results = [r for r in journal.completed().values() if r]
+    if journal.resumed:
+        print(f"이어받기: 완료 {len(journal.completed())}개 건너뜀 (소싱 후보 {len(results)}건 유지)")
 
     # 저장: final_sourcing_list.csv (스크립트와 동일 폴더에 절대 경로로 저장 → 대시보드와 경로 일치)
+    # 후보가 나올 때마다 한 줄씩 추가 → 중간에 끊겨도 그때까지의 결과는 남음
     out = BASE_DIR / OUTPUT_CSV
-    fieldnames = ["키워드", "쿠팡가", "도매가(최저)", "광고비", "부가세", "최종 순마진액", "순마진율", "한 달 검색량", "태그", "최종 소싱처", "도매처링크"]
     with open(out, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=SOURCING_FIELDS)
         writer.writeheader()
         for r in results:
-            sv = r.get("monthly_search_volume")
-            sv_display = sv if sv is not None else "API 확인 필요"
-            tag = "[강력 추천]" if (sv or 0) >= 5000 and r["net_margin_ratio"] >= 0.15 else ""
-            writer.writerow({
-                "키워드": r["keyword"],
-                "쿠팡가": r["coupang_price"],
-                "도매가(최저)": r["wholesale_price"],
-                "광고비": r["ad_cost"],
-                "부가세": r["vat_cost"],
-                "최종 순마진액": r["net_profit"],
-                "순마진율": f"{r['net_margin_pct']}%",
-                "한 달 검색량": sv_display,
-                "태그": tag,
-                "최종 소싱처": r["final_source"],
-                "도매처링크": r["wholesale_link"],
-            })
+            writer.writerow(sourcing_row(r))
+        f.flush()
+
+        todo = [row for row in keywords_data if not journal.is_done((row.get("keyword") or "").strip())]
+        failed = 0
+        if todo:
+            with open_wholesale_session() as page:
+                for i, row in enumerate(todo):
+                    kw = (row.get("keyword") or "").strip()
+                    coupang_avg = int(row.get("avg_price") or 0)
+                    if not kw or coupang_avg <= 0:
+                        continue
+
+                    print(f"[{i + 1}/{len(todo)}] {kw} (쿠팡 평균 {coupang_avg:,}원)")
+
+                    try:
+                        products = find_wholesale_products(page, kw, coupang_avg)
+                    except WholesaleSearchError as e:
+                        # 검색 실패는 '결과 없음'으로 남기지 않음 → --resume에서 다시 시도
+                        print(f"  -> {e} (다음 --resume에서 재시도)")
+                        failed += 1
+                        journal.record(kw, checkpoint.FAILED)
+                        continue
+                    result = evaluate_profit(kw, coupang_avg, products) if products else None
+                    if result is None:
+                        journal.record(kw, checkpoint.SKIPPED)
+                        continue
+
+                    # 우승 상품(순마진 15% 이상) → 네이버 검색광고 API로 한 달 검색량 심화 분석 (403/에러 시 중단 없이 'API 확인 필요' 표기)
+                    try:
+                        monthly_search_volume = _get_naver_search_volume(kw)
+                    except Exception:
+                        monthly_search_volume = None
+                    if monthly_search_volume is not None:
+                        print(f"  -> [심화] 한 달 검색량: {monthly_search_volume:,}회")
+                    else:
+                        print(f"  -> [심화] 한 달 검색량: API 확인 필요")
+                    result["monthly_search_volume"] = monthly_search_volume
+
+                    results.append(result)
+                    writer.writerow(sourcing_row(result))
+                    f.flush()
+                    journal.record(kw, checkpoint.DONE, result)
+                    print(f"  -> 최종 소싱처: {result['final_source']} | 도매 {result['wholesale_price']:,}원 | 최종 순마진액 {result['net_profit']:,.0f}원 | 순마진율 {result['net_margin_pct']:.1f}% ✓")
+                    print(f"  -> 최종 소싱처 링크: {result['wholesale_link']}")
+    if failed:
+        print(f"도매 검색 실패 {failed}개 → --resume으로 실패한 키워드만 다시 실행")
+    else:
+        journal.finish()
 
     print()
     print(f"저장 완료: {out.absolute()} ({len(results)}건, 순마진 {TARGET_NET_MARGIN*100:.0f}% 이상)")
+    try:
+        from naver_api import cache_report
+        print(cache_report())
+    except ImportError:
+        pass
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="지난 미완료 실행에서 끝난 키워드는 건너뛰고 이어서 실행")
+    main(resume=parser.parse_args().resume)